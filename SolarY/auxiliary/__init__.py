@@ -1,4 +1,4 @@
 """Submodule contains auxiliary functionalities of SolarY."""
 # flake8: noqa
-from . import config, download, parse, reader
+from . import config, download, metrics, parse, reader
 from .config import root_dir
@@ -1,51 +1,407 @@
 """Auxiliary functions to download miscellaneous datasets."""
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import time
 import typing as t
-import urllib.parse
-import urllib.request
+
+import requests
 
 from . import config, parse
 
 # Get the file paths
 GENERIC_KERNEL_CONFIG = config.get_spice_kernels(ktype="generic")
+PATH_CONFIG = config.get_paths()
+
+# File endings of the download manifest (HTTP validators and hash of a downloaded file) and of
+# partially downloaded files
+MANIFEST_SUFFIX = ".manifest.json"
+PART_SUFFIX = ".part"
 
 
-def spice_generic_kernels() -> t.Dict[str, str]:
+def _read_manifest(manifest_path: pathlib.Path) -> t.Dict[str, t.Any]:
     """
-    Download the generic SPICE kernels into the solary data storage directory.
+    Read the download manifest of a file.
 
-    The SPICE kernels will be saved to the following directory::
+    Parameters
+    ----------
+    manifest_path : pathlib.Path
+        File path of the manifest.
 
-        ~HOME/solary_data/.
+    Returns
+    -------
+    manifest : dict
+        Content of the manifest. An empty dictionary is returned if no (valid) manifest exists.
+    """
+    try:
+        with manifest_path.open() as f_temp:
+            manifest = dict(json.load(f_temp))
+    except (OSError, ValueError):
+        manifest = {}
+
+    return manifest
+
+
+def _write_manifest(manifest_path: pathlib.Path, manifest: t.Dict[str, t.Any]) -> None:
+    """
+    Write the download manifest of a file.
 
     Parameters
     ----------
-    None.
+    manifest_path : pathlib.Path
+        File path of the manifest.
+    manifest : dict
+        Content of the manifest.
+    """
+    with manifest_path.open(mode="w") as f_temp:
+        json.dump(manifest, f_temp)
+
+
+def _request_file(
+    url: str,
+    headers: t.Dict[str, str],
+    timeout: float,
+    part_path: pathlib.Path,
+    manifest_path: pathlib.Path,
+    manifest: t.Dict[str, t.Any],
+) -> requests.Response:
+    """
+    Send the streaming request of a file download.
+
+    A complete partial file (e.g., of a process that stopped before replacing the file) is
+    answered with 416 (range not satisfiable). In this case, the stale partial file and its
+    validators are deleted and the file is requested again without range.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    headers : dict
+        Request headers (conditional and range headers). The range headers are removed, if the
+        range is not satisfiable.
+    timeout : float
+        Timeout of the HTTP connection and of reading a chunk in seconds.
+    part_path : pathlib.Path
+        File path of the partial download.
+    manifest_path : pathlib.Path
+        File path of the manifest.
+    manifest : dict
+        Content of the manifest. The validators of the partial file are removed, if the range is
+        not satisfiable.
 
     Returns
     -------
-    Dict[str, str]
-        The download file name with the associated MD5 hash.
+    response : requests.Response
+        Streaming response.
+    """
+    response = requests.get(url, headers=headers, stream=True, timeout=timeout)
+
+    # Discard a stale partial file and request the complete file
+    if response.status_code == 416 and "Range" in headers:
+        response.close()
+        part_path.unlink()
+        manifest.pop("part_etag", None)
+        manifest.pop("part_last_modified", None)
+        _write_manifest(manifest_path, manifest)
+        del headers["Range"], headers["If-Range"]
+        response = requests.get(url, headers=headers, stream=True, timeout=timeout)
+
+    return response
+
+
+def download_file(
+    url: str,
+    file_path: t.Union[str, pathlib.Path],
+    chunk_size: int = 1048576,
+    timeout: float = 60.0,
+) -> t.Dict[str, t.Any]:
+    """
+    Download a file with conditional, streaming and resumable requests.
+
+    The HTTP validators (ETag and Last-Modified) and the SHA256 hash of a downloaded file are
+    stored in a sidecar manifest (file ending ".manifest.json"). Subsequent downloads send them as
+    If-None-Match / If-Modified-Since headers; an unchanged file is therefore not transferred
+    again. The response body is streamed in chunks to a partial file (file ending ".part") and
+    hashed during the stream. An interrupted transfer is resumed with an HTTP Range request
+    by the next call; a stale partial file that the server rejects (416) is downloaded again.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    file_path : str or pathlib.Path
+        Absolute file path of the downloaded file.
+    chunk_size : int, optional
+        Number of bytes per streamed chunk. The default is 1048576 (1 MiB).
+    timeout : float, optional
+        Timeout of the HTTP connection and of reading a chunk in seconds. The default is 60.
+
+    Returns
+    -------
+    dl_result : dict
+        Dictionary with the keys "status" ("downloaded", "resumed" or "not_modified"), "sha256"
+        (SHA256 hash of the file) and "bytes" (number of transferred bytes).
+    """
+    # Set the paths of the file, its manifest and the partial download
+    file_path = pathlib.Path(file_path)
+    manifest_path = file_path.with_name(file_path.name + MANIFEST_SUFFIX)
+    part_path = file_path.with_name(file_path.name + PART_SUFFIX)
+    manifest = _read_manifest(manifest_path)
+    if manifest.get("url") != url:
+        manifest = {"url": url}
+
+    # Send the validators of the present file; the server responds with 304 if it is unchanged
+    headers = {}
+    if file_path.exists() and "sha256" in manifest:
+        if manifest.get("etag"):
+            headers["If-None-Match"] = manifest["etag"]
+        if manifest.get("last_modified"):
+            headers["If-Modified-Since"] = manifest["last_modified"]
+
+    # Resume a partial download, but only if the remote file has not changed in the meantime
+    part_validator = manifest.get("part_etag") or manifest.get("part_last_modified")
+    part_size = part_path.stat().st_size if part_path.exists() else 0
+    if part_size > 0 and part_validator:
+        headers["Range"] = f"bytes={part_size}-"
+        headers["If-Range"] = part_validator
+
+    # Request the file. The body is not loaded before iterating through it
+    response = _request_file(url, headers, timeout, part_path, manifest_path, manifest)
+    with response:
+
+        # The present file is still up to date
+        if response.status_code == 304:
+            return {"status": "not_modified", "sha256": manifest["sha256"], "bytes": 0}
+        response.raise_for_status()
+
+        # Store the validators of the partial download before writing any data
+        manifest["part_etag"] = response.headers.get("ETag")
+        manifest["part_last_modified"] = response.headers.get("Last-Modified")
+        _write_manifest(manifest_path, manifest)
+
+        # Continue the partial download (206) or start from scratch (200). The SHA256 hash of
+        # the already downloaded part needs to be computed first
+        hash_sha256 = hashlib.sha256()
+        if response.status_code == 206:
+            dl_status = "resumed"
+            file_mode = "ab"
+            with part_path.open(mode="rb") as f_temp:
+                for _seq in iter(lambda: f_temp.read(65536), b""):
+                    hash_sha256.update(_seq)
+        else:
+            dl_status = "downloaded"
+            file_mode = "wb"
+
+        # Stream the body to the partial file and compute the hash on the fly
+        nr_bytes = 0
+        with part_path.open(mode=file_mode) as f_temp:
+            for _seq in response.iter_content(chunk_size=chunk_size):
+                f_temp.write(_seq)
+                hash_sha256.update(_seq)
+                nr_bytes += len(_seq)
+
+    # Replace the file with the completed download and store its validators and hash
+    os.replace(part_path, file_path)
+    sha256_hash = hash_sha256.hexdigest()
+    _write_manifest(
+        manifest_path,
+        {
+            "url": url,
+            "etag": manifest["part_etag"],
+            "last_modified": manifest["part_last_modified"],
+            "sha256": sha256_hash,
+            "size": file_path.stat().st_size,
+        },
+    )
+
+    return {"status": dl_status, "sha256": sha256_hash, "bytes": nr_bytes}
+
+
+def _spice_generic_datasets() -> t.Dict[str, t.Dict[str, t.Optional[str]]]:
+    """
+    Get the download information of the generic SPICE kernels.
+
+    Returns
+    -------
+    datasets : dict
+        Dictionary with the kernel names as keys. Each value is a dictionary with the keys "url",
+        "file" (absolute download file path) and "sha256" (expected SHA256 hash).
     """
-    # Set a placeholder list for the filepaths and corresponding / resulting MD5 values
-    kernel_hashes = {}
+    # Each section of the SPICE config file corresponds to an individual SPICE kernel
+    datasets = {
+        kernel: {
+            "url": GENERIC_KERNEL_CONFIG[kernel]["url"],
+            "file": parse.setnget_file_path(
+                GENERIC_KERNEL_CONFIG[kernel]["dir"], GENERIC_KERNEL_CONFIG[kernel]["file"]
+            ),
+            "sha256": GENERIC_KERNEL_CONFIG[kernel].get("sha256"),
+        }
+        for kernel in GENERIC_KERNEL_CONFIG.sections()
+    }
 
-    # Iterate through the SPICE config file. Each section corresponds to an individual SPICE kernel
-    for kernel in GENERIC_KERNEL_CONFIG.sections():
+    return datasets
 
-        # Set the download filepath
-        download_filename = parse.setnget_file_path(
-            GENERIC_KERNEL_CONFIG[kernel]["dir"], GENERIC_KERNEL_CONFIG[kernel]["file"]
-        )
 
-        # Download the file and store it in the kernels directory
-        downl_file_path, _ = urllib.request.urlretrieve(  # nosec - no issue since static URL
-            url=GENERIC_KERNEL_CONFIG[kernel]["url"], filename=download_filename
-        )
+def configured_datasets() -> t.Dict[str, t.Dict[str, t.Optional[str]]]:
+    """
+    Get the download information of all datasets that are set in the config files.
+
+    These are the NEODyS catalog, the Granvik et al. (2018) model data (compressed file) and the
+    generic SPICE kernels (prefix "spice_generic_").
+
+    Returns
+    -------
+    datasets : dict
+        Dictionary with the dataset names as keys. Each value is a dictionary with the keys "url",
+        "file" (absolute download file path) and "sha256" (expected SHA256 hash or None, if no
+        hash is set, e.g., for the regularly updated NEODyS catalog).
+    """
+    # NEO datasets
+    datasets: t.Dict[str, t.Dict[str, t.Optional[str]]] = {
+        neo_data: {
+            "url": PATH_CONFIG["neo"][f"{neo_data}_url"],
+            "file": parse.setnget_file_path(
+                PATH_CONFIG["neo"][f"{neo_data}_raw_dir"],
+                PATH_CONFIG["neo"][f"{neo_data}_raw_file"],
+            ),
+            "sha256": PATH_CONFIG["neo"].get(f"{neo_data}_sha256"),
+        }
+        for neo_data in ["neodys", "granvik2018"]
+    }
+
+    # Generic SPICE kernels
+    for kernel, kernel_dataset in _spice_generic_datasets().items():
+        datasets[f"spice_generic_{kernel}"] = kernel_dataset
+
+    return datasets
+
+
+def _fetch_dataset(dataset: t.Dict[str, t.Optional[str]], timeout: float) -> t.Dict[str, t.Any]:
+    """
+    Download a single dataset and measure the download time.
+
+    Parameters
+    ----------
+    dataset : dict
+        Dictionary with the keys "url", "file" and (optionally) "sha256".
+    timeout : float
+        Timeout of the HTTP connection and of reading a chunk in seconds.
+
+    Returns
+    -------
+    fetch_result : dict
+        Result of download_file, extended by the keys "file", "seconds" (wall time of the
+        download) and "verified" (True / False, if the hash matches the expected one; None, if
+        no hash is set).
+    """
+    # Download the file and measure the wall time
+    start_time = time.perf_counter()
+    fetch_result = download_file(str(dataset["url"]), str(dataset["file"]), timeout=timeout)
+    fetch_result["seconds"] = time.perf_counter() - start_time
+    fetch_result["file"] = dataset["file"]
+
+    # Compare the hash with the expected one
+    exp_sha256 = dataset.get("sha256")
+    fetch_result["verified"] = None if exp_sha256 is None else fetch_result["sha256"] == exp_sha256
+
+    return fetch_result
+
+
+def fetch_all(
+    datasets: t.Optional[t.Dict[str, t.Dict[str, t.Optional[str]]]] = None,
+    max_workers: int = 4,
+    verify: bool = True,
+    timeout: float = 60.0,
+) -> t.Dict[str, t.Dict[str, t.Any]]:
+    """
+    Download all datasets concurrently.
+
+    The downloads run in a thread pool with a bounded number of concurrent downloads; thus, the
+    total download time is rather determined by the largest file than by the sum of all files.
+    Each download is conditional and resumable (see download_file).
+
+    Parameters
+    ----------
+    datasets : dict, optional
+        Datasets that shall be downloaded (see configured_datasets for the format). If None, all
+        datasets of the config files are downloaded. The default is None.
+    max_workers : int, optional
+        Maximum number of concurrent downloads. The default is 4.
+    verify : bool, optional
+        If True, a ValueError is raised if the SHA256 hash of any downloaded file does not match
+        its expected hash. The default is True.
+    timeout : float, optional
+        Timeout of the HTTP connection and of reading a chunk in seconds. The default is 60.
+
+    Returns
+    -------
+    fetch_report : dict
+        Dictionary with the dataset names as keys. Each value is a dictionary with the keys
+        "file", "status", "sha256", "bytes" (number of transferred bytes), "seconds" (wall time
+        of the download) and "verified" (result of the hash comparison or None if no hash is
+        set).
+
+    Raises
+    ------
+    ValueError
+        If max_workers is smaller than 1 or if a downloaded file does not match its expected hash
+        (and verify is True).
+    """
+    # Check the number of concurrent downloads
+    if max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+
+    # Use the datasets of the config files per default
+    if datasets is None:
+        datasets = configured_datasets()
+
+    # Download the datasets concurrently. Any download error is raised after all downloads have
+    # been submitted
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fetch_futures = {
+            name: executor.submit(_fetch_dataset, dataset, timeout)
+            for name, dataset in datasets.items()
+        }
+        fetch_report = {name: fetch_future.result() for name, fetch_future in fetch_futures.items()}
+
+    # Check the hashes
+    if verify:
+        mismatches = [name for name, res in fetch_report.items() if res["verified"] is False]
+        if mismatches:
+            raise ValueError(f"SHA256 hash mismatch of the dataset(s): {mismatches}")
+
+    return fetch_report
+
+
+def spice_generic_kernels(max_workers: int = 4) -> t.Dict[str, str]:
+    """
+    Download the generic SPICE kernels into the solary data storage directory.
+
+    The SPICE kernels will be saved to the following directory::
 
-        # Compute the MD5 hash value
-        md5_hash = parse.comp_sha256(downl_file_path)
+        ~HOME/solary_data/.
+
+    The kernels are downloaded concurrently (see fetch_all).
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Maximum number of concurrent downloads. The default is 4.
+
+    Returns
+    -------
+    Dict[str, str]
+        The download file name with the associated SHA256 hash.
+    """
+    # Download the kernels concurrently. The hashes are returned to the caller for the comparison
+    fetch_report = fetch_all(_spice_generic_datasets(), max_workers=max_workers, verify=False)
 
-        # Append the filepath and MD5 in the dictionary
-        kernel_hashes[download_filename] = md5_hash
+    # Set a dictionary with the filepaths and the corresponding SHA256 values
+    kernel_hashes = {
+        str(fetch_result["file"]): str(fetch_result["sha256"])
+        for fetch_result in fetch_report.values()
+    }
 
     return kernel_hashes
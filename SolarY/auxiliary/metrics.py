@@ -0,0 +1,140 @@
+"""Auxiliary functions to instrument the stages of data pipelines (e.g., database builds)."""
+import contextlib
+import time
+import tracemalloc
+import typing as t
+
+
+class StageMetrics:
+    """
+    Collector of the metrics of the stages of a pipeline.
+
+    Per stage, the wall time, the number of processed rows, the throughput (rows per second)
+    and (optionally) the peak memory are recorded. Each finished stage is passed to an optional
+    callback, e.g., to forward the metrics to a monitoring system.
+
+    Attributes
+    ----------
+    callback : callable or None
+        Function that is called with the record of each finished stage.
+    trace_memory : bool
+        If True, the peak memory of each stage is traced with tracemalloc.
+    stages : list
+        Records of the finished stages (dictionaries with the keys "stage", "wall_sec", "rows",
+        "rows_per_sec" and "peak_memory_bytes").
+
+    Methods
+    -------
+    stage(name, rows=None)
+        Context manager that measures a stage.
+    report()
+        Get the report of all finished stages.
+
+    Examples
+    --------
+    Record the stages of a bulk build of the NEODyS database
+
+    >>> import SolarY
+    >>> metrics = SolarY.auxiliary.metrics.StageMetrics(callback=print, trace_memory=True)
+    >>> neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True)  # doctest: +SKIP
+    >>> build_report = neo_sqlite.create(bulk=True, metrics=metrics)  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        callback: t.Optional[t.Callable[[t.Dict[str, t.Any]], None]] = None,
+        trace_memory: bool = False,
+    ) -> None:
+        """
+        Init function of the StageMetrics class.
+
+        Parameters
+        ----------
+        callback : callable, optional
+            Function that is called with the record of each finished stage. The default is None.
+        trace_memory : bool, optional
+            If True, the peak memory of each stage is traced with tracemalloc. Tracing slows down
+            memory allocations; thus, it is disabled by default. The default is False.
+        """
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.stages: t.List[t.Dict[str, t.Any]] = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows: t.Optional[int] = None) -> t.Iterator[t.Dict[str, t.Any]]:
+        """
+        Context manager that measures a stage.
+
+        The yielded stage record can be modified within the stage, e.g., to set the number of
+        processed rows once it is known.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage.
+        rows : int, optional
+            Number of rows processed by the stage. The default is None.
+
+        Yields
+        ------
+        stage_record : dict
+            Record of the stage.
+        """
+        stage_record: t.Dict[str, t.Any] = {
+            "stage": name,
+            "wall_sec": None,
+            "rows": rows,
+            "rows_per_sec": None,
+            "peak_memory_bytes": None,
+        }
+
+        # Start the memory tracing. If the tracing has been started outside, the peak is reset
+        # (requires Python 3.9+) and the memory that is allocated at the start is subtracted
+        own_tracing = False
+        trace_peak = False
+        start_memory = 0
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                own_tracing = trace_peak = True
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+                trace_peak = True
+
+        start_time = time.perf_counter()
+        try:
+            yield stage_record
+        finally:
+            # Set the wall time, throughput and peak memory of the stage
+            stage_record["wall_sec"] = time.perf_counter() - start_time
+            if stage_record["rows"] is not None and stage_record["wall_sec"] > 0.0:
+                stage_record["rows_per_sec"] = stage_record["rows"] / stage_record["wall_sec"]
+            if trace_peak:
+                stage_record["peak_memory_bytes"] = max(
+                    tracemalloc.get_traced_memory()[1] - start_memory, 0
+                )
+            if own_tracing:
+                tracemalloc.stop()
+
+            # Store the record and pass it to the callback
+            self.stages.append(stage_record)
+            if self.callback is not None:
+                self.callback(stage_record)
+
+    def report(self) -> t.Dict[str, t.Any]:
+        """
+        Get the report of all finished stages.
+
+        Returns
+        -------
+        stage_report : dict
+            Report with the keys "stages" (list of the stage records) and "wall_sec" (total wall
+            time of all stages).
+        """
+        stage_report = {
+            "stages": [dict(stage_record) for stage_record in self.stages],
+            "wall_sec": sum(stage_record["wall_sec"] for stage_record in self.stages),
+        }
+
+        return stage_report
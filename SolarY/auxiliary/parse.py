@@ -36,6 +36,62 @@ def comp_sha256(file_name: t.Union[str, pathlib.Path]) -> str:
     return sha256_res
 
 
+def split_file_ranges(
+    file_name: t.Union[str, pathlib.Path], nr_ranges: int, skip_lines: int = 0
+) -> t.List[t.Tuple[int, int]]:
+    """
+    Split a text file into byte ranges that are aligned to line breaks.
+
+    Each range starts at the beginning of a line and ends after a line break (or at the end of the
+    file); thus, the ranges can be parsed independently of each other (e.g., by different
+    processes).
+
+    Parameters
+    ----------
+    file_name : str
+        Absolute or relative pathname of the file that shall be split.
+    nr_ranges : int
+        Number of ranges. Fewer ranges are returned for small files.
+    skip_lines : int, optional
+        Number of lines at the beginning of the file (e.g., a header) that are not part of any
+        range. The default is 0.
+
+    Returns
+    -------
+    file_ranges : list
+        List of tuples with the start (inclusive) and end (exclusive) byte offset of each range.
+    """
+    # Check the number of ranges
+    if nr_ranges < 1:
+        raise ValueError("nr_ranges must be a positive integer")
+
+    with pathlib.Path(file_name).open(mode="rb") as f_temp:
+
+        # Skip the header lines and get the file size
+        for _ in range(skip_lines):
+            f_temp.readline()
+        data_start = f_temp.tell()
+        file_size = f_temp.seek(0, os.SEEK_END)
+
+        # Set equidistant split offsets and move each of them to the end of the current line
+        file_ranges = []
+        range_start = data_start
+        for range_idx in range(1, nr_ranges + 1):
+            range_end = data_start + (file_size - data_start) * range_idx // nr_ranges
+            if range_end <= range_start:
+                continue
+            if range_end < file_size:
+                f_temp.seek(range_end - 1)
+                f_temp.readline()
+                range_end = f_temp.tell()
+            file_ranges.append((range_start, range_end))
+            range_start = range_end
+            if range_start >= file_size:
+                break
+
+    return file_ranges
+
+
 def setnget_file_path(dl_path: str, filename: str) -> str:
     """
     Compute the path of a file, depending on its download path.
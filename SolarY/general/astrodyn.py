@@ -1,29 +1,47 @@
 """Miscellaneous functions regarding astro-dynamical topics can be found here."""
-import math
 import typing as t
 
+import numpy as np
+
 from .. import auxiliary as solary_auxiliary
 
+# Absolute tolerance (radians) and maximum number of iterations of the Kepler equation solver
+KEPLER_TOL = 1e-14
+KEPLER_MAX_ITER = 10
+
+# Heliocentric gravitational constant (km^3 * s^-2) and astronomical unit (km) of the constants
+# config file, and the number of seconds per day. Used by the state vector conversions
+GM_SUN_KM3_S2 = float(solary_auxiliary.config.get_constants()["constants"]["gm_sun"])
+ONE_AU_KM = float(solary_auxiliary.config.get_constants()["constants"]["one_au"])
+SEC_PER_DAY = 86400.0
+
+# Maximum number of positions (orbits x times) per block of the two-body propagator. The peak
+# memory usage of a block is about 250 bytes per position (mainly the Kepler equation solver)
+PROPAGATE_BLOCK_SIZE = 1000000
+
 
 def tisserand(
-    sem_maj_axis_obj: float,
-    inc: float,
-    ecc: float,
+    sem_maj_axis_obj: t.Union[float, np.ndarray],
+    inc: t.Union[float, np.ndarray],
+    ecc: t.Union[float, np.ndarray],
     sem_maj_axis_planet: t.Optional[float] = None,
-) -> float:
+) -> t.Union[float, np.ndarray]:
     """
     Compute the Tisserand parameter of an object w.r.t. a larger object.
 
-    If no semi-major axis of a larger object is given, the values for Jupiter are assumed.
+    If no semi-major axis of a larger object is given, the values for Jupiter are assumed. The
+    parameters of the minor object can be arrays; the Tisserand parameter is then computed
+    element-wise. Hyperbolic orbits require a negative semi-major axis; elements with a negative
+    semi-latus rectum a * (1 - e^2) (e.g., a positive semi-major axis with e > 1) result in NaN.
 
     Parameters
     ----------
-    sem_maj_axis_obj : float
+    sem_maj_axis_obj : float or numpy.ndarray
         Semi-major axis of the minor object (whose Tisserand parameter shall be computed) given in
         AU.
-    inc : float
+    inc : float or numpy.ndarray
         Inclination of the minor object given in radians.
-    ecc : float
+    ecc : float or numpy.ndarray
         Eccentricity of the minor object.
     sem_maj_axis_planet : float, optional
         Semi-major axis of the major object. If no value is given, the semi-major axis of Jupiter
@@ -31,8 +49,9 @@ def tisserand(
 
     Returns
     -------
-    tisserand_parameter : float
-        Tisserand parameter of the minor object w.r.t. the major object.
+    tisserand_parameter : float or numpy.ndarray
+        Tisserand parameter of the minor object w.r.t. the major object (float for scalar
+        input).
 
     Notes
     -----
@@ -62,10 +81,17 @@ def tisserand(
         config = solary_auxiliary.config.get_constants()
         sem_maj_axis_planet = float(config["planets"]["sem_maj_axis_jup"])
 
-    # Compute the tisserand parameter
-    tisserand_parameter = (sem_maj_axis_planet / sem_maj_axis_obj) + 2.0 * math.cos(
-        inc
-    ) * math.sqrt((sem_maj_axis_obj / sem_maj_axis_planet) * (1.0 - ecc ** 2.0))
+    # Compute the tisserand parameter (element-wise for arrays; NaN for a negative semi-latus
+    # rectum)
+    sem_maj_axis_obj = np.asarray(sem_maj_axis_obj, dtype=np.float64)
+    ecc = np.asarray(ecc, dtype=np.float64)
+    tisserand_parameter: t.Union[float, np.ndarray]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tisserand_parameter = (sem_maj_axis_planet / sem_maj_axis_obj) + 2.0 * np.cos(
+            inc
+        ) * np.sqrt((sem_maj_axis_obj / sem_maj_axis_planet) * (1.0 - ecc ** 2.0))
+    if np.ndim(tisserand_parameter) == 0:
+        tisserand_parameter = float(tisserand_parameter)
 
     return tisserand_parameter
 
@@ -112,18 +138,677 @@ def kep_periapsis(sem_maj_axis: float, ecc: float) -> float:
     return periapsis
 
 
-def mjd2jd(m_juldate: float) -> float:
+def _kepler_resid(
+    ecc_anom: np.ndarray, ecc: np.ndarray, mean_anom: np.ndarray
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the residual of the Kepler equation and its first and second derivatives.
+
+    The residual E - e * sin(E) - M is computed as (1 - e) * E + e * (E - sin(E)) - M, where
+    E - sin(E) is computed with its Taylor series for small E, and the first derivative
+    1 - e * cos(E) as (1 - e) + e * (1 - cos(E)). Thus, there is no cancellation for
+    near-parabolic orbits.
+
+    Parameters
+    ----------
+    ecc_anom : numpy.ndarray
+        Eccentric anomaly given in radians (within [-pi, pi]).
+    ecc : numpy.ndarray
+        Eccentricity.
+    mean_anom : numpy.ndarray
+        Mean anomaly given in radians (within [-pi, pi]).
+
+    Returns
+    -------
+    resid : numpy.ndarray
+        Residual of the Kepler equation.
+    deriv_1 : numpy.ndarray
+        First derivative of the residual w.r.t. the eccentric anomaly.
+    deriv_2 : numpy.ndarray
+        Second derivative of the residual w.r.t. the eccentric anomaly.
+    """
+    sin_e = np.sin(ecc_anom)
+    cos_e = np.cos(ecc_anom)
+
+    # Compute E - sin(E); small values (|E| < 0.5) with the Taylor series up to E^13
+    e_minus_sin_e = ecc_anom - sin_e
+    small = np.flatnonzero(np.abs(ecc_anom) < 0.5)
+    if small.size:
+        ecc_anom_small = ecc_anom[small]
+        ecc_anom_sq = ecc_anom_small * ecc_anom_small
+        term = ecc_anom_small * ecc_anom_sq / 6.0
+        series = term
+        for power in range(5, 15, 2):
+            term = -term * ecc_anom_sq / ((power - 1) * power)
+            series = series + term
+        e_minus_sin_e[small] = series
+
+    # Compute 1 - cos(E) without cancellation for small E
+    with np.errstate(invalid="ignore", divide="ignore"):
+        one_minus_cos_e = np.where(cos_e > 0.0, sin_e * sin_e / (1.0 + cos_e), 1.0 - cos_e)
+
+    resid = (1.0 - ecc) * ecc_anom + ecc * e_minus_sin_e - mean_anom
+    deriv_1 = (1.0 - ecc) + ecc * one_minus_cos_e
+    deriv_2 = ecc * sin_e
+
+    return resid, deriv_1, deriv_2
+
+
+def solve_kepler(
+    mean_anom: t.Union[float, np.ndarray],
+    ecc: t.Union[float, np.ndarray],
+    tol: float = KEPLER_TOL,
+    max_iter: int = KEPLER_MAX_ITER,
+) -> np.ndarray:
+    """
+    Solve the Kepler equation M = E - e * sin(E) for the eccentric anomaly of elliptic orbits.
+
+    The solver works on arrays: the starter of Mikkola (1987) -1- is refined by Halley
+    iterations. Only elements that have not converged yet (correction larger than tol) are
+    iterated. The residual and its derivative are computed without cancellation; thus, the
+    solver is robust for near-parabolic orbits (e close to 1, small M).
+
+    Parameters
+    ----------
+    mean_anom : numpy.ndarray or float
+        Mean anomaly given in radians (any revolution).
+    ecc : numpy.ndarray or float
+        Eccentricity (0 <= e < 1). Broadcast against mean_anom.
+    tol : float, optional
+        Absolute tolerance of the eccentric anomaly given in radians. The default is KEPLER_TOL.
+    max_iter : int, optional
+        Maximum number of Halley iterations. The default is KEPLER_MAX_ITER.
+
+    Returns
+    -------
+    ecc_anom : numpy.ndarray
+        Eccentric anomaly given in radians (same revolution as the mean anomaly).
+
+    Raises
+    ------
+    ValueError
+        If an eccentricity is not within [0, 1).
+
+    References
+    ----------
+    -1- Mikkola, S. (1987): A cubic approximation for Kepler's equation. Celestial Mechanics,
+    40, 329-334.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import SolarY
+    >>> ecc_anom = SolarY.general.astrodyn.solve_kepler(np.array([0.5, 3.0]), 0.3)
+    >>> np.round(ecc_anom, 6).tolist()
+    [0.69125, 3.032625]
+    """
+    # Broadcast and check the input
+    mean_anom, ecc = np.broadcast_arrays(
+        np.asarray(mean_anom, dtype=np.float64), np.asarray(ecc, dtype=np.float64)
+    )
+    anom_shape = mean_anom.shape
+    mean_anom = mean_anom.ravel()
+    ecc = ecc.ravel()
+    if np.any((ecc < 0.0) | (ecc >= 1.0)):
+        raise ValueError("The eccentricities must be within [0, 1)")
+
+    # Reduce the mean anomaly to [-pi, pi]. Values within the range are kept exactly; otherwise,
+    # small values would lose their precision
+    mean_anom_red = np.where(
+        np.abs(mean_anom) > np.pi,
+        np.remainder(mean_anom + np.pi, 2.0 * np.pi) - np.pi,
+        mean_anom,
+    )
+
+    # Starter of Mikkola (1987)
+    alpha = (1.0 - ecc) / (4.0 * ecc + 0.5)
+    beta = 0.5 * mean_anom_red / (4.0 * ecc + 0.5)
+    z_cub = np.cbrt(beta + np.sign(beta) * np.sqrt(beta * beta + alpha * alpha * alpha))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s_mik = np.where(z_cub != 0.0, z_cub - alpha / z_cub, 0.0)
+    s_mik_sq = s_mik * s_mik
+    s_mik = s_mik - 0.078 * s_mik * s_mik_sq * s_mik_sq / (1.0 + ecc)
+    ecc_anom = mean_anom_red + ecc * s_mik * (3.0 - 4.0 * s_mik * s_mik)
+
+    # Halley iterations of the elements that have not converged yet
+    active = np.flatnonzero(np.isfinite(ecc_anom))
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        ecc_anom_act = ecc_anom[active]
+        resid, deriv_1, deriv_2 = _kepler_resid(
+            ecc_anom_act, ecc[active], mean_anom_red[active]
+        )
+        correction = resid / (deriv_1 - 0.5 * resid * deriv_2 / deriv_1)
+        ecc_anom[active] = ecc_anom_act - correction
+        active = active[np.abs(correction) > tol]
+
+    # Add the revolutions of the mean anomaly
+    ecc_anom = (ecc_anom + (mean_anom - mean_anom_red)).reshape(anom_shape)
+
+    return ecc_anom
+
+
+def kep_ecc_anom(
+    mean_anom: float, ecc: float, tol: float = KEPLER_TOL, max_iter: int = KEPLER_MAX_ITER
+) -> float:
+    """
+    Solve the Kepler equation of a single orbit (see solve_kepler).
+
+    Parameters
+    ----------
+    mean_anom : float
+        Mean anomaly given in radians.
+    ecc : float
+        Eccentricity (0 <= e < 1).
+    tol : float, optional
+        Absolute tolerance of the eccentric anomaly given in radians. The default is KEPLER_TOL.
+    max_iter : int, optional
+        Maximum number of Halley iterations. The default is KEPLER_MAX_ITER.
+
+    Returns
+    -------
+    ecc_anom : float
+        Eccentric anomaly given in radians.
+    """
+    ecc_anom = float(solve_kepler(np.array([mean_anom]), ecc, tol=tol, max_iter=max_iter)[0])
+
+    return ecc_anom
+
+
+def kep_true_anom(
+    ecc_anom: t.Union[float, np.ndarray], ecc: t.Union[float, np.ndarray]
+) -> np.ndarray:
+    """
+    Compute the true anomaly from the eccentric anomaly of elliptic orbits.
+
+    Parameters
+    ----------
+    ecc_anom : numpy.ndarray or float
+        Eccentric anomaly given in radians.
+    ecc : numpy.ndarray or float
+        Eccentricity (0 <= e < 1).
+
+    Returns
+    -------
+    true_anom : numpy.ndarray
+        True anomaly given in radians (same revolution as the eccentric anomaly).
+    """
+    ecc_anom = np.asarray(ecc_anom, dtype=np.float64)
+    ecc = np.asarray(ecc, dtype=np.float64)
+    true_anom = 2.0 * np.arctan2(
+        np.sqrt(1.0 + ecc) * np.sin(0.5 * ecc_anom), np.sqrt(1.0 - ecc) * np.cos(0.5 * ecc_anom)
+    )
+
+    # Add the revolutions of the eccentric anomaly
+    true_anom = true_anom + 2.0 * np.pi * np.round((ecc_anom - true_anom) / (2.0 * np.pi))
+
+    return true_anom
+
+
+def _grav_param(spatial_unit: str, grav_param: t.Optional[float]) -> float:
+    """
+    Get the gravitational parameter of the central body in the units of the state vectors.
+
+    Parameters
+    ----------
+    spatial_unit : str
+        Spatial unit: "AU" (velocities in AU/day) or "km" (velocities in km/s).
+    grav_param : float, optional
+        Gravitational parameter given in km^3 * s^-2. If None, the heliocentric gravitational
+        constant (GM_SUN_KM3_S2) is taken.
+
+    Returns
+    -------
+    grav_param_unit : float
+        Gravitational parameter given in AU^3 * day^-2 or km^3 * s^-2.
+
+    Raises
+    ------
+    ValueError
+        If the spatial unit is unknown.
+    """
+    grav_param_km = GM_SUN_KM3_S2 if grav_param is None else grav_param
+
+    # Convert the gravitational parameter to AU^3 * day^-2, if applicable
+    if spatial_unit == "AU":
+        grav_param_unit = grav_param_km * SEC_PER_DAY ** 2 / ONE_AU_KM ** 3
+    elif spatial_unit == "km":
+        grav_param_unit = grav_param_km
+    else:
+        raise ValueError(f"Unknown spatial unit {spatial_unit}; use AU or km")
+
+    return grav_param_unit
+
+
+def _check_angle_unit(angle_unit: str) -> None:
+    """
+    Check the angle unit.
+
+    Parameters
+    ----------
+    angle_unit : str
+        Angle unit.
+
+    Raises
+    ------
+    ValueError
+        If the angle unit is neither "deg" nor "rad".
+    """
+    if angle_unit not in ("deg", "rad"):
+        raise ValueError(f"Unknown angle unit {angle_unit}; use deg or rad")
+
+
+def _perifocal_basis(
+    incl: np.ndarray, long_asc_node: np.ndarray, arg_peri: np.ndarray
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the unit vectors of the orbital planes in the reference frame.
+
+    Parameters
+    ----------
+    incl : numpy.ndarray
+        Inclination given in radians.
+    long_asc_node : numpy.ndarray
+        Longitude of the ascending node given in radians.
+    arg_peri : numpy.ndarray
+        Argument of periapsis given in radians.
+
+    Returns
+    -------
+    unit_p : numpy.ndarray
+        Unit vectors towards the periapsis with the shape (N, 3).
+    unit_q : numpy.ndarray
+        Unit vectors 90 degrees ahead of the periapsis in the orbital plane with the shape (N, 3).
+    """
+    sin_node, cos_node = np.sin(long_asc_node), np.cos(long_asc_node)
+    sin_argp, cos_argp = np.sin(arg_peri), np.cos(arg_peri)
+    sin_incl, cos_incl = np.sin(incl), np.cos(incl)
+    unit_p = np.column_stack(
+        (
+            cos_node * cos_argp - sin_node * sin_argp * cos_incl,
+            sin_node * cos_argp + cos_node * sin_argp * cos_incl,
+            sin_argp * sin_incl,
+        )
+    )
+    unit_q = np.column_stack(
+        (
+            -cos_node * sin_argp - sin_node * cos_argp * cos_incl,
+            -sin_node * sin_argp + cos_node * cos_argp * cos_incl,
+            cos_argp * sin_incl,
+        )
+    )
+
+    return unit_p, unit_q
+
+
+def kep2cart(
+    sem_maj_axis: t.Union[float, np.ndarray],
+    ecc: t.Union[float, np.ndarray],
+    incl: t.Union[float, np.ndarray],
+    long_asc_node: t.Union[float, np.ndarray],
+    arg_peri: t.Union[float, np.ndarray],
+    mean_anom: t.Union[float, np.ndarray],
+    spatial_unit: str = "AU",
+    angle_unit: str = "deg",
+    grav_param: t.Optional[float] = None,
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert Keplerian elements of elliptic orbits to Cartesian state vectors.
+
+    All elements are arrays of N orbits (or scalars that are broadcast); the conversion is
+    vectorized and uses solve_kepler. The state vectors refer to the reference frame of the
+    elements (e.g., ECLIPJ2000 for the NEO databases).
+
+    Parameters
+    ----------
+    sem_maj_axis : numpy.ndarray or float
+        Semi-major axis given in the spatial unit.
+    ecc : numpy.ndarray or float
+        Eccentricity (0 <= e < 1).
+    incl : numpy.ndarray or float
+        Inclination given in the angle unit.
+    long_asc_node : numpy.ndarray or float
+        Longitude of the ascending node given in the angle unit.
+    arg_peri : numpy.ndarray or float
+        Argument of periapsis given in the angle unit.
+    mean_anom : numpy.ndarray or float
+        Mean anomaly given in the angle unit.
+    spatial_unit : str, optional
+        Spatial unit: "AU" (velocities in AU/day) or "km" (velocities in km/s). The default is
+        "AU".
+    angle_unit : str, optional
+        Angle unit: "deg" or "rad". The default is "deg".
+    grav_param : float, optional
+        Gravitational parameter of the central body given in km^3 * s^-2. If None, the
+        heliocentric gravitational constant (GM_SUN_KM3_S2) is taken. The default is None.
+
+    Returns
+    -------
+    position : numpy.ndarray
+        Positions with the shape (N, 3) given in the spatial unit.
+    velocity : numpy.ndarray
+        Velocities with the shape (N, 3) given in AU/day or km/s.
+
+    Raises
+    ------
+    ValueError
+        If a unit is unknown or an eccentricity is not within [0, 1).
+
+    See Also
+    --------
+    cart2kep, SolarY.neo.astrodyn.neo_state_vectors
+
+    Examples
+    --------
+    A circular orbit with a radius of 1 AU in the x-y plane at a mean anomaly of 90 degrees
+
+    >>> import SolarY
+    >>> position, velocity = SolarY.general.astrodyn.kep2cart(1.0, 0.0, 0.0, 0.0, 0.0, 90.0)
+    >>> position.round(12).tolist()
+    [[0.0, 1.0, 0.0]]
+    >>> round(float(velocity[0, 0]), 6)
+    -0.017202
+    """
+    grav_param_unit = _grav_param(spatial_unit, grav_param)
+    _check_angle_unit(angle_unit)
+
+    # Broadcast the elements to 1-D arrays and convert the angles to radians
+    elements = np.broadcast_arrays(
+        *(
+            np.atleast_1d(np.asarray(element, dtype=np.float64)).ravel()
+            for element in (sem_maj_axis, ecc, incl, long_asc_node, arg_peri, mean_anom)
+        )
+    )
+    sem_maj_axis, ecc = elements[0], elements[1]
+    incl, long_asc_node, arg_peri, mean_anom = (
+        np.radians(angle) if angle_unit == "deg" else angle for angle in elements[2:]
+    )
+
+    # Compute the position and velocity in the orbital plane (x-axis towards the periapsis)
+    ecc_anom = solve_kepler(mean_anom, ecc)
+    sin_e, cos_e = np.sin(ecc_anom), np.cos(ecc_anom)
+    sqrt_one_minus_ecc_sq = np.sqrt((1.0 - ecc) * (1.0 + ecc))
+    radius = sem_maj_axis * (1.0 - ecc * cos_e)
+    vel_factor = np.sqrt(grav_param_unit * sem_maj_axis) / radius
+    plane_pos = (sem_maj_axis * (cos_e - ecc), sem_maj_axis * sqrt_one_minus_ecc_sq * sin_e)
+    plane_vel = (-vel_factor * sin_e, vel_factor * sqrt_one_minus_ecc_sq * cos_e)
+
+    # Rotate the orbital plane into the reference frame
+    unit_p, unit_q = _perifocal_basis(incl, long_asc_node, arg_peri)
+    position = plane_pos[0][:, np.newaxis] * unit_p + plane_pos[1][:, np.newaxis] * unit_q
+    velocity = plane_vel[0][:, np.newaxis] * unit_p + plane_vel[1][:, np.newaxis] * unit_q
+
+    return position, velocity
+
+
+def cart2kep(
+    position: np.ndarray,
+    velocity: np.ndarray,
+    spatial_unit: str = "AU",
+    angle_unit: str = "deg",
+    grav_param: t.Optional[float] = None,
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert Cartesian state vectors to Keplerian elements (inverse of kep2cart).
+
+    The conversion is vectorized. For equatorial orbits the longitude of the ascending node is
+    set to 0, and for circular orbits the argument of periapsis is set to 0. The angles are
+    within [0, 360) degrees (or [0, 2 * pi) radians). For unbound orbits (e >= 1) the semi-major
+    axis is negative (or infinite) and the mean anomaly is NaN.
+
+    Parameters
+    ----------
+    position : numpy.ndarray
+        Positions with the shape (N, 3) (or (3,)) given in the spatial unit.
+    velocity : numpy.ndarray
+        Velocities with the shape (N, 3) (or (3,)) given in AU/day or km/s.
+    spatial_unit : str, optional
+        Spatial unit: "AU" (velocities in AU/day) or "km" (velocities in km/s). The default is
+        "AU".
+    angle_unit : str, optional
+        Angle unit of the returned angles: "deg" or "rad". The default is "deg".
+    grav_param : float, optional
+        Gravitational parameter of the central body given in km^3 * s^-2. If None, the
+        heliocentric gravitational constant (GM_SUN_KM3_S2) is taken. The default is None.
+
+    Returns
+    -------
+    sem_maj_axis : numpy.ndarray
+        Semi-major axis given in the spatial unit.
+    ecc : numpy.ndarray
+        Eccentricity.
+    incl : numpy.ndarray
+        Inclination given in the angle unit.
+    long_asc_node : numpy.ndarray
+        Longitude of the ascending node given in the angle unit.
+    arg_peri : numpy.ndarray
+        Argument of periapsis given in the angle unit.
+    mean_anom : numpy.ndarray
+        Mean anomaly given in the angle unit.
+
+    Raises
+    ------
+    ValueError
+        If a unit is unknown.
+
+    See Also
+    --------
+    kep2cart
+    """
+    grav_param_unit = _grav_param(spatial_unit, grav_param)
+    _check_angle_unit(angle_unit)
+    position = np.atleast_2d(np.asarray(position, dtype=np.float64))
+    velocity = np.atleast_2d(np.asarray(velocity, dtype=np.float64))
+
+    # Compute the radius, the specific angular momentum and the eccentricity vector
+    radius = np.linalg.norm(position, axis=1)
+    speed_sq = np.einsum("ij,ij->i", velocity, velocity)
+    radial_vel = np.einsum("ij,ij->i", position, velocity)
+    ang_mom = np.cross(position, velocity)
+    ang_mom_norm = np.linalg.norm(ang_mom, axis=1)
+    ecc_vec = (
+        (speed_sq - grav_param_unit / radius)[:, np.newaxis] * position
+        - radial_vel[:, np.newaxis] * velocity
+    ) / grav_param_unit
+    ecc = np.linalg.norm(ecc_vec, axis=1)
+
+    # Compute the semi-major axis (vis-viva equation) and the inclination
+    with np.errstate(divide="ignore"):
+        sem_maj_axis = 1.0 / (2.0 / radius - speed_sq / grav_param_unit)
+    ang_mom_xy = np.hypot(ang_mom[:, 0], ang_mom[:, 1])
+    incl = np.arctan2(ang_mom_xy, ang_mom[:, 2])
+
+    # Compute the longitude of the ascending node (0 for equatorial orbits) and the argument of
+    # latitude of the position (angle between the ascending node and the position)
+    equatorial = ang_mom_xy <= 1e-15 * ang_mom_norm
+    long_asc_node = np.where(equatorial, 0.0, np.arctan2(ang_mom[:, 0], -ang_mom[:, 1]))
+    unit_node = np.column_stack(
+        (np.cos(long_asc_node), np.sin(long_asc_node), np.zeros_like(long_asc_node))
+    )
+    unit_normal = ang_mom / ang_mom_norm[:, np.newaxis]
+    arg_lat = np.arctan2(
+        np.einsum("ij,ij->i", np.cross(unit_normal, unit_node), position),
+        np.einsum("ij,ij->i", unit_node, position),
+    )
+
+    # Compute the true anomaly (e * cos(v) and e * sin(v) follow from the angular momentum and
+    # the radial velocity). For circular orbits the periapsis is set to the ascending node
+    circular = ecc <= 1e-12
+    true_anom = np.where(
+        circular,
+        arg_lat,
+        np.arctan2(
+            radial_vel * ang_mom_norm / (grav_param_unit * radius),
+            ang_mom_norm ** 2 / (grav_param_unit * radius) - 1.0,
+        ),
+    )
+    arg_peri = arg_lat - true_anom
+
+    # Compute the mean anomaly of elliptic orbits
+    with np.errstate(invalid="ignore"):
+        ecc_anom = 2.0 * np.arctan2(
+            np.sqrt(1.0 - ecc) * np.sin(0.5 * true_anom),
+            np.sqrt(1.0 + ecc) * np.cos(0.5 * true_anom),
+        )
+    mean_anom = np.where(ecc < 1.0, ecc_anom - ecc * np.sin(ecc_anom), np.nan)
+
+    # Map the angles to [0, 2 * pi) and convert them to the angle unit
+    long_asc_node, arg_peri, mean_anom = (
+        np.mod(angle, 2.0 * np.pi) for angle in (long_asc_node, arg_peri, mean_anom)
+    )
+    if angle_unit == "deg":
+        incl, long_asc_node, arg_peri, mean_anom = (
+            np.degrees(angle) for angle in (incl, long_asc_node, arg_peri, mean_anom)
+        )
+
+    return sem_maj_axis, ecc, incl, long_asc_node, arg_peri, mean_anom
+
+
+def propagate_kepler(
+    sem_maj_axis: t.Union[float, np.ndarray],
+    ecc: t.Union[float, np.ndarray],
+    incl: t.Union[float, np.ndarray],
+    long_asc_node: t.Union[float, np.ndarray],
+    arg_peri: t.Union[float, np.ndarray],
+    mean_anom: t.Union[float, np.ndarray],
+    epoch_mjd: t.Union[float, np.ndarray],
+    times_mjd: t.Union[float, t.Sequence[float], np.ndarray],
+    spatial_unit: str = "AU",
+    angle_unit: str = "deg",
+    grav_param: t.Optional[float] = None,
+    block_size: int = PROPAGATE_BLOCK_SIZE,
+) -> t.Iterator[t.Tuple[np.ndarray, np.ndarray]]:
+    """
+    Propagate elliptic orbits on a time grid (two-body problem) and yield the positions blockwise.
+
+    Each orbit has its own epoch; the mean anomalies are propagated with the mean motions to the
+    times of the grid, and the Kepler equation is solved with solve_kepler. The positions are
+    yielded in blocks of consecutive times with at most block_size positions (orbits x times);
+    thus, the memory usage is bounded for grids whose positions exceed the memory.
+
+    Parameters
+    ----------
+    sem_maj_axis : numpy.ndarray or float
+        Semi-major axis given in the spatial unit.
+    ecc : numpy.ndarray or float
+        Eccentricity (0 <= e < 1).
+    incl : numpy.ndarray or float
+        Inclination given in the angle unit.
+    long_asc_node : numpy.ndarray or float
+        Longitude of the ascending node given in the angle unit.
+    arg_peri : numpy.ndarray or float
+        Argument of periapsis given in the angle unit.
+    mean_anom : numpy.ndarray or float
+        Mean anomaly at the epoch given in the angle unit.
+    epoch_mjd : numpy.ndarray or float
+        Epoch of the elements given in MJD. Julian Dates can be converted with jd2mjd.
+    times_mjd : numpy.ndarray, sequence or float
+        Time grid given in MJD (same time scale as the epochs).
+    spatial_unit : str, optional
+        Spatial unit: "AU" or "km". The default is "AU".
+    angle_unit : str, optional
+        Angle unit: "deg" or "rad". The default is "deg".
+    grav_param : float, optional
+        Gravitational parameter of the central body given in km^3 * s^-2. If None, the
+        heliocentric gravitational constant (GM_SUN_KM3_S2) is taken. The default is None.
+    block_size : int, optional
+        Maximum number of positions per block. Each block contains at least one time. The
+        default is PROPAGATE_BLOCK_SIZE.
+
+    Yields
+    ------
+    times_block : numpy.ndarray
+        Times of the block given in MJD.
+    position : numpy.ndarray
+        Positions with the shape (N, len(times_block), 3) given in the spatial unit.
+
+    Raises
+    ------
+    ValueError
+        If a unit is unknown, an eccentricity is not within [0, 1) or the block size is not
+        positive.
+
+    See Also
+    --------
+    kep2cart, SolarY.neo.astrodyn.propagate_neos
+
+    Examples
+    --------
+    A circular orbit of 1 AU after a quarter of its orbital period
+
+    >>> import math
+    >>> import SolarY
+    >>> period_days = 2.0 * math.pi / math.sqrt(
+    ...     SolarY.general.astrodyn.GM_SUN_KM3_S2 * SolarY.general.astrodyn.SEC_PER_DAY ** 2
+    ...     / SolarY.general.astrodyn.ONE_AU_KM ** 3
+    ... )
+    >>> for times_block, position in SolarY.general.astrodyn.propagate_kepler(
+    ...     1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 59600.0, [59600.0 + period_days / 4.0]
+    ... ):
+    ...     print(position.round(12).tolist())
+    [[[0.0, 1.0, 0.0]]]
+    """
+    # Check the input
+    grav_param_unit = _grav_param(spatial_unit, grav_param)
+    _check_angle_unit(angle_unit)
+    if block_size < 1:
+        raise ValueError("block_size must be a positive integer")
+
+    # Broadcast the elements and epochs to 1-D arrays and convert the angles to radians
+    elements = np.broadcast_arrays(
+        *(
+            np.atleast_1d(np.asarray(element, dtype=np.float64)).ravel()
+            for element in (sem_maj_axis, ecc, incl, long_asc_node, arg_peri, mean_anom, epoch_mjd)
+        )
+    )
+    sem_maj_axis, ecc, epoch_mjd = elements[0], elements[1], elements[6]
+    incl, long_asc_node, arg_peri, mean_anom = (
+        np.radians(angle) if angle_unit == "deg" else angle for angle in elements[2:6]
+    )
+    times_mjd = np.atleast_1d(np.asarray(times_mjd, dtype=np.float64)).ravel()
+    if np.any((ecc < 0.0) | (ecc >= 1.0)):
+        raise ValueError("The eccentricity must be within [0, 1)")
+
+    # Compute the time-independent quantities: the mean motion (radians per day), the semi-minor
+    # axis and the unit vectors of the orbital planes
+    time_unit_sec = SEC_PER_DAY if spatial_unit == "km" else 1.0
+    mean_motion = np.sqrt(grav_param_unit / sem_maj_axis ** 3) * time_unit_sec
+    sem_min_axis = sem_maj_axis * np.sqrt((1.0 - ecc) * (1.0 + ecc))
+    unit_p, unit_q = _perifocal_basis(incl, long_asc_node, arg_peri)
+
+    # Propagate the orbits block-wise
+    nr_block_times = max(1, block_size // max(1, len(sem_maj_axis)))
+    for block_start in range(0, len(times_mjd), nr_block_times):
+        block_end = block_start + nr_block_times
+        times_block = times_mjd[block_start:block_end]
+        ecc_anom = solve_kepler(
+            mean_anom[:, np.newaxis]
+            + mean_motion[:, np.newaxis] * (times_block[np.newaxis, :] - epoch_mjd[:, np.newaxis]),
+            ecc[:, np.newaxis],
+        )
+        plane_x = sem_maj_axis[:, np.newaxis] * (np.cos(ecc_anom) - ecc[:, np.newaxis])
+        plane_y = sem_min_axis[:, np.newaxis] * np.sin(ecc_anom)
+        position = (
+            plane_x[:, :, np.newaxis] * unit_p[:, np.newaxis, :]
+            + plane_y[:, :, np.newaxis] * unit_q[:, np.newaxis, :]
+        )
+
+        yield times_block, position
+
+
+def mjd2jd(m_juldate: t.Union[float, np.ndarray]) -> t.Union[float, np.ndarray]:
     """
     Convert the given Julian Date to the Modified Julian Date.
 
     Parameters
     ----------
-    m_juldate : float
+    m_juldate : float or numpy.ndarray
         Modified Julian Date.
 
     Returns
     -------
-    juldate : float
+    juldate : float or numpy.ndarray
         Julian Date.
     """
     juldate = m_juldate + 2400000.5
@@ -131,18 +816,18 @@ def mjd2jd(m_juldate: float) -> float:
     return juldate
 
 
-def jd2mjd(juldate: float) -> float:
+def jd2mjd(juldate: t.Union[float, np.ndarray]) -> t.Union[float, np.ndarray]:
     """
     Convert the Modified Julian Date to the Julian Date.
 
     Parameters
     ----------
-    juldate : float
+    juldate : float or numpy.ndarray
         Julian Date.
 
     Returns
     -------
-    m_juldate : float
+    m_juldate : float or numpy.ndarray
         Modified Julian Date.
     """
     m_juldate = juldate - 2400000.5
@@ -1,4 +1,9 @@
 """Submodule contains Near-Earth Objects (NEOs) related topics."""
 # flake8: noqa
 from . import astrodyn
+from . import catalog
 from . import data
+from . import population
+from . import similarity
+from . import synthetic
+from . import benchmark
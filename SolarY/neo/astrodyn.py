@@ -1,4 +1,9 @@
 """NEO related astro-dynamical functions and classes."""
+import typing as t
+
+import numpy as np
+
+from .. import general as solary_general
 
 
 def neo_class(sem_maj_axis_au: float,
@@ -23,6 +28,10 @@ def neo_class(sem_maj_axis_au: float,
     neo_type : str
         NEO class / type.
 
+    See Also
+    --------
+    SolarY.neo.astrodyn.classify_orbits
+
     References
     ----------
     -1- Link to the NEO classifiction schema: https://cneos.jpl.nasa.gov/about/neo_groups.html
@@ -44,3 +53,377 @@ def neo_class(sem_maj_axis_au: float,
         neo_type = 'Other'
 
     return neo_type
+
+
+# Variables of the orbit classification rules and the corresponding columns of the NEO databases
+ORBIT_CLASS_COLUMNS = {
+    "a": "SemMajAxis_AU",
+    "q": "Perihel_AU",
+    "Q": "Aphel_AU",
+    "i": "Incl_deg",
+    "T_J": "TisserandJup_",
+}
+
+# Rule table of the orbit classification. Each rule is a tuple of a class name and the (exclusive)
+# bounds (lower, upper) of the rule's variables (a, q, Q: AU; i: degrees; T_J: Tisserand parameter
+# w.r.t. Jupiter); None denotes an open bound. The first matching rule determines the class;
+# orbits that match no rule are classified as "Other". The NEO rules correspond to neo_class;
+# the remaining ones follow the JPL SBDB orbit classes
+ORBIT_CLASS_RULES: t.Tuple[t.Tuple[str, t.Dict[str, t.Tuple[t.Optional[float], ...]]], ...] = (
+    ("Amor", {"a": (1.0, None), "q": (1.017, 1.3)}),
+    ("Apollo", {"a": (1.0, None), "q": (None, 1.017)}),
+    ("Aten", {"a": (None, 1.0), "Q": (0.983, None)}),
+    ("Atira", {"a": (None, 1.0), "Q": (None, 0.983)}),
+    ("Mars-crosser", {"a": (None, 3.2), "q": (1.3, 1.666)}),
+    ("Main-belt", {"a": (2.0, 3.2), "q": (1.666, None)}),
+    ("Hilda", {"a": (3.7, 4.2), "i": (None, 20.0)}),
+    ("Jupiter Trojan", {"a": (5.05, 5.35)}),
+    ("JFC", {"a": (None, 7.37), "T_J": (2.0, 3.0)}),
+)
+
+# Rules of the NEO classes only (see neo_class)
+NEO_CLASS_RULES = ORBIT_CLASS_RULES[:4]
+
+# Class name of orbits that match no rule
+OTHER_CLASS = "Other"
+
+
+def orbit_class_names(
+    rules: t.Sequence[t.Tuple[str, t.Dict[str, t.Tuple[t.Optional[float], ...]]]] = (
+        ORBIT_CLASS_RULES
+    ),
+) -> t.List[str]:
+    """
+    Get the class names of the categorical codes of an orbit classification rule table.
+
+    Parameters
+    ----------
+    rules : sequence, optional
+        Rule table (see ORBIT_CLASS_RULES). The default is ORBIT_CLASS_RULES.
+
+    Returns
+    -------
+    class_names : list
+        Class names; the code of a class is its index. The last class is OTHER_CLASS.
+    """
+    class_names = [class_name for class_name, _ in rules] + [OTHER_CLASS]
+
+    return class_names
+
+
+def classify_orbits(
+    sem_maj_axis_au: np.ndarray,
+    peri_helio_au: np.ndarray,
+    ap_helio_au: np.ndarray,
+    incl_deg: t.Optional[np.ndarray] = None,
+    tisserand_jup: t.Optional[np.ndarray] = None,
+    rules: t.Sequence[t.Tuple[str, t.Dict[str, t.Tuple[t.Optional[float], ...]]]] = (
+        ORBIT_CLASS_RULES
+    ),
+) -> np.ndarray:
+    """
+    Classify orbits with a rule table (vectorized version of neo_class with further classes).
+
+    The rules are evaluated for all orbits at once; the first matching rule determines the
+    class. Orbits with NaN values in the variables of a rule do not match the rule.
+
+    Parameters
+    ----------
+    sem_maj_axis_au : numpy.ndarray
+        Semi-major axis given in AU (variable "a").
+    peri_helio_au : numpy.ndarray
+        Perihelion given in AU (variable "q").
+    ap_helio_au : numpy.ndarray
+        Aphelion given in AU (variable "Q").
+    incl_deg : numpy.ndarray, optional
+        Inclination given in degrees (variable "i"). Required, if a rule uses it. The default is
+        None.
+    tisserand_jup : numpy.ndarray, optional
+        Tisserand parameter w.r.t. Jupiter (variable "T_J"; see
+        SolarY.general.astrodyn.tisserand). Required, if a rule uses it. The default is None.
+    rules : sequence, optional
+        Rule table (see ORBIT_CLASS_RULES). The default is ORBIT_CLASS_RULES.
+
+    Returns
+    -------
+    class_codes : numpy.ndarray
+        Categorical codes (int8) of the classes. The class names are given by
+        orbit_class_names(rules).
+
+    Raises
+    ------
+    ValueError
+        If a rule uses an unknown or a missing variable, or if the rule table has more than 126
+        rules.
+
+    Examples
+    --------
+    Classify an Apollo and a main-belt asteroid
+
+    >>> import numpy as np
+    >>> import SolarY
+    >>> class_codes = SolarY.neo.astrodyn.classify_orbits(
+    ...     sem_maj_axis_au=np.array([1.5, 2.7]),
+    ...     peri_helio_au=np.array([0.8, 2.4]),
+    ...     ap_helio_au=np.array([2.2, 3.0]),
+    ...     incl_deg=np.array([5.0, 10.0]),
+    ...     tisserand_jup=np.array([4.5, 3.3]),
+    ... )
+    >>> np.array(SolarY.neo.astrodyn.orbit_class_names())[class_codes].tolist()
+    ['Apollo', 'Main-belt']
+    """
+    # Check the input
+    if len(rules) > np.iinfo(np.int8).max - 1:
+        raise ValueError("At most 126 rules are supported")
+    orbit_vars = {
+        "a": sem_maj_axis_au,
+        "q": peri_helio_au,
+        "Q": ap_helio_au,
+        "i": incl_deg,
+        "T_J": tisserand_jup,
+    }
+
+    # Evaluate the conditions of all rules
+    rule_conds = []
+    for class_name, rule_bounds in rules:
+        rule_cond = np.ones(np.shape(sem_maj_axis_au), dtype=bool)
+        for var_name, (lower, upper) in rule_bounds.items():
+            if var_name not in orbit_vars:
+                raise ValueError(f"Unknown variable {var_name} of the class {class_name}")
+            if orbit_vars[var_name] is None:
+                raise ValueError(f"The class {class_name} requires the variable {var_name}")
+            var_values = np.asarray(orbit_vars[var_name], dtype=np.float64)
+            if lower is not None:
+                rule_cond &= var_values > lower
+            if upper is not None:
+                rule_cond &= var_values < upper
+        rule_conds.append(rule_cond)
+
+    # Set the code of the first matching rule
+    class_codes = np.select(rule_conds, np.arange(len(rules)), default=len(rules)).astype(np.int8)
+
+    return class_codes
+
+
+def orbit_class_sql(
+    rules: t.Sequence[t.Tuple[str, t.Dict[str, t.Tuple[t.Optional[float], ...]]]] = (
+        ORBIT_CLASS_RULES
+    ),
+    columns: t.Optional[t.Dict[str, str]] = None,
+    codes: bool = False,
+) -> str:
+    """
+    Get an SQL CASE expression that classifies orbits like classify_orbits.
+
+    The expression can be used for an in-database classification, e.g., of the NEO databases
+    (see SolarY.neo.data). Rows with NULL values in the variables of a rule do not match the rule.
+
+    Parameters
+    ----------
+    rules : sequence, optional
+        Rule table (see ORBIT_CLASS_RULES). The default is ORBIT_CLASS_RULES.
+    columns : dict, optional
+        Column names of the variables. Missing variables get the default names
+        (ORBIT_CLASS_COLUMNS). The default is None.
+    codes : bool, optional
+        If True, the expression returns the categorical codes instead of the class names. The
+        default is False.
+
+    Returns
+    -------
+    sql_case : str
+        SQL CASE expression.
+
+    Raises
+    ------
+    ValueError
+        If a rule uses an unknown variable.
+
+    Examples
+    --------
+    >>> import SolarY
+    >>> print(SolarY.neo.astrodyn.orbit_class_sql(SolarY.neo.astrodyn.NEO_CLASS_RULES[:2]))
+    ... # doctest: +NORMALIZE_WHITESPACE
+    CASE WHEN SemMajAxis_AU > 1.0 AND Perihel_AU > 1.017 AND Perihel_AU < 1.3 THEN 'Amor'
+    WHEN SemMajAxis_AU > 1.0 AND Perihel_AU < 1.017 THEN 'Apollo' ELSE 'Other' END
+    """
+    columns = {**ORBIT_CLASS_COLUMNS, **(columns or {})}
+    class_names = orbit_class_names(rules)
+
+    # Set a WHEN clause per rule
+    when_clauses = []
+    for class_code, (class_name, rule_bounds) in enumerate(rules):
+        rule_conds = []
+        for var_name, (lower, upper) in rule_bounds.items():
+            if var_name not in ORBIT_CLASS_COLUMNS:
+                raise ValueError(f"Unknown variable {var_name} of the class {class_name}")
+            if lower is not None:
+                rule_conds.append(f"{columns[var_name]} > {float(lower)!r}")
+            if upper is not None:
+                rule_conds.append(f"{columns[var_name]} < {float(upper)!r}")
+        class_value = str(class_code) if codes else "'" + class_name.replace("'", "''") + "'"
+        when_clauses.append(f"WHEN {' AND '.join(rule_conds) or '1'} THEN {class_value}")
+
+    # Set the default class
+    other_value = str(len(rules)) if codes else f"'{class_names[-1]}'"
+    sql_case = f"CASE {' '.join(when_clauses)} ELSE {other_value} END"
+
+    return sql_case
+
+
+# Orbital elements of SolarY.general.astrodyn.kep2cart and the corresponding columns of the NEO
+# databases and catalogs (AU, degrees)
+STATE_VECTOR_COLUMNS = {
+    "sem_maj_axis": "SemMajAxis_AU",
+    "ecc": "Ecc_",
+    "incl": "Incl_deg",
+    "long_asc_node": "LongAscNode_deg",
+    "arg_peri": "ArgP_deg",
+    "mean_anom": "MeanAnom_deg",
+}
+
+
+def _neo_elements(neo_columns: t.Any, spatial_unit: str) -> t.Dict[str, np.ndarray]:
+    """
+    Get the orbital elements of NEO columns.
+
+    Parameters
+    ----------
+    neo_columns : dict or SolarY.neo.catalog.NEOCatalog
+        NEO columns that contain the columns of STATE_VECTOR_COLUMNS.
+    spatial_unit : str
+        Spatial unit of the semi-major axis: "AU" or "km".
+
+    Returns
+    -------
+    elements : dict
+        Dictionary with the keys of STATE_VECTOR_COLUMNS and the float64 arrays of the elements
+        (semi-major axis in the spatial unit, angles in degrees) as values.
+    """
+    elements = {
+        element: np.asarray(neo_columns[col_name], dtype=np.float64)
+        for element, col_name in STATE_VECTOR_COLUMNS.items()
+    }
+
+    # Convert the semi-major axis to km, if applicable
+    if spatial_unit == "km":
+        elements["sem_maj_axis"] = elements["sem_maj_axis"] * solary_general.astrodyn.ONE_AU_KM
+
+    return elements
+
+
+def neo_state_vectors(
+    neo_columns: t.Any, spatial_unit: str = "AU"
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the heliocentric state vectors of NEOs at their epochs from the NEO columns.
+
+    Parameters
+    ----------
+    neo_columns : dict or SolarY.neo.catalog.NEOCatalog
+        NEO columns that contain the columns of STATE_VECTOR_COLUMNS, e.g., the result of the
+        select method of the NEO databases, SolarY.neo.data.load_neodys_array or a NEO catalog.
+    spatial_unit : str, optional
+        Spatial unit of the state vectors: "AU" (velocities in AU/day) or "km" (velocities in
+        km/s). The default is "AU".
+
+    Returns
+    -------
+    position : numpy.ndarray
+        Positions with the shape (N, 3) given in the spatial unit (ECLIPJ2000).
+    velocity : numpy.ndarray
+        Velocities with the shape (N, 3) given in AU/day or km/s (ECLIPJ2000).
+
+    See Also
+    --------
+    SolarY.general.astrodyn.kep2cart
+
+    Examples
+    --------
+    >>> import SolarY
+    >>> neodys_sqlite = SolarY.neo.data.NEOdysDatabase()  # doctest: +SKIP
+    >>> position, velocity = SolarY.neo.astrodyn.neo_state_vectors(
+    ...     neodys_sqlite.select(columns=list(SolarY.neo.astrodyn.STATE_VECTOR_COLUMNS.values()))
+    ... )  # doctest: +SKIP
+    """
+    elements = _neo_elements(neo_columns, spatial_unit)
+
+    position, velocity = solary_general.astrodyn.kep2cart(
+        sem_maj_axis=elements["sem_maj_axis"],
+        ecc=elements["ecc"],
+        incl=elements["incl"],
+        long_asc_node=elements["long_asc_node"],
+        arg_peri=elements["arg_peri"],
+        mean_anom=elements["mean_anom"],
+        spatial_unit=spatial_unit,
+        angle_unit="deg",
+    )
+
+    return position, velocity
+
+
+def propagate_neos(
+    neo_columns: t.Any,
+    times_mjd: t.Union[float, t.Sequence[float], np.ndarray],
+    spatial_unit: str = "AU",
+    block_size: int = solary_general.astrodyn.PROPAGATE_BLOCK_SIZE,
+) -> t.Iterator[t.Tuple[np.ndarray, np.ndarray]]:
+    """
+    Propagate NEOs from their individual epochs on a time grid and yield the positions blockwise.
+
+    Parameters
+    ----------
+    neo_columns : dict or SolarY.neo.catalog.NEOCatalog
+        NEO columns that contain the columns of STATE_VECTOR_COLUMNS and the epoch column
+        "Epoch_MJD" (e.g., NEODyS data).
+    times_mjd : numpy.ndarray, sequence or float
+        Time grid given in MJD.
+    spatial_unit : str, optional
+        Spatial unit of the positions: "AU" or "km". The default is "AU".
+    block_size : int, optional
+        Maximum number of positions (NEOs x times) per block. The default is
+        SolarY.general.astrodyn.PROPAGATE_BLOCK_SIZE.
+
+    Yields
+    ------
+    times_block : numpy.ndarray
+        Times of the block given in MJD.
+    position : numpy.ndarray
+        Heliocentric positions with the shape (N, len(times_block), 3) given in the spatial unit
+        (ECLIPJ2000).
+
+    See Also
+    --------
+    SolarY.general.astrodyn.propagate_kepler
+
+    Examples
+    --------
+    Hourly positions of all NEODyS objects for 30 days, 24 hours at a time
+
+    >>> import numpy as np
+    >>> import SolarY
+    >>> neodys_sqlite = SolarY.neo.data.NEOdysDatabase()  # doctest: +SKIP
+    >>> neo_columns = neodys_sqlite.select(
+    ...     columns=list(SolarY.neo.astrodyn.STATE_VECTOR_COLUMNS.values()) + ["Epoch_MJD"]
+    ... )  # doctest: +SKIP
+    >>> for times_block, position in SolarY.neo.astrodyn.propagate_neos(
+    ...     neo_columns, 59600.0 + np.arange(30 * 24) / 24.0,
+    ...     block_size=24 * len(neo_columns["Epoch_MJD"]),
+    ... ):  # doctest: +SKIP
+    ...     pass
+    """
+    elements = _neo_elements(neo_columns, spatial_unit)
+
+    yield from solary_general.astrodyn.propagate_kepler(
+        sem_maj_axis=elements["sem_maj_axis"],
+        ecc=elements["ecc"],
+        incl=elements["incl"],
+        long_asc_node=elements["long_asc_node"],
+        arg_peri=elements["arg_peri"],
+        mean_anom=elements["mean_anom"],
+        epoch_mjd=np.asarray(neo_columns["Epoch_MJD"], dtype=np.float64),
+        times_mjd=times_mjd,
+        spatial_unit=spatial_unit,
+        angle_unit="deg",
+        block_size=block_size,
+    )
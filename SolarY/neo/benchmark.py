@@ -0,0 +1,250 @@
+"""Offline ingest and query benchmarks of the NEO readers and databases on synthetic files."""
+import datetime
+import json
+import platform
+import shutil
+import typing as t
+from pathlib import Path
+
+from .. import auxiliary as solary_auxiliary
+from .._version import get_versions
+from . import data, synthetic
+
+# Benchmarked datasets
+BENCHMARK_DATASETS = ("neodys", "granvik2018")
+
+# Maximum number of rows of the row-wise steps (readers that return one dictionary per NEO and
+# the non-bulk database builds). Larger files would exceed the memory of common machines
+ROW_WISE_MAX_ROWS = 1000000
+
+# Number of box queries of the query step
+NR_BOX_QUERIES = 20
+
+# Readers, array loaders, databases and file endings of the datasets
+_DATASET_API: t.Dict[str, t.Dict[str, t.Any]] = {
+    "neodys": {
+        "write": synthetic.write_neodys,
+        "read": data.read_neodys,
+        "load_array": data.load_neodys_array,
+        "database": data.NEOdysDatabase,
+        "suffix": ".cat",
+    },
+    "granvik2018": {
+        "write": synthetic.write_granvik2018,
+        "read": data.read_granvik2018,
+        "load_array": data.load_granvik2018_array,
+        "database": data.Granvik2018Database,
+        "suffix": ".dat",
+    },
+}
+
+
+def _stage_results(
+    metrics: solary_auxiliary.metrics.StageMetrics, dataset: str, nr_rows: int, prefix: str = ""
+) -> t.List[t.Dict[str, t.Any]]:
+    """
+    Convert the stage records of a metrics collector into benchmark results.
+
+    Parameters
+    ----------
+    metrics : SolarY.auxiliary.metrics.StageMetrics
+        Metrics collector.
+    dataset : str
+        Name of the dataset.
+    nr_rows : int
+        Number of rows of the synthetic file.
+    prefix : str, optional
+        Prefix of the step names. The default is "".
+
+    Returns
+    -------
+    results : list
+        Benchmark results (one dictionary per step).
+    """
+    results = [
+        {
+            "dataset": dataset,
+            "nr_rows": nr_rows,
+            "step": prefix + stage_record["stage"],
+            **{key: value for key, value in stage_record.items() if key != "stage"},
+        }
+        for stage_record in metrics.report()["stages"]
+    ]
+
+    return results
+
+
+def _benchmark_dataset(
+    dataset: str, nr_rows: int, work_dir: Path, seed: int, trace_memory: bool
+) -> t.List[t.Dict[str, t.Any]]:
+    """
+    Benchmark the readers and the database of a dataset with a synthetic file.
+
+    Parameters
+    ----------
+    dataset : str
+        Name of the dataset (see BENCHMARK_DATASETS).
+    nr_rows : int
+        Number of rows of the synthetic file.
+    work_dir : pathlib.Path
+        Directory of the synthetic files and databases.
+    seed : int
+        Seed of the synthetic file.
+    trace_memory : bool
+        If True, the peak memory of each step is traced.
+
+    Returns
+    -------
+    results : list
+        Benchmark results (one dictionary per step).
+    """
+    dataset_api = _DATASET_API[dataset]
+    path_filename = str(work_dir / f"{dataset}_{nr_rows}{dataset_api['suffix']}")
+    row_wise = nr_rows <= ROW_WISE_MAX_ROWS
+
+    # Write the synthetic file (a binary cache of a previous run is deleted), and parse it row-wise
+    # and column-wise (without cache, building the cache and loading the cache)
+    metrics = solary_auxiliary.metrics.StageMetrics(trace_memory=trace_memory)
+    with metrics.stage("generate", rows=nr_rows):
+        dataset_api["write"](path_filename, nr_rows, seed=seed)
+    cache_root = data._cache_root(path_filename)  # pylint: disable=protected-access
+    shutil.rmtree(cache_root, ignore_errors=True)
+    if row_wise:
+        with metrics.stage("read", rows=nr_rows):
+            dataset_api["read"](path_filename)
+    with metrics.stage("load_array", rows=nr_rows):
+        dataset_api["load_array"](path_filename)
+    with metrics.stage("load_array_cache_build", rows=nr_rows):
+        dataset_api["load_array"](path_filename, cache=True)
+    with metrics.stage("load_array_cached", rows=nr_rows):
+        dataset_api["load_array"](path_filename, cache=True)
+    results = _stage_results(metrics, dataset, nr_rows)
+
+    # Row-wise database build: insert the raw data and compute the derived columns afterwards
+    if row_wise:
+        metrics = solary_auxiliary.metrics.StageMetrics(trace_memory=trace_memory)
+        neo_db = dataset_api["database"](
+            new=True, db_filename=str(work_dir / f"{dataset}_{nr_rows}_rowwise.db")
+        )
+        neo_db.create(path_filename=path_filename, metrics=metrics)
+        neo_db.create_deriv_orb(metrics=metrics)
+        neo_db.create_neo_class(metrics=metrics)
+        neo_db.close()
+        results.extend(_stage_results(metrics, dataset, nr_rows, prefix="rowwise."))
+
+    # Bulk database build
+    metrics = solary_auxiliary.metrics.StageMetrics(trace_memory=trace_memory)
+    neo_db = dataset_api["database"](
+        new=True, db_filename=str(work_dir / f"{dataset}_{nr_rows}_bulk.db")
+    )
+    neo_db.create(path_filename=path_filename, bulk=True, metrics=metrics)
+    results.extend(_stage_results(metrics, dataset, nr_rows, prefix="bulk."))
+
+    # Query the bulk database: narrow box queries of the orbital elements and a full scan
+    metrics = solary_auxiliary.metrics.StageMetrics(trace_memory=trace_memory)
+    with metrics.stage("query_box") as stage_record:
+        stage_record["rows"] = sum(
+            len(
+                neo_db.select(
+                    columns=["SemMajAxis_AU"],
+                    where={
+                        "SemMajAxis_AU": (0.9 + 0.05 * query_idx, 1.0 + 0.05 * query_idx),
+                        "Ecc_": (None, 0.2),
+                        "Incl_deg": (None, 5.0),
+                    },
+                )["SemMajAxis_AU"]
+            )
+            for query_idx in range(NR_BOX_QUERIES)
+        )
+    with metrics.stage("query_scan", rows=nr_rows):
+        neo_db.select(columns=["SemMajAxis_AU", "Ecc_", "Incl_deg", "AbsMag_", "NEOClass"])
+    neo_db.close()
+    query_results = _stage_results(metrics, dataset, nr_rows)
+    query_results[0]["queries_per_sec"] = NR_BOX_QUERIES / query_results[0]["wall_sec"]
+    results.extend(query_results)
+
+    return results
+
+
+def run_ingest_benchmark(
+    work_dir: t.Union[str, Path],
+    nr_rows: t.Sequence[int] = (10000,),
+    datasets: t.Sequence[str] = BENCHMARK_DATASETS,
+    seed: int = 0,
+    trace_memory: bool = False,
+    output: t.Optional[t.Union[str, Path]] = None,
+) -> t.Dict[str, t.Any]:
+    """
+    Benchmark the parsing, insertion, derived-column computation and queries on synthetic files.
+
+    Per dataset and file size, a synthetic file is written (see SolarY.neo.synthetic) and the
+    following steps are measured:
+
+    - "generate": writing the synthetic file.
+    - "read": row-wise reader (read_neodys / read_granvik2018).
+    - "load_array": column-wise parser (without binary cache).
+    - "load_array_cache_build" / "load_array_cached": column-wise parser that builds the binary
+      cache, and loading of the memory-mapped cache.
+    - "rowwise.*": database build with create, create_deriv_orb and create_neo_class.
+    - "bulk.*": database build in the bulk build mode.
+    - "query_box" / "query_scan": box queries and a full column scan of the bulk database.
+
+    The row-wise steps are skipped for files with more than ROW_WISE_MAX_ROWS rows. The results
+    are JSON serializable; thus, they can be stored and compared over time.
+
+    Parameters
+    ----------
+    work_dir : str or pathlib.Path
+        Directory of the synthetic files and databases. It is created, if it does not exist.
+    nr_rows : sequence, optional
+        Numbers of rows of the synthetic files (e.g., 10000 to 10000000). The default is
+        (10000,).
+    datasets : sequence, optional
+        Benchmarked datasets (see BENCHMARK_DATASETS). The default is BENCHMARK_DATASETS.
+    seed : int, optional
+        Seed of the synthetic files. The default is 0.
+    trace_memory : bool, optional
+        If True, the peak memory of each step is traced (slows down the steps). The default is
+        False.
+    output : str or pathlib.Path, optional
+        File path of a JSON file that the results are written to. The default is None.
+
+    Returns
+    -------
+    benchmark_report : dict
+        Benchmark environment (SolarY and Python version, platform, time stamp) and results
+        (list of dictionaries with the keys "dataset", "nr_rows", "step", "wall_sec", "rows",
+        "rows_per_sec" and "peak_memory_bytes"; "query_box" has "queries_per_sec", too).
+
+    Raises
+    ------
+    ValueError
+        If a dataset is unknown.
+    """
+    # Check the input
+    unknown_datasets = set(datasets) - set(BENCHMARK_DATASETS)
+    if unknown_datasets:
+        raise ValueError(f"Unknown dataset(s): {sorted(unknown_datasets)}")
+
+    # Run the benchmarks
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    benchmark_report: t.Dict[str, t.Any] = {
+        "solary_version": get_versions()["version"],  # type: ignore
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "results": [
+            result
+            for dataset in datasets
+            for dataset_rows in nr_rows
+            for result in _benchmark_dataset(dataset, dataset_rows, work_dir, seed, trace_memory)
+        ],
+    }
+
+    # Store the results
+    if output is not None:
+        with open(output, mode="w") as f_temp:
+            json.dump(benchmark_report, f_temp, indent=2)
+
+    return benchmark_report
@@ -0,0 +1,478 @@
+"""Array-backed NEO catalogs with lazily loaded columns and lightweight per-object records."""
+import typing as t
+
+import numpy as np
+
+
+class NEORecord:
+    """
+    Lightweight view of a single NEO of a catalog.
+
+    The record stores only a reference to the catalog and the row of the NEO; the values are read
+    from the catalog's columns on access. Values can be accessed like dictionary items
+    (record["SemMajAxis_AU"]) or attributes (record.SemMajAxis_AU).
+
+    Attributes
+    ----------
+    catalog : NEOCatalog
+        Catalog of the NEO.
+    row : int
+        Row of the NEO in the catalog's columns.
+
+    Methods
+    -------
+    keys()
+        Get the column names.
+    to_dict()
+        Get the values of all columns as a dictionary.
+    """
+
+    __slots__ = ("catalog", "row")
+
+    def __init__(self, catalog: "NEOCatalog", row: int) -> None:
+        """
+        Init function of the NEORecord class.
+
+        Parameters
+        ----------
+        catalog : NEOCatalog
+            Catalog of the NEO.
+        row : int
+            Row of the NEO in the catalog's (complete) columns.
+        """
+        self.catalog = catalog
+        self.row = row
+
+    def __getitem__(self, col_name: str) -> t.Any:
+        """
+        Get the value of a column.
+
+        Parameters
+        ----------
+        col_name : str
+            Column name.
+
+        Returns
+        -------
+        value : Any
+            Value of the column as a Python object (float, int or str).
+        """
+        value = self.catalog._base_column(col_name)[  # pylint: disable=protected-access
+            self.row
+        ].item()
+
+        return value
+
+    def __getattr__(self, col_name: str) -> t.Any:
+        """
+        Get the value of a column.
+
+        Parameters
+        ----------
+        col_name : str
+            Column name.
+
+        Returns
+        -------
+        value : Any
+            Value of the column as a Python object (float, int or str).
+
+        Raises
+        ------
+        AttributeError
+            If the column does not exist.
+        """
+        # Attributes that are not set (e.g., during unpickling) are no columns
+        if col_name in NEORecord.__slots__:
+            raise AttributeError(col_name)
+        try:
+            return self[col_name]
+        except KeyError as key_error:
+            raise AttributeError(col_name) from key_error
+
+    def keys(self) -> t.List[str]:
+        """
+        Get the column names.
+
+        Returns
+        -------
+        col_names : list
+            Column names of the catalog.
+        """
+        col_names = self.catalog.columns
+
+        return col_names
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """
+        Get the values of all columns as a dictionary.
+
+        Returns
+        -------
+        neo_dict : dict
+            Dictionary with the column names as keys and the values as values.
+        """
+        neo_dict = {col_name: self[col_name] for col_name in self.keys()}
+
+        return neo_dict
+
+    def __repr__(self) -> str:
+        """
+        Get the representation of the record.
+
+        Returns
+        -------
+        record_repr : str
+            Representation of the record.
+        """
+        record_repr = f"NEORecord({self.to_dict()})"
+
+        return record_repr
+
+
+class NEOCatalog:
+    """
+    Catalog of NEOs that stores each column as a contiguous NumPy array.
+
+    The columns are loaded lazily by a loader function (e.g., from a NEO database or a
+    memory-mapped binary cache) on their first access and are shared between a catalog and all of
+    its views.
+    Slicing and boolean masking return views that store only the selected rows; no column is
+    copied until it is accessed.
+
+    Indexing:
+
+    - catalog["SemMajAxis_AU"]: column as a NumPy array (a view of the loaded column for slices).
+    - catalog[0]: NEORecord of a single NEO.
+    - catalog[10:20], catalog[mask], catalog[[1, 5, 7]]: catalog view of the selected NEOs.
+    - catalog[["Name", "AbsMag_"]]: catalog view of the selected columns.
+
+    Attributes
+    ----------
+    columns : list
+        Column names.
+
+    Methods
+    -------
+    from_columns(neo_columns)
+        Create a catalog of already loaded (or memory-mapped) columns.
+    column(col_name)
+        Get a column.
+    to_dict(columns=None)
+        Get columns as a dictionary.
+
+    Examples
+    --------
+    Get the catalog of the Granvik et al. (2018) model and compute the mean semi-major axis of the
+    Atens (only the columns SemMajAxis_AU and NEOClass are loaded)
+
+    >>> import SolarY
+    >>> granvik2018_sqlite = SolarY.neo.data.Granvik2018Database()  # doctest: +SKIP
+    >>> neo_catalog = granvik2018_sqlite.catalog()  # doctest: +SKIP
+    >>> atens = neo_catalog[neo_catalog["NEOClass"] == "Aten"]  # doctest: +SKIP
+    >>> mean_sem_maj_axis_au = atens["SemMajAxis_AU"].mean()  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        loader: t.Callable[[str], np.ndarray],
+        columns: t.Sequence[str],
+        nr_rows: int,
+    ) -> None:
+        """
+        Init function of the NEOCatalog class.
+
+        Parameters
+        ----------
+        loader : callable
+            Function that returns a complete column (array of the length nr_rows) for a column
+            name. It is called once per column.
+        columns : sequence
+            Column names.
+        nr_rows : int
+            Number of NEOs.
+        """
+        self.columns = list(columns)
+        self._loader = loader
+        self._nr_rows = nr_rows
+        self._loaded: t.Dict[str, np.ndarray] = {}
+
+        # Selected rows of the complete columns (None: all rows; range: a slice; array: rows)
+        self._index: t.Union[None, range, np.ndarray] = None
+
+    @classmethod
+    def from_columns(cls, neo_columns: t.Dict[str, np.ndarray]) -> "NEOCatalog":
+        """
+        Create a catalog of already loaded (or memory-mapped) columns.
+
+        Memory-mapped columns (e.g., of SolarY.neo.data.load_neodys_array with cache=True) are
+        read from disk only when they are accessed.
+
+        Parameters
+        ----------
+        neo_columns : dict
+            Dictionary with the column names as keys and arrays of the same length as values.
+
+        Returns
+        -------
+        neo_catalog : NEOCatalog
+            Catalog of the columns.
+
+        Raises
+        ------
+        ValueError
+            If the columns have different lengths.
+        """
+        col_lengths = {len(col_values) for col_values in neo_columns.values()}
+        if len(col_lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        neo_catalog = cls(
+            neo_columns.__getitem__, list(neo_columns), col_lengths.pop() if col_lengths else 0
+        )
+
+        return neo_catalog
+
+    def _view(
+        self, index: t.Union[None, range, np.ndarray], columns: t.Optional[t.List[str]] = None
+    ) -> "NEOCatalog":
+        """
+        Create a view of the catalog that shares the loaded columns.
+
+        Parameters
+        ----------
+        index : None, range or numpy.ndarray
+            Selected rows of the complete columns.
+        columns : list, optional
+            Column names of the view. If None, the columns of the catalog are taken. The default
+            is None.
+
+        Returns
+        -------
+        neo_view : NEOCatalog
+            View of the catalog.
+        """
+        neo_view = NEOCatalog.__new__(NEOCatalog)
+        neo_view.columns = list(self.columns if columns is None else columns)
+        neo_view._loader = self._loader
+        neo_view._nr_rows = self._nr_rows
+        neo_view._loaded = self._loaded
+        neo_view._index = index
+
+        return neo_view
+
+    def _base_column(self, col_name: str) -> np.ndarray:
+        """
+        Get a complete column (all rows of the underlying catalog); it is loaded on first access.
+
+        Parameters
+        ----------
+        col_name : str
+            Column name.
+
+        Returns
+        -------
+        col_values : numpy.ndarray
+            Complete column.
+
+        Raises
+        ------
+        KeyError
+            If the column does not exist.
+        ValueError
+            If the loaded column does not have the number of rows of the catalog.
+        """
+        if col_name not in self.columns:
+            raise KeyError(col_name)
+
+        # Load the column on its first access
+        if col_name not in self._loaded:
+            col_values = np.asarray(self._loader(col_name))
+            if len(col_values) != self._nr_rows:
+                raise ValueError(
+                    f"The column {col_name} has {len(col_values)} rows instead of {self._nr_rows}"
+                )
+            self._loaded[col_name] = col_values
+
+        return self._loaded[col_name]
+
+    def _positions(self) -> np.ndarray:
+        """
+        Get the selected rows of the complete columns as an array.
+
+        Returns
+        -------
+        positions : numpy.ndarray
+            Selected rows.
+        """
+        if self._index is None:
+            positions = np.arange(self._nr_rows)
+        elif isinstance(self._index, range):
+            positions = np.arange(self._index.start, self._index.stop, self._index.step)
+        else:
+            positions = self._index
+
+        return positions
+
+    def __len__(self) -> int:
+        """
+        Get the number of NEOs.
+
+        Returns
+        -------
+        nr_rows : int
+            Number of NEOs.
+        """
+        nr_rows = self._nr_rows if self._index is None else len(self._index)
+
+        return nr_rows
+
+    def column(self, col_name: str) -> np.ndarray:
+        """
+        Get a column.
+
+        Parameters
+        ----------
+        col_name : str
+            Column name.
+
+        Returns
+        -------
+        col_values : numpy.ndarray
+            Values of the selected NEOs. For slices, the array is a view of the loaded column.
+        """
+        col_values = self._base_column(col_name)
+        if isinstance(self._index, range):
+            col_values = col_values[
+                slice(
+                    self._index.start,
+                    self._index.stop if self._index.stop >= 0 else None,
+                    self._index.step,
+                )
+            ]
+        elif self._index is not None:
+            col_values = col_values[self._index]
+
+        return col_values
+
+    def __getitem__(self, key: t.Any) -> t.Any:
+        """
+        Get a column, a record or a view of the catalog.
+
+        Parameters
+        ----------
+        key : str, int, slice, list or numpy.ndarray
+            Column name, row, slice, list of column names, boolean mask or array of rows.
+
+        Returns
+        -------
+        item : numpy.ndarray, NEORecord or NEOCatalog
+            Column, record or view of the catalog.
+
+        Raises
+        ------
+        IndexError
+            If a row is out of range or a mask does not have the number of NEOs.
+        """
+        # Column
+        if isinstance(key, str):
+            return self.column(key)
+
+        # Record of a single NEO
+        if isinstance(key, (int, np.integer)):
+            row = int(key) + (len(self) if key < 0 else 0)
+            if not 0 <= row < len(self):
+                raise IndexError(f"Row {key} is out of range for {len(self)} NEOs")
+            if self._index is not None:
+                row = int(self._index[row])
+            return NEORecord(self, row)
+
+        # View of selected columns
+        if isinstance(key, list) and key and all(isinstance(col_name, str) for col_name in key):
+            for col_name in key:
+                if col_name not in self.columns:
+                    raise KeyError(col_name)
+            return self._view(self._index, columns=key)
+
+        # View of selected rows
+        return self._view(self._select_rows(key))
+
+    def _select_rows(self, key: t.Any) -> t.Union[range, np.ndarray]:
+        """
+        Get the rows of the complete columns that are selected by a slice, a mask or rows.
+
+        Parameters
+        ----------
+        key : slice, list or numpy.ndarray
+            Slice, boolean mask or array of rows (of this catalog).
+
+        Returns
+        -------
+        index : range or numpy.ndarray
+            Selected rows of the complete columns. Slices of slices remain slices (range); thus,
+            their columns are views of the loaded columns.
+
+        Raises
+        ------
+        IndexError
+            If a row is out of range or a mask does not have the number of NEOs.
+        """
+        # Slice
+        if isinstance(key, slice):
+            base_index = range(self._nr_rows) if self._index is None else self._index
+            return base_index[key]
+
+        # Boolean mask or rows
+        key = np.asarray(key)
+        if key.dtype == bool:
+            if key.shape != (len(self),):
+                raise IndexError(f"The mask must have the shape ({len(self)},)")
+            key = np.flatnonzero(key)
+        rows = key.astype(np.intp)
+        if rows.size and (rows.max() >= len(self) or rows.min() < -len(self)):
+            raise IndexError(f"Rows are out of range for {len(self)} NEOs")
+        index = self._positions()[rows]
+
+        return index
+
+    def __iter__(self) -> t.Iterator[NEORecord]:
+        """
+        Iterate through the records of the NEOs.
+
+        Yields
+        ------
+        neo_record : NEORecord
+            Record of a NEO.
+        """
+        for row in self._positions().tolist():
+            yield NEORecord(self, row)
+
+    def to_dict(self, columns: t.Optional[t.Sequence[str]] = None) -> t.Dict[str, np.ndarray]:
+        """
+        Get columns as a dictionary.
+
+        Parameters
+        ----------
+        columns : sequence, optional
+            Column names. If None, all columns are taken. The default is None.
+
+        Returns
+        -------
+        neo_columns : dict
+            Dictionary with the column names as keys and the columns as values.
+        """
+        neo_columns = {col_name: self.column(col_name) for col_name in columns or self.columns}
+
+        return neo_columns
+
+    def __repr__(self) -> str:
+        """
+        Get the representation of the catalog.
+
+        Returns
+        -------
+        catalog_repr : str
+            Representation of the catalog.
+        """
+        catalog_repr = f"NEOCatalog({len(self)} NEOs, columns={self.columns})"
+
+        return catalog_repr
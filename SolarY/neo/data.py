@@ -1,22 +1,376 @@
 """NEO data download, parsing and database creation functions are part of this sub-module."""
+import collections
+import concurrent.futures
+import contextlib
+import functools
 import gzip
+import hashlib
+import itertools
+import json
 import os
 import re
 import shutil
 import sqlite3
-import time
+import tempfile
+import threading
 import typing as t
 from pathlib import Path
 
+import numpy as np
 import requests
 
 from .. import auxiliary as solary_auxiliary
 from .. import general as solary_general
 from . import astrodyn
+from . import catalog
+from . import population
 
 # Get the file paths
 PATH_CONFIG = solary_auxiliary.config.get_paths()
 
+# Download URLs of the NEODyS catalog and the Granvik et al. (2018) model data (paths config file)
+NEODYS_URL = PATH_CONFIG["neo"]["neodys_url"]
+GRANVIK2018_URL = PATH_CONFIG["neo"]["granvik2018_url"]
+
+# Column names of the NEODyS file (in the order of the file) and the number of header rows
+NEODYS_COLUMNS = (
+    "Name",
+    "Epoch_MJD",
+    "SemMajAxis_AU",
+    "Ecc_",
+    "Incl_deg",
+    "LongAscNode_deg",
+    "ArgP_deg",
+    "MeanAnom_deg",
+    "AbsMag_",
+    "SlopeParamG_",
+)
+NEODYS_HEADER_ROWS = 6
+
+# NumPy dtype of the NEODyS columns, used by the array based loader
+NEODYS_DTYPE = np.dtype(
+    [("Name", "U32")] + [(col_name, np.float64) for col_name in NEODYS_COLUMNS[1:]]
+)
+
+# Column names of the Granvik et al. (2018) model file (in the order of the file)
+GRANVIK2018_COLUMNS = (
+    "SemMajAxis_AU",
+    "Ecc_",
+    "Incl_deg",
+    "LongAscNode_deg",
+    "ArgP_deg",
+    "MeanAnom_deg",
+    "AbsMag_",
+)
+
+# File names of the binary column cache (see _load_column_cache)
+CACHE_MANIFEST_FILE = "sha256.json"
+CACHE_COLUMNS_FILE = "columns.json"
+
+# File name pattern of the population histogram cubes in the database cache (formatted with the
+# hash of the bin edges)
+CACHE_CUBE_FILE = "cube_{}.npz"
+
+# SQLite settings of the bulk build mode of the NEO databases. The journal and synchronous writes
+# are disabled, since a failed build is simply re-done from scratch
+BULK_BUILD_PRAGMAS = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": -262144,
+    "temp_store": "MEMORY",
+}
+BULK_BUILD_PAGE_SIZE = 16384
+
+# Columns of the R*Tree index of the NEO databases (box queries in the orbital element space). The
+# index is used by the query API if at least RTREE_MIN_RANGES of these columns have a range
+# predicate; single ranges are served by the secondary indexes. Missing values are stored as an
+# unbounded interval
+RTREE_COLUMNS = ("SemMajAxis_AU", "Ecc_", "Incl_deg", "Perihel_AU", "Aphel_AU")
+RTREE_MIN_RANGES = 2
+RTREE_UNBOUNDED = 1e38
+
+# Column of the NEO databases with the dirty flags of the derived columns (one bit per derived
+# column; see the deriv_cols table), and the trigger name prefix of the dirty tracking
+DERIV_DIRTY_COL = "DerivDirty"
+DERIV_DIRTY_TRIGGER = "trg_main_dirty_"
+
+# File endings of the exported NEO databases per export format
+EXPORT_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _cache_root(path_filename: str) -> Path:
+    """
+    Get the binary cache directory of a raw data file.
+
+    The cache is stored next to the raw data file in a directory with the ending ".cache".
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of the raw data file.
+
+    Returns
+    -------
+    cache_root : pathlib.Path
+        Directory of the binary cache.
+    """
+    cache_root = Path(f"{path_filename}.cache")
+
+    return cache_root
+
+
+def _write_sha256_manifest(path_filename: str, sha256_hash: str) -> None:
+    """
+    Store the SHA256 hash of a raw data file in the manifest file of its binary cache.
+
+    The size and modification time of the raw file are stored alongside. As long as both values
+    are unchanged, the hash does not need to be re-computed.
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of the raw data file.
+    sha256_hash : str
+        SHA256 hash of the raw data file.
+    """
+    # Get the file statistics and write them together with the hash in a JSON file
+    file_stat = Path(path_filename).stat()
+    cache_root = _cache_root(path_filename)
+    cache_root.mkdir(parents=True, exist_ok=True)
+    with (cache_root / CACHE_MANIFEST_FILE).open(mode="w") as f_temp:
+        json.dump(
+            {
+                "size": file_stat.st_size,
+                "mtime_ns": file_stat.st_mtime_ns,
+                "sha256": sha256_hash,
+            },
+            f_temp,
+        )
+
+
+def _get_sha256(path_filename: str) -> str:
+    """
+    Get the SHA256 hash of a raw data file.
+
+    The hash is taken from the cache manifest if the file has not been modified since; otherwise
+    it is (re-)computed and stored in the manifest.
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of the raw data file.
+
+    Returns
+    -------
+    sha256_hash : str
+        SHA256 hash of the raw data file.
+    """
+    # Read the manifest file (if present) and compare the stored file statistics with the current
+    # ones
+    file_stat = Path(path_filename).stat()
+    manifest_path = _cache_root(path_filename) / CACHE_MANIFEST_FILE
+    try:
+        with manifest_path.open() as f_temp:
+            manifest = json.load(f_temp)
+        if (manifest["size"], manifest["mtime_ns"]) == (file_stat.st_size, file_stat.st_mtime_ns):
+            return str(manifest["sha256"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Compute the hash and update the manifest
+    sha256_hash = solary_auxiliary.parse.comp_sha256(path_filename)
+    _write_sha256_manifest(path_filename, sha256_hash)
+
+    return sha256_hash
+
+
+def _remove_outdated_caches(cache_root: Path, cache_dir: Path) -> None:
+    """
+    Delete all cache directories of a cache root, except for the current one.
+
+    Temporary directories (starting with a dot) are kept, since they may belong to concurrent
+    processes.
+
+    Parameters
+    ----------
+    cache_root : pathlib.Path
+        Cache root directory.
+    cache_dir : pathlib.Path
+        Cache directory of the current file content.
+    """
+    for outdated_dir in cache_root.iterdir():
+        if (
+            outdated_dir.is_dir()
+            and outdated_dir != cache_dir
+            and not outdated_dir.name.startswith(".")
+        ):
+            shutil.rmtree(outdated_dir, ignore_errors=True)
+
+
+def _load_column_cache(
+    path_filename: str, loader: t.Callable[[str], t.Dict[str, np.ndarray]]
+) -> t.Dict[str, np.ndarray]:
+    """
+    Load the parsed columns of a raw data file from its memory-mapped binary cache.
+
+    The cache is keyed by the SHA256 hash of the raw data file. If no cache exists for the current
+    hash, the file is parsed with the given loader and each column is stored as an .npy file.
+    Caches of outdated hashes are deleted.
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of the raw data file.
+    loader : callable
+        Function that parses the raw data file and returns a dictionary of column arrays.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names as keys and read-only memory-mapped arrays as values.
+    """
+    # Set the cache directory of the current raw file content
+    cache_root = _cache_root(path_filename)
+    cache_dir = cache_root / _get_sha256(path_filename)
+
+    # Parse the raw file and create the cache, if it does not exist. The columns are written into
+    # a temporary directory that is renamed afterwards. Thus, concurrent processes never see an
+    # incomplete cache
+    if not cache_dir.exists():
+        neo_columns = loader(path_filename)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=cache_root))
+        for col_name, col_values in neo_columns.items():
+            np.save(tmp_dir / f"{col_name}.npy", col_values)
+        with (tmp_dir / CACHE_COLUMNS_FILE).open(mode="w") as f_temp:
+            json.dump(list(neo_columns), f_temp)
+
+        # Another process may have created the cache in the meantime. Keep the first one
+        try:
+            tmp_dir.rename(cache_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # Delete the caches of outdated file contents
+        _remove_outdated_caches(cache_root, cache_dir)
+
+    # Memory-map the cached columns
+    with (cache_dir / CACHE_COLUMNS_FILE).open() as f_temp:
+        col_names = json.load(f_temp)
+    neo_columns = {
+        col_name: np.load(cache_dir / f"{col_name}.npy", mmap_mode="r") for col_name in col_names
+    }
+
+    return neo_columns
+
+
+def _read_file_range(file_range: t.Tuple[str, int, int]) -> t.List[str]:
+    """
+    Read the lines of a byte range of a text file.
+
+    Parameters
+    ----------
+    file_range : tuple
+        File path, start (inclusive) and end (exclusive) byte offset. The offsets need to be
+        aligned to line breaks (see SolarY.auxiliary.parse.split_file_ranges).
+
+    Returns
+    -------
+    file_lines : list
+        Lines of the byte range.
+    """
+    path_filename, range_start, range_end = file_range
+    with open(path_filename, "rb") as f_temp:
+        f_temp.seek(range_start)
+        file_lines = f_temp.read(range_end - range_start).decode().splitlines()
+
+    return file_lines
+
+
+def _iter_file_shards(
+    path_filename: str,
+    parse_shard: t.Callable[[t.Tuple[str, int, int]], t.Dict[str, np.ndarray]],
+    workers: t.Optional[int],
+    nr_shards: t.Optional[int],
+    skip_lines: int = 0,
+) -> t.Iterator[t.Dict[str, np.ndarray]]:
+    """
+    Parse a text file in shards with a process pool and yield the results in the original order.
+
+    The file is split into byte ranges that are aligned to line breaks. At most twice as many
+    shards as workers are processed (or waiting to be yielded) at the same time; thus, the memory
+    consumption is bounded, even if the consumer is slow.
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of the text file.
+    parse_shard : callable
+        Picklable (module level) function that parses a byte range (see _read_file_range) into a
+        dictionary of column arrays.
+    workers : int, optional
+        Number of worker processes. If None, the number of CPUs is taken.
+    nr_shards : int, optional
+        Number of shards. If None, four shards per worker are used.
+    skip_lines : int, optional
+        Number of header lines that are skipped. The default is 0.
+
+    Yields
+    ------
+    shard_columns : dict
+        Dictionary of the column arrays of a shard.
+    """
+    # Set the number of workers and shards and split the file
+    workers = workers or os.cpu_count() or 1
+    nr_shards = nr_shards or 4 * workers
+    file_ranges = [
+        (path_filename, range_start, range_end)
+        for range_start, range_end in solary_auxiliary.parse.split_file_ranges(
+            path_filename, nr_shards, skip_lines=skip_lines
+        )
+    ]
+
+    # Parse the shards in the current process, if only one worker is requested
+    if workers == 1:
+        yield from map(parse_shard, file_ranges)
+        return
+
+    # Submit the shards to a process pool. New shards are submitted, while the oldest pending
+    # shard is yielded; thus, the original order is kept
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending_shards: t.Deque[concurrent.futures.Future] = collections.deque()
+        for file_range in file_ranges:
+            if len(pending_shards) >= 2 * workers:
+                yield pending_shards.popleft().result()
+            pending_shards.append(executor.submit(parse_shard, file_range))
+        while pending_shards:
+            yield pending_shards.popleft().result()
+
+
+def _concat_columns(
+    shards: t.Iterable[t.Dict[str, np.ndarray]], col_names: t.Sequence[str]
+) -> t.Dict[str, np.ndarray]:
+    """
+    Merge the column arrays of several shards.
+
+    Parameters
+    ----------
+    shards : iterable
+        Dictionaries of column arrays (in the order of the merge).
+    col_names : sequence
+        Column names.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the merged, contiguous column arrays.
+    """
+    shards = list(shards)
+    neo_columns = {
+        col_name: np.concatenate([shard[col_name] for shard in shards]) for col_name in col_names
+    }
+
+    return neo_columns
+
 
 def _get_neodys_neo_nr() -> int:
     """
@@ -67,7 +421,7 @@ def download(row_exp: t.Optional[bool] = None) -> t.Tuple[str, t.Optional[int]]:
     -------
     dl_status : str
         Human-readable status report that returns 'OK' or 'ERROR', depending on the download's
-        success.
+        success. 'OK' is returned, too, if the present file is still up to date.
     neodys_neo_nr : int
         Number of NEOs (from the NEODyS page and thus optional). This value can be compared with
         the content of the downloaded file to determine whether entries are missing or not. Per
@@ -82,30 +436,13 @@ def download(row_exp: t.Optional[bool] = None) -> t.Tuple[str, t.Optional[int]]:
         PATH_CONFIG["neo"]["neodys_raw_dir"], PATH_CONFIG["neo"]["neodys_raw_file"]
     )
 
-    # Download the file
-    response = requests.get("https://newton.spacedys.com/~neodys2/neodys.cat")
-    download_file_path = Path(download_filename)
-    with download_file_path.open(mode="wb+") as file_obj:
-        file_obj.write(response.content)
-
-    # downl_file_path, _ = \
-    #     urllib.request.urlretrieve(url='https://newton.spacedys.com/~neodys2/neodys.cat', \
-    #                                filename=download_filename)
-
-    # To check whether the file has been successfully updated (if a file was present before) one
-    # needs to compare the "last modification time" of the file with the current system's time. If
-    # the deviation is too high, it is very likely that no new file has been downloaded and
-    # consequently updated
-    system_time = time.time()
-    # file_mod_time = os.path.getmtime(downl_file_path)
-    file_mod_time = download_file_path.stat().st_mtime
-    file_mod_diff = file_mod_time - system_time
-
-    # Set status message, if the file has been updated or not. A time difference of less than 5 s
-    # shall indicate whether the file is new or not
-    if file_mod_diff < 5:
+    # Download the file. The request is conditional (an unchanged file is not transferred again),
+    # streamed to disk and resumed if a previous transfer has been interrupted. The status is set
+    # to "ERROR" if the download failed
+    try:
+        solary_auxiliary.download.download_file(NEODYS_URL, download_filename)
         dl_status = "OK"
-    else:
+    except requests.RequestException:
         dl_status = "ERROR"
 
     # Optional: Get the number of expected NEOs from the NEODyS webpage
@@ -116,48 +453,2612 @@ def download(row_exp: t.Optional[bool] = None) -> t.Tuple[str, t.Optional[int]]:
     return dl_status, neodys_neo_nr
 
 
-def read_neodys() -> t.List[t.Dict[str, t.Any]]:
+def _neodys_file_path(path_filename: t.Optional[str] = None) -> str:
+    """
+    Get the file path of the downloaded NEODyS file.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a NEODyS file. If None, the path of the config file is taken. The
+        default is None.
+
+    Returns
+    -------
+    path_filename : str
+        Absolute file path of the NEODyS file.
+    """
+    # Set the download file path. The file shall be stored in the home direoctry
+    if path_filename is None:
+        path_filename = solary_auxiliary.parse.setnget_file_path(
+            PATH_CONFIG["neo"]["neodys_raw_dir"], PATH_CONFIG["neo"]["neodys_raw_file"]
+        )
+
+    return path_filename
+
+
+def _parse_neodys_line(neo_data_line_f: str) -> t.Tuple[t.Any, ...]:
+    """
+    Parse a single row of the NEODyS file.
+
+    Parameters
+    ----------
+    neo_data_line_f : str
+        Row of the NEODyS file (without header).
+
+    Returns
+    -------
+    neo_data_row : tuple
+        Parsed values. The order corresponds to NEODYS_COLUMNS.
+    """
+    neo_data_line = neo_data_line_f.split()
+    neo_data_row = (
+        neo_data_line[0].replace("'", ""),
+        float(neo_data_line[1]),
+        float(neo_data_line[2]),
+        float(neo_data_line[3]),
+        float(neo_data_line[4]),
+        float(neo_data_line[5]),
+        float(neo_data_line[6]),
+        float(neo_data_line[7]),
+        float(neo_data_line[8]),
+        float(neo_data_line[9]),
+    )
+
+    return neo_data_row
+
+
+def _iter_neodys_rows(path_filename: t.Optional[str] = None) -> t.Iterator[t.Tuple[t.Any, ...]]:
+    """
+    Iterate row-wise through the NEODyS file and yield the parsed rows as tuples.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a NEODyS file. If None, the path of the config file is taken. The
+        default is None.
+
+    Yields
+    ------
+    neo_data_row : tuple
+        Parsed values. The order corresponds to NEODYS_COLUMNS.
+    """
+    # Open the NEODyS file. Ignore the header (first 6 rows) and iterate lazily through the file
+    # row-wise. Only the current row is kept in memory
+    with open(_neodys_file_path(path_filename)) as f_temp:
+        for neo_data_line_f in itertools.islice(f_temp, NEODYS_HEADER_ROWS, None):
+            yield _parse_neodys_line(neo_data_line_f)
+
+
+def iter_neodys(path_filename: t.Optional[str] = None) -> t.Iterator[t.Dict[str, t.Any]]:
+    """
+    Iterate through the downloaded NEODyS file and yield one dictionary per NEO.
+
+    In contrast to read_neodys, the file is read lazily, row by row. The memory consumption is
+    therefore independent of the catalog size.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a NEODyS file. If None, the path of the config file is taken. The
+        default is None.
+
+    Yields
+    ------
+    neo_data : dict
+        Dictionary that contains the NEO data of an individual NEO.
+
+    See Also
+    --------
+    SolarY.neo.data.iter_neodys_chunks
+    """
+    for neo_data_row in _iter_neodys_rows(path_filename):
+        yield dict(zip(NEODYS_COLUMNS, neo_data_row))
+
+
+def iter_neodys_chunks(
+    chunk_size: int = 10000, path_filename: t.Optional[str] = None
+) -> t.Iterator[t.List[t.Tuple[t.Any, ...]]]:
+    """
+    Iterate through the downloaded NEODyS file and yield lists of row tuples.
+
+    Parameters
+    ----------
+    chunk_size : int, optional
+        Number of rows per yielded chunk. The last chunk may be smaller. The default is 10000.
+    path_filename : str, optional
+        Absolute file path of a NEODyS file. If None, the path of the config file is taken. The
+        default is None.
+
+    Yields
+    ------
+    neo_data_chunk : list
+        List of tuples. The values of each tuple are ordered like NEODYS_COLUMNS.
+    """
+    # Check the chunk size; zero or negative values would never yield any data
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    # Slice the row iterator into chunks of a fixed size
+    neo_data_rows = _iter_neodys_rows(path_filename)
+    neo_data_chunk = list(itertools.islice(neo_data_rows, chunk_size))
+    while neo_data_chunk:
+        yield neo_data_chunk
+        neo_data_chunk = list(itertools.islice(neo_data_rows, chunk_size))
+
+
+def read_neodys(path_filename: t.Optional[str] = None) -> t.List[t.Dict[str, t.Any]]:
     """
     Read the content of the downloaded NEODyS file and return a dictionary with its content.
 
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a NEODyS file. If None, the path of the config file is taken. The
+        default is None.
+
     Returns
     -------
     neo_dict : list
         List of dictionaries that contains the NEO data from the NEODyS download.
+
+    See Also
+    --------
+    SolarY.neo.data.iter_neodys
+    SolarY.neo.data.load_neodys_catalog
     """
-    # Set the download file path. The file shall be stored in the home direoctry
-    path_filename = solary_auxiliary.parse.setnget_file_path(
-        PATH_CONFIG["neo"]["neodys_raw_dir"], PATH_CONFIG["neo"]["neodys_raw_file"]
+    # Collect all NEOs from the row-wise generator
+    neo_dict = list(iter_neodys(path_filename))
+
+    return neo_dict
+
+
+def _neodys_loadtxt(
+    neo_data_source: t.Union[str, t.Iterable[str]], skiprows: int = 0
+) -> t.Dict[str, np.ndarray]:
+    """
+    Parse NEODyS rows into contiguous NumPy columns.
+
+    Parameters
+    ----------
+    neo_data_source : str or iterable
+        Absolute file path of a NEODyS file or lines of a NEODyS file.
+    skiprows : int, optional
+        Number of header rows to skip. The default is 0.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of NEODYS_COLUMNS as keys and the corresponding
+        contiguous arrays as values.
+    """
+    # Parse the rows into a structured array. The NEO names are enclosed in single quotes
+    neo_data = np.loadtxt(
+        neo_data_source,
+        dtype=NEODYS_DTYPE,
+        skiprows=skiprows,
+        usecols=range(len(NEODYS_COLUMNS)),
+        quotechar="'",
+        ndmin=1,
     )
 
-    # Set a placeholder dictionary where the data will be stored
-    neo_dict = []
+    # Copy each field of the structured array into its own contiguous array
+    neo_columns = {
+        col_name: np.ascontiguousarray(neo_data[col_name]) for col_name in NEODYS_COLUMNS
+    }
 
-    # Open the NEODyS file. Ignore the header (first 6 rows) and iterate through the file row-wise.
-    # Read the content adn save it in the dictionary
-    with open(path_filename) as f_temp:
-        neo_data = f_temp.readlines()[6:]
-        for neo_data_line_f in neo_data:
-            neo_data_line = neo_data_line_f.split()
-            neo_dict.append(
-                {
-                    "Name": neo_data_line[0].replace("'", ""),
-                    "Epoch_MJD": float(neo_data_line[1]),
-                    "SemMajAxis_AU": float(neo_data_line[2]),
-                    "Ecc_": float(neo_data_line[3]),
-                    "Incl_deg": float(neo_data_line[4]),
-                    "LongAscNode_deg": float(neo_data_line[5]),
-                    "ArgP_deg": float(neo_data_line[6]),
-                    "MeanAnom_deg": float(neo_data_line[7]),
-                    "AbsMag_": float(neo_data_line[8]),
-                    "SlopeParamG_": float(neo_data_line[9]),
-                }
-            )
+    return neo_columns
 
-    return neo_dict
+
+def _parse_neodys_shard(file_range: t.Tuple[str, int, int]) -> t.Dict[str, np.ndarray]:
+    """
+    Parse a byte range of a NEODyS file (worker function of the sharded parser).
+
+    Parameters
+    ----------
+    file_range : tuple
+        File path, start (inclusive) and end (exclusive) byte offset.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of NEODYS_COLUMNS as keys and the corresponding
+        contiguous arrays as values.
+    """
+    neo_columns = _neodys_loadtxt(_read_file_range(file_range))
+
+    return neo_columns
+
+
+def iter_neodys_shards(
+    path_filename: t.Optional[str] = None,
+    workers: t.Optional[int] = None,
+    nr_shards: t.Optional[int] = None,
+) -> t.Iterator[t.Dict[str, np.ndarray]]:
+    """
+    Parse the NEODyS file in parallel and yield the parsed shards in the original order.
+
+    The file is split into newline-aligned byte ranges that are parsed in a process pool.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a NEODyS file. If None, the path of the config file is taken. The
+        default is None.
+    workers : int, optional
+        Number of worker processes. If None, the number of CPUs is taken. The default is None.
+    nr_shards : int, optional
+        Number of shards. If None, four shards per worker are used. The default is None.
+
+    Yields
+    ------
+    neo_columns : dict
+        Dictionary with the column names of NEODYS_COLUMNS as keys and the column arrays of a
+        shard as values.
+    """
+    yield from _iter_file_shards(
+        _neodys_file_path(path_filename),
+        _parse_neodys_shard,
+        workers=workers,
+        nr_shards=nr_shards,
+        skip_lines=NEODYS_HEADER_ROWS,
+    )
+
+
+def _parse_neodys_array(path_filename: str, workers: int = 1) -> t.Dict[str, np.ndarray]:
+    """
+    Parse a NEODyS file into contiguous NumPy columns.
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of a NEODyS file.
+    workers : int, optional
+        Number of worker processes. If larger than 1, the file is parsed in shards by a process
+        pool. The default is 1.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of NEODYS_COLUMNS as keys and the corresponding
+        contiguous arrays as values.
+    """
+    # Parse the complete file at once or in parallel shards
+    if workers > 1:
+        neo_columns = _concat_columns(
+            iter_neodys_shards(path_filename, workers=workers, nr_shards=workers),
+            NEODYS_COLUMNS,
+        )
+    else:
+        neo_columns = _neodys_loadtxt(path_filename, skiprows=NEODYS_HEADER_ROWS)
+
+    return neo_columns
+
+
+def load_neodys_array(
+    path_filename: t.Optional[str] = None, cache: bool = False, workers: int = 1
+) -> t.Dict[str, np.ndarray]:
+    """
+    Load the NEODyS file into contiguous NumPy columns.
+
+    The file is parsed in bulk by NumPy's text parser. No Python object is created per NEO.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a NEODyS file. If None, the path of the config file is taken. The
+        default is None.
+    cache : bool, optional
+        If True, the parsed columns are stored as .npy files next to the raw file (keyed by its
+        SHA256 hash) and returned as read-only memory-mapped arrays. Subsequent calls load the
+        cache instead of parsing the file again. The default is False.
+    workers : int, optional
+        Number of worker processes. If larger than 1, the file is split into newline-aligned
+        shards that are parsed in parallel (see iter_neodys_shards). The default is 1.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of NEODYS_COLUMNS as keys and the corresponding
+        contiguous arrays as values. The names are stored as unicode strings, all other columns as
+        float64.
+
+    See Also
+    --------
+    SolarY.neo.data.read_neodys
+    """
+    # Parse the file or use the binary cache
+    path_filename = _neodys_file_path(path_filename)
+    if cache:
+        neo_columns = _load_column_cache(
+            path_filename, functools.partial(_parse_neodys_array, workers=workers)
+        )
+    else:
+        neo_columns = _parse_neodys_array(path_filename, workers=workers)
+
+    return neo_columns
+
+
+def load_neodys_catalog(path_filename: t.Optional[str] = None) -> catalog.NEOCatalog:
+    """
+    Load the NEODyS file as a catalog of memory-mapped columns.
+
+    The columns are taken from the binary cache (see load_neodys_array with cache=True); they are
+    read from disk only when they are accessed.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of the NEODyS file. If None, the path of the config file is taken. The
+        default is None.
+
+    Returns
+    -------
+    neo_catalog : SolarY.neo.catalog.NEOCatalog
+        Catalog of the NEOs.
+    """
+    neo_catalog = catalog.NEOCatalog.from_columns(load_neodys_array(path_filename, cache=True))
+
+    return neo_catalog
+
+
+class DerivedColumn(t.NamedTuple):
+    """
+    Definition of a derived column of the NEO databases.
+
+    Attributes
+    ----------
+    col_type : str
+        SQLite column type (FLOAT, INTEGER, TEXT, etc.).
+    inputs : tuple
+        Names of the input columns (raw or derived columns).
+    func : callable
+        Vectorized function that computes the column from the input arrays (passed positionally
+        in the order of inputs) and returns an array of the same length.
+    """
+
+    col_type: str
+    inputs: t.Tuple[str, ...]
+    func: t.Callable[..., np.ndarray]
+
+
+def _deriv_aphel(sem_maj_axis_au: np.ndarray, ecc: np.ndarray) -> np.ndarray:
+    """
+    Compute the aphelion of NEOs (see SolarY.general.astrodyn.kep_apoapsis).
+
+    Parameters
+    ----------
+    sem_maj_axis_au : numpy.ndarray
+        Semi-major axis given in AU.
+    ecc : numpy.ndarray
+        Eccentricity.
+
+    Returns
+    -------
+    aphel_au : numpy.ndarray
+        Aphelion given in AU.
+    """
+    aphel_au = (1.0 + np.asarray(ecc, dtype=np.float64)) * sem_maj_axis_au
+
+    return aphel_au
+
+
+def _deriv_perihel(sem_maj_axis_au: np.ndarray, ecc: np.ndarray) -> np.ndarray:
+    """
+    Compute the perihelion of NEOs (see SolarY.general.astrodyn.kep_periapsis).
+
+    Parameters
+    ----------
+    sem_maj_axis_au : numpy.ndarray
+        Semi-major axis given in AU.
+    ecc : numpy.ndarray
+        Eccentricity.
+
+    Returns
+    -------
+    perihel_au : numpy.ndarray
+        Perihelion given in AU.
+    """
+    perihel_au = (1.0 - np.asarray(ecc, dtype=np.float64)) * sem_maj_axis_au
+
+    return perihel_au
+
+
+def _deriv_neo_class(
+    sem_maj_axis_au: np.ndarray, perihel_au: np.ndarray, aphel_au: np.ndarray
+) -> np.ndarray:
+    """
+    Classify NEOs (see SolarY.neo.astrodyn.neo_class).
+
+    Parameters
+    ----------
+    sem_maj_axis_au : numpy.ndarray
+        Semi-major axis given in AU.
+    perihel_au : numpy.ndarray
+        Perihelion given in AU.
+    aphel_au : numpy.ndarray
+        Aphelion given in AU.
+
+    Returns
+    -------
+    neo_class : numpy.ndarray
+        NEO classes.
+    """
+    class_codes = astrodyn.classify_orbits(
+        sem_maj_axis_au, perihel_au, aphel_au, rules=astrodyn.NEO_CLASS_RULES
+    )
+    neo_class = np.array(astrodyn.orbit_class_names(astrodyn.NEO_CLASS_RULES))[class_codes]
+
+    return neo_class
+
+
+def _deriv_orbit_class(
+    sem_maj_axis_au: np.ndarray,
+    perihel_au: np.ndarray,
+    aphel_au: np.ndarray,
+    incl_deg: np.ndarray,
+    tisserand_jup: np.ndarray,
+) -> np.ndarray:
+    """
+    Classify orbits with the complete rule table (see SolarY.neo.astrodyn.classify_orbits).
+
+    Parameters
+    ----------
+    sem_maj_axis_au : numpy.ndarray
+        Semi-major axis given in AU.
+    perihel_au : numpy.ndarray
+        Perihelion given in AU.
+    aphel_au : numpy.ndarray
+        Aphelion given in AU.
+    incl_deg : numpy.ndarray
+        Inclination given in degrees.
+    tisserand_jup : numpy.ndarray
+        Tisserand parameter w.r.t. Jupiter.
+
+    Returns
+    -------
+    orbit_class : numpy.ndarray
+        Orbit classes.
+    """
+    class_codes = astrodyn.classify_orbits(
+        sem_maj_axis_au, perihel_au, aphel_au, incl_deg=incl_deg, tisserand_jup=tisserand_jup
+    )
+    orbit_class = np.array(astrodyn.orbit_class_names())[class_codes]
+
+    return orbit_class
+
+
+def _deriv_tisserand_jup(
+    sem_maj_axis_au: np.ndarray, ecc: np.ndarray, incl_deg: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the Tisserand parameter of NEOs w.r.t. Jupiter.
+
+    The parameter is computed with SolarY.general.astrodyn.tisserand.
+
+    Parameters
+    ----------
+    sem_maj_axis_au : numpy.ndarray
+        Semi-major axis given in AU.
+    ecc : numpy.ndarray
+        Eccentricity.
+    incl_deg : numpy.ndarray
+        Inclination given in degrees.
+
+    Returns
+    -------
+    tisserand_jup : numpy.ndarray
+        Tisserand parameter w.r.t. Jupiter (NaN for e > 1, since the semi-major axes of the
+        NEO databases are positive).
+    """
+    tisserand_jup = solary_general.astrodyn.tisserand(
+        sem_maj_axis_obj=sem_maj_axis_au, inc=np.radians(incl_deg), ecc=ecc
+    )
+
+    return np.asarray(tisserand_jup)
+
+
+# Registry of the derived columns of the NEO databases (see register_derived_column)
+DERIVED_COLUMNS: t.Dict[str, DerivedColumn] = {
+    "Aphel_AU": DerivedColumn("FLOAT", ("SemMajAxis_AU", "Ecc_"), _deriv_aphel),
+    "Perihel_AU": DerivedColumn("FLOAT", ("SemMajAxis_AU", "Ecc_"), _deriv_perihel),
+    "NEOClass": DerivedColumn(
+        "TEXT", ("SemMajAxis_AU", "Perihel_AU", "Aphel_AU"), _deriv_neo_class
+    ),
+    "TisserandJup_": DerivedColumn(
+        "FLOAT", ("SemMajAxis_AU", "Ecc_", "Incl_deg"), _deriv_tisserand_jup
+    ),
+    "OrbitClass": DerivedColumn(
+        "TEXT",
+        ("SemMajAxis_AU", "Perihel_AU", "Aphel_AU", "Incl_deg", "TisserandJup_"),
+        _deriv_orbit_class,
+    ),
+}
+
+
+def register_derived_column(
+    col_name: str, col_type: str, inputs: t.Sequence[str], func: t.Callable[..., np.ndarray]
+) -> None:
+    """
+    Register a derived column of the NEO databases.
+
+    Registered columns are created in the main tables and computed by the derived-column pipeline
+    (see update_derived of the database classes). A column is only created in databases that
+    provide all of its (transitive) raw input columns. Re-registering a column replaces its
+    definition; rows are recomputed if the inputs of the column changed.
+
+    Parameters
+    ----------
+    col_name : str
+        Name of the derived column.
+    col_type : str
+        SQLite column type (FLOAT, INTEGER, TEXT, etc.).
+    inputs : sequence
+        Names of the input columns (raw or derived columns).
+    func : callable
+        Vectorized function that computes the column from the input arrays (passed positionally
+        in the order of inputs).
+
+    Raises
+    ------
+    ValueError
+        If the column would depend on itself (directly or via other derived columns).
+    """
+    # Check the dependencies for cycles before the registration
+    deriv_col = DerivedColumn(col_type, tuple(inputs), func)
+    if col_name in _deriv_inputs_closure(
+        deriv_col.inputs, {**DERIVED_COLUMNS, col_name: deriv_col}
+    ):
+        raise ValueError(f"The derived column {col_name} depends on itself")
+    DERIVED_COLUMNS[col_name] = deriv_col
+
+
+def _deriv_inputs_closure(
+    col_names: t.Iterable[str], deriv_cols: t.Dict[str, DerivedColumn]
+) -> t.Set[str]:
+    """
+    Get all columns that the given columns depend on (transitively).
+
+    Parameters
+    ----------
+    col_names : iterable
+        Column names.
+    deriv_cols : dict
+        Definitions of the derived columns.
+
+    Returns
+    -------
+    closure : set
+        Names of the input columns (raw and derived), including the given columns.
+    """
+    closure: t.Set[str] = set()
+    stack = list(col_names)
+    while stack:
+        col_name = stack.pop()
+        if col_name in closure:
+            continue
+        closure.add(col_name)
+        if col_name in deriv_cols:
+            stack.extend(deriv_cols[col_name].inputs)
+
+    return closure
+
+
+def _deriv_order(raw_cols: t.Iterable[str]) -> t.List[str]:
+    """
+    Get the registered derived columns that can be computed from raw columns in dependency order.
+
+    Parameters
+    ----------
+    raw_cols : iterable
+        Names of the available raw columns.
+
+    Returns
+    -------
+    deriv_order : list
+        Names of the derived columns. Each column is listed after all of its derived inputs.
+    """
+    # Derived columns with all (transitive) raw inputs available
+    raw_cols = set(raw_cols)
+    available = [
+        col_name
+        for col_name in DERIVED_COLUMNS
+        if _deriv_inputs_closure([col_name], DERIVED_COLUMNS) - set(DERIVED_COLUMNS) <= raw_cols
+    ]
+
+    # Sort them topologically; the registration order is kept among independent columns
+    deriv_order: t.List[str] = []
+    while len(deriv_order) < len(available):
+        for col_name in available:
+            if col_name not in deriv_order and all(
+                input_col in deriv_order or input_col not in DERIVED_COLUMNS
+                for input_col in DERIVED_COLUMNS[col_name].inputs
+            ):
+                deriv_order.append(col_name)
+                break
+
+    return deriv_order
+
+
+def _compute_derived_columns(neo_columns: t.Dict[str, np.ndarray]) -> t.Dict[str, np.ndarray]:
+    """
+    Compute all registered derived columns of NEO data columns in dependency order.
+
+    Parameters
+    ----------
+    neo_columns : dict
+        Dictionary with the raw columns of the NEOs.
+
+    Returns
+    -------
+    deriv_columns : dict
+        Dictionary with the derived columns that can be computed from the given raw columns.
+    """
+    deriv_columns: t.Dict[str, np.ndarray] = {}
+    for col_name in _deriv_order(neo_columns):
+        deriv_col = DERIVED_COLUMNS[col_name]
+        deriv_columns[col_name] = np.asarray(
+            deriv_col.func(
+                *(
+                    deriv_columns[input_col]
+                    if input_col in deriv_columns
+                    else neo_columns[input_col]
+                    for input_col in deriv_col.inputs
+                )
+            )
+        )
+
+    return deriv_columns
+
+
+def _to_array(col_values: t.Sequence[t.Any], col_type: str) -> np.ndarray:
+    """
+    Convert the values of an SQLite column into a NumPy array.
+
+    Parameters
+    ----------
+    col_values : sequence
+        Values of the column.
+    col_type : str
+        SQLite column type (FLOAT, INTEGER, TEXT, etc.).
+
+    Returns
+    -------
+    col_array : numpy.ndarray
+        Array of the column values. FLOAT columns are converted to float64 (NULL as NaN), INTEGER
+        columns to int64 (or float64, if they contain NULL values) and all other columns to
+        unicode strings (NULL as empty string, e.g., for NEOs that have not been classified yet).
+    """
+    if col_type in ("FLOAT", "REAL"):
+        col_array = np.array(col_values, dtype=np.float64)
+    elif col_type == "INTEGER":
+        if None in col_values:
+            col_array = np.array(col_values, dtype=np.float64)
+        else:
+            col_array = np.array(col_values, dtype=np.int64)
+    else:
+        col_array = np.array(
+            ["" if col_value is None else col_value for col_value in col_values], dtype=np.str_
+        )
+
+    return col_array
+
+
+def _table_cols(cur: sqlite3.Cursor) -> t.Dict[str, str]:
+    """
+    Get the columns of the main table of a NEO database.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        Cursor to the SQLite database.
+
+    Returns
+    -------
+    table_cols : dict
+        Dictionary with the column names as keys and the (upper case) SQLite column types as
+        values. The dictionary is empty, if the main table does not exist.
+    """
+    table_cols = {
+        col_info[1]: col_info[2].upper()
+        for col_info in cur.execute("PRAGMA table_info(main)").fetchall()
+    }
+
+    return table_cols
+
+
+def _where_sql(where: t.Dict[str, t.Any]) -> t.Tuple[t.List[str], t.List[t.Any]]:
+    """
+    Translate the predicates of the query API into SQL conditions.
+
+    Parameters
+    ----------
+    where : dict
+        Predicates (see _NEODatabase.select). The column names must have been checked before.
+
+    Returns
+    -------
+    sql_conds : list
+        SQL conditions (to be combined with AND).
+    sql_params : list
+        Parameters of the SQL conditions.
+    """
+    sql_conds = []
+    sql_params: t.List[t.Any] = []
+    for col_name, col_cond in where.items():
+        if isinstance(col_cond, tuple):
+            lower, upper = col_cond
+            if lower is not None:
+                sql_conds.append(f"{col_name} >= ?")
+                sql_params.append(lower)
+            if upper is not None:
+                sql_conds.append(f"{col_name} < ?")
+                sql_params.append(upper)
+        elif isinstance(col_cond, (list, set, frozenset)):
+            sql_conds.append(f"{col_name} IN ({', '.join('?' * len(col_cond))})")
+            sql_params.extend(col_cond)
+        elif col_cond is None:
+            sql_conds.append(f"{col_name} IS NULL")
+        else:
+            sql_conds.append(f"{col_name} = ?")
+            sql_params.append(col_cond)
+
+    return sql_conds, sql_params
+
+
+def _rtree_sql(
+    cur: sqlite3.Cursor, where: t.Dict[str, t.Any]
+) -> t.Tuple[t.List[str], t.List[t.Any]]:
+    """
+    Translate the range predicates of a box query into an SQL condition on the R*Tree index.
+
+    The R*Tree stores the coordinates as 32 bit floats (rounded outwards); thus, the condition
+    selects a superset of the matching rows and the exact predicates need to be applied, too.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        Cursor to the SQLite database.
+    where : dict
+        Predicates (see _NEODatabase.select). The column names must have been checked before.
+
+    Returns
+    -------
+    rtree_conds : list
+        SQL conditions (to be combined with AND). The list is empty, if the query is not a box
+        query or if the database has no R*Tree index.
+    rtree_params : list
+        Parameters of the SQL conditions.
+    """
+    # Get the range predicates on the R*Tree columns
+    box_ranges = {
+        col_name: col_cond
+        for col_name, col_cond in where.items()
+        if col_name in RTREE_COLUMNS
+        and isinstance(col_cond, tuple)
+        and any(bound is not None for bound in col_cond)
+    }
+    if len(box_ranges) < RTREE_MIN_RANGES:
+        return [], []
+    if cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'main_rtree'").fetchone() is None:
+        return [], []
+
+    # Set the overlap conditions of the box
+    box_conds = []
+    rtree_params = []
+    for col_name, (lower, upper) in box_ranges.items():
+        if lower is not None:
+            box_conds.append(f"max_{col_name} >= ?")
+            rtree_params.append(lower)
+        if upper is not None:
+            box_conds.append(f"min_{col_name} <= ?")
+            rtree_params.append(upper)
+    rtree_conds = [f"rowid IN (SELECT id FROM main_rtree WHERE {' AND '.join(box_conds)})"]
+
+    return rtree_conds, rtree_params
+
+
+def _main_where_sql(
+    cur: sqlite3.Cursor, where: t.Dict[str, t.Any]
+) -> t.Tuple[str, t.List[t.Any]]:
+    """
+    Get the WHERE clause of a query of the main table of a NEO database.
+
+    Box queries in the orbital element space are pre-filtered by the R*Tree index.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        Cursor to the SQLite database.
+    where : dict
+        Predicates (see _NEODatabase.select). The column names must have been checked.
+
+    Returns
+    -------
+    sql_where : str
+        WHERE clause (with a leading space) or an empty string, if there are no predicates.
+    sql_params : list
+        Parameters of the WHERE clause.
+    """
+    rtree_conds, rtree_params = _rtree_sql(cur, where)
+    sql_conds, sql_params = _where_sql(where)
+    sql_where = f" WHERE {' AND '.join(rtree_conds + sql_conds)}" if rtree_conds + sql_conds else ""
+
+    return sql_where, rtree_params + sql_params
+
+
+def _count_rows(cur: sqlite3.Cursor, where: t.Optional[t.Dict[str, t.Any]] = None) -> int:
+    """
+    Count the rows of the main table of a NEO database that match the predicates.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        Cursor to the SQLite database.
+    where : dict, optional
+        Predicates (see _NEODatabase.select). If None, all rows are counted.
+
+    Returns
+    -------
+    nr_rows : int
+        Number of matching rows.
+    """
+    # Check the column names; they are inserted into the SQL statement
+    where = where or {}
+    unknown_cols = set(where) - set(_table_cols(cur))
+    if unknown_cols:
+        raise ValueError(f"Unknown column(s) of the main table: {sorted(unknown_cols)}")
+
+    sql_where, sql_params = _main_where_sql(cur, where)
+    nr_rows = cur.execute(f"SELECT COUNT(*) FROM main{sql_where}", sql_params).fetchone()[0]
+
+    return nr_rows
+
+
+def _select_columns(
+    cur: sqlite3.Cursor,
+    columns: t.Optional[t.Sequence[str]] = None,
+    where: t.Optional[t.Dict[str, t.Any]] = None,
+    ordered: bool = False,
+) -> t.Dict[str, np.ndarray]:
+    """
+    Query the main table of a NEO database and return the result as NumPy columns.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        Cursor to the SQLite database.
+    columns : sequence, optional
+        Names of the columns that shall be returned. If None, all columns are returned.
+    where : dict, optional
+        Predicates (see _NEODatabase.select). If None, all rows are returned.
+    ordered : bool, optional
+        If True, the rows are sorted by their rowid; thus, separate queries of the same rows
+        return the same order. The default is False.
+
+    Returns
+    -------
+    query_columns : dict
+        Dictionary with the column names as keys and the NumPy arrays of the results as values.
+    """
+    # Get the columns of the main table and check the requested column names. The names are
+    # inserted into the SQL statement; thus, only existing column names are accepted
+    table_cols = _table_cols(cur)
+    columns = list(columns or table_cols)
+    where = where or {}
+    unknown_cols = (set(columns) | set(where)) - set(table_cols)
+    if unknown_cols:
+        raise ValueError(f"Unknown column(s) of the main table: {sorted(unknown_cols)}")
+
+    # Set the SQL conditions and their parameters
+    sql_where, sql_params = _main_where_sql(cur, where)
+    sql_query = f"SELECT {', '.join(columns)} FROM main{sql_where}"
+    if ordered:
+        sql_query += " ORDER BY main.rowid"
+
+    # Query the data and convert the rows to columns
+    query_rows = cur.execute(sql_query, sql_params).fetchall()
+    query_columns = {
+        col_name: _to_array(col_values, table_cols[col_name])
+        for col_name, col_values in zip(
+            columns, zip(*query_rows) if query_rows else [()] * len(columns)
+        )
+    }
+
+    return query_columns
+
+
+def _import_pyarrow() -> t.Any:
+    """
+    Import the optional dependency pyarrow (including its Parquet module).
+
+    Returns
+    -------
+    pyarrow : module
+        The pyarrow module.
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed.
+    """
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # noqa: F401 pylint: disable=import-outside-toplevel
+    except ImportError as import_error:
+        raise ImportError(
+            "The export / load of NEO databases requires pyarrow. Install it with: "
+            "pip install SolarY[arrow]"
+        ) from import_error
+
+    return pyarrow
+
+
+def _arrow_schema(table_cols: t.Dict[str, str], pyarrow: t.Any) -> t.Any:
+    """
+    Get the Arrow schema of the main table of a NEO database.
+
+    Parameters
+    ----------
+    table_cols : dict
+        Dictionary with the column names and the SQLite column types of the main table.
+    pyarrow : module
+        The pyarrow module.
+
+    Returns
+    -------
+    schema : pyarrow.Schema
+        Schema with float64 (FLOAT / REAL), int64 (INTEGER) and string (TEXT) columns. The
+        column NEOClass is dictionary-encoded.
+    """
+    # Map the SQLite column types to Arrow types
+    arrow_types = {
+        "FLOAT": pyarrow.float64(),
+        "REAL": pyarrow.float64(),
+        "INTEGER": pyarrow.int64(),
+    }
+    schema = pyarrow.schema(
+        [
+            (
+                col_name,
+                pyarrow.dictionary(pyarrow.int8(), pyarrow.string())
+                if col_name == "NEOClass"
+                else arrow_types.get(col_type, pyarrow.string()),
+            )
+            for col_name, col_type in table_cols.items()
+        ]
+    )
+
+    return schema
+
+
+def load_export(path_filename: str, columns: t.Optional[t.Sequence[str]] = None) -> t.Any:
+    """
+    Load an exported NEO database (see NEOdysDatabase.export) as an Arrow table.
+
+    Arrow IPC files (file ending .arrow) are memory-mapped and read zero-copy; i.e., the columns
+    of the table refer to the mapped file and are not copied into memory. Parquet files (file
+    ending .parquet) are memory-mapped, too, but their pages need to be decoded.
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of the exported file.
+    columns : sequence, optional
+        Names of the columns that shall be loaded. If None, all columns are loaded. The default is
+        None.
+
+    Returns
+    -------
+    neo_table : pyarrow.Table
+        Table with the (selected) columns of the exported database.
+
+    Raises
+    ------
+    ValueError
+        If the file ending does not correspond to an export format.
+    ImportError
+        If pyarrow is not installed.
+    """
+    pyarrow = _import_pyarrow()
+
+    # Read an Arrow IPC file from the memory map. A column selection does not copy any data
+    if path_filename.endswith(EXPORT_SUFFIXES["arrow"]):
+        with pyarrow.memory_map(path_filename, "r") as source:
+            neo_table = pyarrow.ipc.open_file(source).read_all()
+        if columns is not None:
+            neo_table = neo_table.select(list(columns))
+
+    # Read a Parquet file
+    elif path_filename.endswith(EXPORT_SUFFIXES["parquet"]):
+        neo_table = pyarrow.parquet.read_table(
+            path_filename,
+            columns=None if columns is None else list(columns),
+            memory_map=True,
+        )
+
+    else:
+        raise ValueError(f"Unknown file ending of an exported NEO database: {path_filename}")
+
+    return neo_table
+
+
+class ReadOnlyConnectionPool:
+    """
+    Thread-safe pool of read-only connections to an SQLite based NEO database.
+
+    Each thread gets its own connection that is opened in the read-only mode (URI parameter
+    mode=ro) on first use and re-used afterwards; thus, the connection setup is paid only once per
+    thread. The database is switched to the write-ahead log (WAL) journal mode, so that readers
+    are not blocked while a writer (e.g., NEOdysDatabase.update) refreshes the database.
+
+    Attributes
+    ----------
+    db_filename : str
+        Absolute path to the SQLite database
+
+    Methods
+    -------
+    connection()
+        Context manager that provides the read-only connection of the current thread.
+    select(columns=None, where=None)
+        Query the main table with the connection of the current thread.
+    close()
+        Close all connections of the pool.
+
+    Examples
+    --------
+    >>> import SolarY
+    >>> neo_sqlite = SolarY.neo.data.NEOdysDatabase()  # doctest: +SKIP
+    >>> with neo_sqlite.read_pool() as read_pool:  # doctest: +SKIP
+    ...     with read_pool.connection() as con:
+    ...         nr_neos = con.execute("SELECT COUNT(*) FROM main").fetchone()[0]
+    """
+
+    def __init__(self, db_filename: str, wal: bool = True) -> None:
+        """
+        Init function of the ReadOnlyConnectionPool class.
+
+        Parameters
+        ----------
+        db_filename : str
+            Absolute path to an existing SQLite database.
+        wal : bool, optional
+            If True, the journal mode of the database is set to WAL (persistent setting of the
+            database file). The default is True.
+        """
+        self.db_filename = db_filename
+
+        # Set the WAL journal mode. Read-only connections cannot change the journal mode; thus,
+        # a temporary read-write connection is used
+        if wal:
+            con = sqlite3.connect(self.db_filename)
+            con.execute("PRAGMA journal_mode = WAL").fetchone()
+            con.close()
+
+        # URI of the database in the read-only mode
+        self._uri = f"{Path(self.db_filename).resolve().as_uri()}?mode=ro"
+
+        # Thread-local storage of the connections and a list of all connections (for closing)
+        self._local = threading.local()
+        self._cons: t.List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _get_con(self) -> sqlite3.Connection:
+        """
+        Get (or open) the read-only connection of the current thread.
+
+        Returns
+        -------
+        con : sqlite3.Connection
+            Read-only connection of the current thread.
+        """
+        con = getattr(self._local, "con", None)
+        if con is None:
+
+            # Open a new connection. check_same_thread is disabled only to allow close() to be
+            # called from any thread; each connection is used by its own thread only
+            con = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+            self._local.con = con
+            with self._lock:
+                self._cons.append(con)
+
+        return con
+
+    @contextlib.contextmanager
+    def connection(self) -> t.Iterator[sqlite3.Connection]:
+        """
+        Context manager that provides the read-only connection of the current thread.
+
+        The connection stays open after the context and is re-used by the next call of the same
+        thread.
+
+        Yields
+        ------
+        con : sqlite3.Connection
+            Read-only connection of the current thread.
+        """
+        con = self._get_con()
+        try:
+            yield con
+        finally:
+            # End any open read transaction; thus, the next query sees the latest database state
+            con.rollback()
+
+    def select(
+        self,
+        columns: t.Optional[t.Sequence[str]] = None,
+        where: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> t.Dict[str, np.ndarray]:
+        """
+        Query the main table with the connection of the current thread.
+
+        Parameters
+        ----------
+        columns : sequence, optional
+            Names of the columns that shall be returned. If None, all columns are returned. The
+            default is None.
+        where : dict, optional
+            Predicates (see NEOdysDatabase.select). If None, all rows are returned. The default is
+            None.
+
+        Returns
+        -------
+        query_columns : dict
+            Dictionary with the column names as keys and the NumPy arrays of the results as
+            values.
+        """
+        with self.connection() as con:
+            query_columns = _select_columns(con.cursor(), columns=columns, where=where)
+
+        return query_columns
+
+    def close(self) -> None:
+        """Close all connections of the pool."""
+        with self._lock:
+            for con in self._cons:
+                con.close()
+            self._cons = []
+        self._local = threading.local()
+
+    def __enter__(self) -> "ReadOnlyConnectionPool":
+        """
+        Enter the context of the pool.
+
+        Returns
+        -------
+        ReadOnlyConnectionPool
+            The pool itself.
+        """
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        """
+        Exit the context of the pool and close all connections.
+
+        Parameters
+        ----------
+        exc_info : tuple
+            Exception information (not used).
+        """
+        self.close()
+
+
+class NEOSampler:
+    """
+    Sampler of NEOs with class and absolute magnitude constraints.
+
+    The sampler holds the NEO data columns sorted by NEO class and absolute magnitude. This
+    order forms a bucket index: each bucket (NEO class, absolute magnitude bin) is a contiguous
+    block of rows. It is built once (O(M log M) for M NEOs); afterwards, a draw of N NEOs costs
+    O(N) and never rescans the data. The absolute magnitude constraints are exact, since the rows
+    of each class block are sorted by the absolute magnitude.
+
+    NEOs are drawn with replacement. The probability of a NEO is proportional to the weight of
+    its bucket (uniform sampling without weights).
+
+    Attributes
+    ----------
+    neo_columns : dict
+        Data columns of the NEOs, sorted by NEO class and absolute magnitude.
+    neo_classes : numpy.ndarray
+        Sorted NEO classes (first axis of the bucket arrays).
+    abs_mag_edges : numpy.ndarray
+        Edges of the absolute magnitude bins (second axis of the bucket arrays).
+    bucket_counts : numpy.ndarray
+        Number of NEOs per bucket of the shape (number of classes, number of bins).
+
+    Methods
+    -------
+    draw(nr_draws, neo_classes=None, abs_mag=None, weights=None, stratified=False, rng=None)
+        Draw NEOs.
+
+    Examples
+    --------
+    Draw 1,000,000 Apollos with an absolute magnitude between 18 and 22 from the Granvik et al.
+    (2018) model
+
+    >>> import SolarY
+    >>> granvik2018_sqlite = SolarY.neo.data.Granvik2018Database()  # doctest: +SKIP
+    >>> sampler = granvik2018_sqlite.sampler()  # doctest: +SKIP
+    >>> apollos = sampler.draw(
+    ...     1000000, neo_classes=["Apollo"], abs_mag=(18.0, 22.0)
+    ... )  # doctest: +SKIP
+    """
+
+    def __init__(
+        self, neo_columns: t.Dict[str, np.ndarray], abs_mag_bin_width: float = 0.25
+    ) -> None:
+        """
+        Init function of the NEOSampler class.
+
+        Parameters
+        ----------
+        neo_columns : dict
+            Data columns of the NEOs. Must contain the columns NEOClass and AbsMag_. NEOs without
+            an absolute magnitude or without a class (empty string) are ignored.
+        abs_mag_bin_width : float, optional
+            Width of the absolute magnitude bins. The default is 0.25.
+
+        Raises
+        ------
+        ValueError
+            If the bin width is not positive.
+        """
+        if abs_mag_bin_width <= 0.0:
+            raise ValueError("abs_mag_bin_width must be positive")
+
+        # Get the NEO classes and absolute magnitudes of the NEOs with an absolute magnitude and a
+        # class
+        abs_mag = np.asarray(neo_columns["AbsMag_"], dtype=np.float64)
+        neo_class = np.asarray(neo_columns["NEOClass"]).astype(np.str_)
+        valid_mask = np.isfinite(abs_mag) & (neo_class != "")
+        abs_mag = abs_mag[valid_mask]
+        neo_class = neo_class[valid_mask]
+        self.neo_classes = np.unique(neo_class)
+        class_idx = np.searchsorted(self.neo_classes, neo_class)
+
+        # Set the absolute magnitude bins. The bins start at the smallest magnitude and the largest
+        # magnitude is within the last bin. Without NEOs, a single bin [0, bin width) is set
+        if abs_mag.size == 0:
+            abs_mag_min, abs_mag_max = 0.0, 0.0
+        else:
+            abs_mag_min, abs_mag_max = float(abs_mag.min()), float(abs_mag.max())
+        abs_mag_min = np.floor(abs_mag_min / abs_mag_bin_width) * abs_mag_bin_width
+        nr_bins = int((abs_mag_max - abs_mag_min) // abs_mag_bin_width) + 1
+        self.abs_mag_edges = abs_mag_min + abs_mag_bin_width * np.arange(nr_bins + 1)
+        bin_idx = np.clip(
+            np.searchsorted(self.abs_mag_edges, abs_mag, side="right") - 1, 0, nr_bins - 1
+        )
+
+        # Sort the rows by class and absolute magnitude and set the bucket offsets
+        order = np.lexsort((abs_mag, class_idx))
+        self.neo_columns = {
+            col_name: np.asarray(col_values)[valid_mask][order]
+            for col_name, col_values in neo_columns.items()
+        }
+        self._abs_mag = abs_mag[order]
+        bucket_idx = (class_idx * nr_bins + bin_idx)[order]
+        self._bucket_offsets = np.searchsorted(
+            bucket_idx, np.arange(len(self.neo_classes) * nr_bins + 1)
+        )
+        self.bucket_counts = np.diff(self._bucket_offsets).reshape(len(self.neo_classes), nr_bins)
+
+    def _bucket_ranges(
+        self,
+        neo_classes: t.Optional[t.Sequence[str]],
+        abs_mag: t.Optional[t.Tuple[t.Optional[float], t.Optional[float]]],
+    ) -> t.Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the row ranges of the buckets that fulfil the constraints.
+
+        Parameters
+        ----------
+        neo_classes : sequence or None
+            NEO classes. If None, all classes are allowed.
+        abs_mag : tuple or None
+            Absolute magnitude range (lower, upper) with lower <= AbsMag_ < upper. None denotes
+            an open bound.
+
+        Returns
+        -------
+        bucket_starts : numpy.ndarray
+            First rows of the buckets of the shape (number of classes, number of bins).
+        bucket_ends : numpy.ndarray
+            Rows after the last rows of the buckets (equal to the first rows for buckets that do
+            not fulfil the constraints).
+        """
+        nr_bins = self.bucket_counts.shape[1]
+        bucket_starts = self._bucket_offsets[:-1].reshape(-1, nr_bins).copy()
+        bucket_ends = self._bucket_offsets[1:].reshape(-1, nr_bins).copy()
+
+        # Clip the buckets of each class to the rows within the absolute magnitude range. The
+        # rows of a class block are sorted by the absolute magnitude
+        lower, upper = abs_mag or (None, None)
+        for class_idx, neo_class in enumerate(self.neo_classes):
+            block_start, block_end = bucket_starts[class_idx, 0], bucket_ends[class_idx, -1]
+            if neo_classes is not None and neo_class not in neo_classes:
+                range_start, range_end = block_start, block_start
+            else:
+                block_abs_mag = self._abs_mag[block_start:block_end]
+                range_start = block_start + (
+                    0 if lower is None else np.searchsorted(block_abs_mag, lower, side="left")
+                )
+                range_end = block_start + (
+                    len(block_abs_mag)
+                    if upper is None
+                    else np.searchsorted(block_abs_mag, upper, side="left")
+                )
+            bucket_starts[class_idx] = np.clip(bucket_starts[class_idx], range_start, range_end)
+            bucket_ends[class_idx] = np.clip(
+                bucket_ends[class_idx], bucket_starts[class_idx], range_end
+            )
+
+        return bucket_starts, bucket_ends
+
+    def draw(
+        self,
+        nr_draws: int,
+        neo_classes: t.Optional[t.Sequence[str]] = None,
+        abs_mag: t.Optional[t.Tuple[t.Optional[float], t.Optional[float]]] = None,
+        weights: t.Optional[np.ndarray] = None,
+        stratified: bool = False,
+        rng: t.Optional[np.random.Generator] = None,
+    ) -> t.Dict[str, np.ndarray]:
+        """
+        Draw NEOs (with replacement).
+
+        Parameters
+        ----------
+        nr_draws : int
+            Number of drawn NEOs.
+        neo_classes : sequence, optional
+            NEO classes of the drawn NEOs. If None, all classes are allowed. The default is None.
+        abs_mag : tuple, optional
+            Absolute magnitude range (lower, upper) of the drawn NEOs with lower <= AbsMag_ <
+            upper. None denotes an open bound. If None, all magnitudes are allowed. The default is
+            None.
+        weights : numpy.ndarray, optional
+            Relative weights of a NEO per bucket of the shape of bucket_counts. If None, all NEOs
+            have the same weight. The default is None.
+        stratified : bool, optional
+            If True, the number of draws per bucket is not random but allocated proportionally
+            to the bucket's probability (largest remainder method); the draws within the
+            buckets are random. The default is False.
+        rng : numpy.random.Generator, optional
+            Random number generator. If None, a new generator is created. The default is None.
+
+        Returns
+        -------
+        neo_draws : dict
+            Dictionary with the column names as keys and the arrays of the drawn NEOs (in random
+            order) as values.
+
+        Raises
+        ------
+        ValueError
+            If no NEO fulfils the constraints (or all of them have zero weight) or if the weights
+            have the wrong shape.
+        """
+        rng = rng or np.random.default_rng()
+
+        # Compute the probabilities of the buckets
+        bucket_starts, bucket_ends = self._bucket_ranges(neo_classes, abs_mag)
+        bucket_sizes = (bucket_ends - bucket_starts).ravel()
+        bucket_probs = bucket_sizes.astype(np.float64)
+        if weights is not None:
+            if np.shape(weights) != self.bucket_counts.shape:
+                raise ValueError(f"weights must have the shape {self.bucket_counts.shape}")
+            bucket_probs *= np.asarray(weights, dtype=np.float64).ravel()
+        if not bucket_probs.sum() > 0.0:
+            raise ValueError("No NEO fulfils the constraints of the draw")
+        bucket_probs /= bucket_probs.sum()
+
+        # Set the number of draws per bucket: random (multinomial) or proportional
+        if stratified:
+            exp_draws = nr_draws * bucket_probs
+            bucket_draws = np.floor(exp_draws).astype(np.int64)
+            remainder = nr_draws - int(bucket_draws.sum())
+            bucket_draws[np.argsort(bucket_draws - exp_draws, kind="stable")[:remainder]] += 1
+        else:
+            bucket_draws = rng.multinomial(nr_draws, bucket_probs)
+
+        # Draw the rows uniformly within the buckets and shuffle them
+        draw_buckets = np.repeat(np.arange(len(bucket_draws)), bucket_draws)
+        draw_rows = bucket_starts.ravel()[draw_buckets] + (
+            rng.random(nr_draws) * bucket_sizes[draw_buckets]
+        ).astype(np.intp)
+        draw_rows = rng.permutation(draw_rows)
+        neo_draws = {
+            col_name: col_values[draw_rows] for col_name, col_values in self.neo_columns.items()
+        }
+
+        return neo_draws
+
+
+class _NEODatabase:
+    """
+    Base class of the SQLite based NEO databases.
+
+    The class provides the functionalities that are shared between the NEODyS and the Granvik et
+    al. (2018) databases, like the connection handling and the bulk build mode. Subclasses define
+    the columns of the main table.
+
+    Attributes
+    ----------
+    db_filename : str
+        Absolute path to the SQLite database
+    con : sqlite3.Connection
+        Connection to the SQLite database
+    cur: sqlite3.Cursor
+        Cursor to the SQLite database
+    in_memory : bool
+        If True, the queries are served from an in-memory snapshot of the database file
+    """
+
+    # Raw columns of the main table with their SQLite column types. The first column is the
+    # primary key
+    _raw_cols: t.Tuple[t.Tuple[str, str], ...] = ()
+
+    # Columns of the main table with a secondary index
+    _index_cols: t.Tuple[str, ...] = (
+        "NEOClass",
+        "AbsMag_",
+        "Perihel_AU",
+        "Aphel_AU",
+        "SemMajAxis_AU",
+    )
+
+    def __init__(self, db_filename: str, new: bool = False, in_memory: bool = False) -> None:
+        """
+        Init function of the base class.
+
+        This method creates a new database or opens an existing one (if applicable) and sets a
+        cursor.
+
+        Parameters
+        ----------
+        db_filename : str
+            Absolute path to the SQLite database.
+        new : bool, optional
+            If True: a new database will be created from scratch. WARNING: this will delete any
+            previously built SQLite database with the given file name. The default is False.
+        in_memory : bool, optional
+            If True, the database file is copied into an in-memory database (snapshot) and all
+            queries are served from memory (see refresh). Changes of the snapshot are not written
+            into the file. The default is False.
+
+        Raises
+        ------
+        ValueError
+            If a new database shall be created in the in-memory mode.
+        FileNotFoundError
+            If the database file does not exist in the in-memory mode.
+        """
+        self.db_filename = db_filename
+        self.in_memory = in_memory
+
+        # Load the snapshot of an existing database
+        if in_memory:
+            if new:
+                raise ValueError("A new database cannot be created in the in-memory mode")
+            self._snapshot_signature: t.Tuple[t.Any, ...] = ()
+            self._snapshot_changes = 0
+            self.refresh(force=True)
+            return
+
+        # Delete any existing database, if requested. Left-over WAL files of a previous database
+        # are deleted, too; otherwise, SQLite would try to apply them to the new database
+        if new:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.db_filename + suffix):
+                    os.remove(self.db_filename + suffix)
+
+        # Connect / Build database and set a cursor
+        self.con = sqlite3.connect(self.db_filename)
+        self.cur = self.con.cursor()
+
+    @property
+    def _key_col(self) -> str:
+        """
+        Get the name of the primary key column of the main table.
+
+        Returns
+        -------
+        key_col : str
+            Column name of the primary key.
+        """
+        key_col = self._raw_cols[0][0]
+
+        return key_col
+
+    def _file_signature(self) -> t.Tuple[t.Any, ...]:
+        """
+        Get the signature of the database file (and its WAL file) to detect changes.
+
+        Returns
+        -------
+        file_signature : tuple
+            Size and modification time (in ns) of the database file and its WAL file (None, if a
+            file does not exist).
+        """
+        file_signature = tuple(
+            (os.stat(file_path).st_size, os.stat(file_path).st_mtime_ns)
+            if os.path.exists(file_path)
+            else None
+            for file_path in (self.db_filename, self.db_filename + "-wal")
+        )
+
+        return file_signature
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the in-memory snapshot of the database file, if the file has changed.
+
+        The file is copied with the SQLite backup API into a new in-memory database and all
+        indexes are built there. The new snapshot replaces the current one only after it is
+        complete; thus, the queries are served either from the old or from the new snapshot.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the snapshot is reloaded even if the file has not changed. The default is
+            False.
+
+        Returns
+        -------
+        reloaded : bool
+            True, if the snapshot has been reloaded.
+
+        Raises
+        ------
+        ValueError
+            If the database is not in the in-memory mode.
+        FileNotFoundError
+            If the database file does not exist.
+        """
+        # Check the mode and whether the file has changed
+        if not self.in_memory:
+            raise ValueError("refresh is only available in the in-memory mode")
+        if not os.path.exists(self.db_filename):
+            raise FileNotFoundError(f"The database {self.db_filename} does not exist")
+        file_signature = self._file_signature()
+        if not force and file_signature == self._snapshot_signature:
+            return False
+
+        # Copy the database file into a new in-memory database (read-only access of the file)
+        mem_con = sqlite3.connect(":memory:")
+        file_con = sqlite3.connect(f"{Path(self.db_filename).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            file_con.backup(mem_con)
+        finally:
+            file_con.close()
+
+        # Swap the snapshots and build the indexes in memory
+        old_con = getattr(self, "con", None)
+        self.con, self.cur = mem_con, mem_con.cursor()
+        if self._table_cols():
+            self._create_indexes()
+        self._snapshot_signature = file_signature
+        self._snapshot_changes = self.con.total_changes
+        if old_con is not None:
+            old_con.close()
+
+        return True
+
+    @property
+    def _deriv_cols(self) -> t.Tuple[t.Tuple[str, str], ...]:
+        """
+        Get the derived columns of the main table (see DERIVED_COLUMNS).
+
+        Only registered columns whose (transitive) raw inputs are raw columns of the database are
+        taken.
+
+        Returns
+        -------
+        deriv_cols : tuple
+            Derived column names with their SQLite column types in dependency order.
+        """
+        deriv_cols = tuple(
+            (col_name, DERIVED_COLUMNS[col_name].col_type)
+            for col_name in _deriv_order(col_name for col_name, _ in self._raw_cols)
+        )
+
+        return deriv_cols
+
+    def _create_col(self, table: str, col_name: str, col_type: str) -> None:
+        """
+        Private method to create new columns in tables.
+
+        Parameters
+        ----------
+        table : str
+            Table name, where a new column shall be added.
+        col_name : str
+            Column name.
+        col_type : str
+            SQLite column type (FLOAT, INT, TEXT, etc.).
+        """
+        # Generic f-string that represents an SQLite command to alter a table (adding a new column
+        # with its dtype).
+        sql_col_create = f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}"
+
+        # Try to create a new column. If is exists an sqlite3.OperationalError weill raise. Pass
+        # this error.
+        # TODO: change the error passing
+        try:
+            self.cur.execute(sql_col_create)
+            self.con.commit()
+        except sqlite3.OperationalError:
+            pass
+
+    def _create_main_table(self, deriv: bool = False) -> None:
+        """
+        Create the main table (if it does not exist).
+
+        Parameters
+        ----------
+        deriv : bool, optional
+            If True, the derived columns are created alongside the raw columns. The default is
+            False.
+        """
+        # Set the column definitions. The first column is the primary key
+        main_cols = list(self._raw_cols) + (list(self._deriv_cols) if deriv else [])
+        col_defs = [f"{main_cols[0][0]} {main_cols[0][1]} PRIMARY KEY"] + [
+            f"{col_name} {col_type}" for col_name, col_type in main_cols[1:]
+        ]
+
+        # Create the table and add the derived columns (and their dirty tracking) in case that an
+        # existing table has been created without them
+        self.cur.execute(f"CREATE TABLE IF NOT EXISTS main({', '.join(col_defs)})")
+        self.con.commit()
+        if deriv:
+            self._sync_derived()
+
+    def _sync_derived(self) -> t.Dict[str, int]:
+        """
+        Synchronize the derived columns of the main table with the registry (DERIVED_COLUMNS).
+
+        Missing derived columns and the dirty flag column (DERIV_DIRTY_COL) are created. Each
+        derived column gets a stable bit of the dirty flags (stored in the table deriv_cols).
+        All rows of new columns and of columns with changed inputs are marked as dirty. Finally,
+        the triggers that mark the rows on insertions and on changes of the inputs are
+        (re-)created.
+
+        Returns
+        -------
+        deriv_bits : dict
+            Dictionary with the derived column names as keys and their dirty bits as values.
+
+        Raises
+        ------
+        ValueError
+            If more than 63 derived columns are registered (the flags are an SQLite integer).
+        """
+        # Create the derived columns, the dirty flag column and the bit assignments
+        for col_name, col_type in self._deriv_cols:
+            self._create_col("main", col_name, col_type)
+        self._create_col("main", DERIV_DIRTY_COL, "INTEGER")
+        self.cur.execute(
+            "CREATE TABLE IF NOT EXISTS deriv_cols(ColName TEXT PRIMARY KEY, Bit INTEGER, "
+            "Inputs TEXT)"
+        )
+
+        # Assign the bits. Columns that are new or have new inputs are marked as dirty
+        deriv_meta = {
+            col_name: (col_bit, inputs)
+            for col_name, col_bit, inputs in self.cur.execute(
+                "SELECT ColName, Bit, Inputs FROM deriv_cols"
+            )
+        }
+        deriv_bits = {}
+        for col_name, _ in self._deriv_cols:
+            inputs = json.dumps(DERIVED_COLUMNS[col_name].inputs)
+            if col_name in deriv_meta:
+                col_bit = deriv_meta[col_name][0]
+            else:
+                col_bit = min(
+                    set(range(63)) - {col_bit for col_bit, _ in deriv_meta.values()}, default=None
+                )
+                if col_bit is None:
+                    raise ValueError("At most 63 derived columns are supported")
+            if deriv_meta.get(col_name) != (col_bit, inputs):
+                self.cur.execute(
+                    f"UPDATE main SET {DERIV_DIRTY_COL} = IFNULL({DERIV_DIRTY_COL}, 0) | ?",
+                    (1 << col_bit,),
+                )
+                self.cur.execute(
+                    "INSERT OR REPLACE INTO deriv_cols VALUES (?, ?, ?)",
+                    (col_name, col_bit, inputs),
+                )
+                deriv_meta[col_name] = (col_bit, inputs)
+            deriv_bits[col_name] = 1 << col_bit
+        self.con.commit()
+
+        # (Re-)create the dirty tracking triggers
+        self._drop_dirty_triggers()
+        self._create_dirty_triggers(deriv_bits)
+
+        return deriv_bits
+
+    def _drop_dirty_triggers(self) -> None:
+        """Drop the triggers of the dirty tracking of the derived columns."""
+        trigger_names = [
+            trigger_name
+            for (trigger_name,) in self.cur.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+                (DERIV_DIRTY_TRIGGER + "%",),
+            ).fetchall()
+        ]
+        for trigger_name in trigger_names:
+            self.cur.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+        self.con.commit()
+
+    def _create_dirty_triggers(self, deriv_bits: t.Dict[str, int]) -> None:
+        """
+        Create the triggers of the dirty tracking of the derived columns.
+
+        An update trigger per raw input column marks the derived columns that depend on it
+        (transitively), if the value changes. The insert trigger marks the derived columns that
+        are NULL in a new row.
+
+        Parameters
+        ----------
+        deriv_bits : dict
+            Dictionary with the derived column names as keys and their dirty bits as values.
+        """
+        # Get the dirty bits per raw input column
+        raw_bits: t.Dict[str, int] = collections.defaultdict(int)
+        for col_name, col_bit in deriv_bits.items():
+            for input_col in _deriv_inputs_closure([col_name], DERIVED_COLUMNS):
+                if input_col not in DERIVED_COLUMNS:
+                    raw_bits[input_col] |= col_bit
+
+        # Create the update triggers
+        for input_col, col_bits in raw_bits.items():
+            self.cur.execute(
+                f"CREATE TRIGGER {DERIV_DIRTY_TRIGGER}{input_col} AFTER UPDATE OF {input_col} "
+                f"ON main WHEN old.{input_col} IS NOT new.{input_col} BEGIN "
+                f"UPDATE main SET {DERIV_DIRTY_COL} = IFNULL({DERIV_DIRTY_COL}, 0) | {col_bits} "
+                "WHERE rowid = new.rowid; END"
+            )
+
+        # Create the insert trigger
+        if deriv_bits:
+            null_bits = " | ".join(
+                f"(CASE WHEN new.{col_name} IS NULL THEN {col_bit} ELSE 0 END)"
+                for col_name, col_bit in deriv_bits.items()
+            )
+            null_cond = " OR ".join(f"new.{col_name} IS NULL" for col_name in deriv_bits)
+            self.cur.execute(
+                f"CREATE TRIGGER {DERIV_DIRTY_TRIGGER}insert AFTER INSERT ON main "
+                f"WHEN {null_cond} BEGIN "
+                f"UPDATE main SET {DERIV_DIRTY_COL} = IFNULL({DERIV_DIRTY_COL}, 0) | {null_bits} "
+                "WHERE rowid = new.rowid; END"
+            )
+        self.con.commit()
+
+    def _drop_indexes(self) -> None:
+        """
+        Drop the secondary indexes and the R*Tree index of the main table.
+
+        The triggers of the R*Tree and of the dirty tracking of the derived columns are dropped,
+        too (see _create_indexes).
+        """
+        for col_name in self._index_cols:
+            self.cur.execute(f"DROP INDEX IF EXISTS idx_main_{col_name}")
+        for trigger in ["insert", "update", "delete"]:
+            self.cur.execute(f"DROP TRIGGER IF EXISTS trg_main_rtree_{trigger}")
+        self.cur.execute("DROP TABLE IF EXISTS main_rtree")
+        self.con.commit()
+        self._drop_dirty_triggers()
+
+    def _create_indexes(self) -> None:
+        """
+        Create the secondary indexes of the main table (if they do not exist).
+
+        Only indexes of already existing columns are created; thus, the method is called after
+        each build step.
+        """
+        table_cols = self._table_cols()
+        for col_name in self._index_cols:
+            if col_name in table_cols:
+                self.cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_main_{col_name} ON main({col_name})"
+                )
+        self.con.commit()
+
+        # Create the R*Tree index, once all its columns exist
+        if set(RTREE_COLUMNS) <= set(table_cols):
+            self._create_rtree()
+
+        # Re-create the dirty tracking of the derived columns, if the main table has derived
+        # columns
+        if DERIV_DIRTY_COL in table_cols:
+            self._sync_derived()
+
+    def _create_rtree(self) -> None:
+        """
+        Create the R*Tree index of the main table (if it does not exist).
+
+        The R*Tree virtual table main_rtree stores each row (with the rowid of the main table as
+        id) as a point in the space of RTREE_COLUMNS. A new index is filled with a single scan
+        of the main table; afterwards, it is maintained by triggers on inserts, updates and
+        deletions of the main table.
+        """
+        if self.cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'main_rtree'").fetchone():
+            return
+
+        # Set the coordinates (minimum and maximum per column) of a row
+        def _coords(prefix: str) -> str:
+            return ", ".join(
+                f"IFNULL({prefix}{col_name}, -{RTREE_UNBOUNDED}), "
+                f"IFNULL({prefix}{col_name}, {RTREE_UNBOUNDED})"
+                for col_name in RTREE_COLUMNS
+            )
+
+        # Set the coordinate assignments of an updated row
+        coord_updates = ", ".join(
+            f"min_{col_name} = IFNULL(new.{col_name}, -{RTREE_UNBOUNDED}), "
+            f"max_{col_name} = IFNULL(new.{col_name}, {RTREE_UNBOUNDED})"
+            for col_name in RTREE_COLUMNS
+        )
+
+        # Create and fill the R*Tree
+        rtree_cols = ", ".join(f"min_{col}, max_{col}" for col in RTREE_COLUMNS)
+        self.cur.execute(f"CREATE VIRTUAL TABLE main_rtree USING rtree(id, {rtree_cols})")
+        self.cur.execute(f"INSERT INTO main_rtree SELECT rowid, {_coords('')} FROM main")
+
+        # Create the triggers that keep the R*Tree in sync with the main table
+        self.cur.execute(
+            "CREATE TRIGGER trg_main_rtree_insert AFTER INSERT ON main BEGIN "
+            f"INSERT INTO main_rtree VALUES (new.rowid, {_coords('new.')}); END"
+        )
+        self.cur.execute(
+            f"CREATE TRIGGER trg_main_rtree_update AFTER UPDATE OF {', '.join(RTREE_COLUMNS)} "
+            "ON main BEGIN "
+            f"UPDATE main_rtree SET {coord_updates} WHERE id = new.rowid; END"
+        )
+        self.cur.execute(
+            "CREATE TRIGGER trg_main_rtree_delete AFTER DELETE ON main BEGIN "
+            "DELETE FROM main_rtree WHERE id = old.rowid; END"
+        )
+        self.con.commit()
+
+    def _table_cols(self) -> t.Dict[str, str]:
+        """
+        Get the columns of the main table.
+
+        Returns
+        -------
+        table_cols : dict
+            Dictionary with the column names as keys and the (upper case) SQLite column types as
+            values. The dictionary is empty, if the main table does not exist.
+        """
+        table_cols = _table_cols(self.cur)
+
+        return table_cols
+
+    def select(
+        self,
+        columns: t.Optional[t.Sequence[str]] = None,
+        where: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> t.Dict[str, np.ndarray]:
+        """
+        Query the main table and return the result as NumPy columns.
+
+        The column projection and the predicates are passed to SQLite; thus, the secondary
+        indexes (NEOClass, AbsMag_, Perihel_AU, Aphel_AU and SemMajAxis_AU) are used to filter the
+        rows. Box queries (range predicates on at least two of SemMajAxis_AU, Ecc_, Incl_deg,
+        Perihel_AU and Aphel_AU) are pre-filtered by the R*Tree index of the orbital elements.
+
+        Parameters
+        ----------
+        columns : sequence, optional
+            Names of the columns that shall be returned. If None, all columns are returned. The
+            default is None.
+        where : dict, optional
+            Predicates that are combined with AND. The keys are column names; the values can be:
+
+            - a tuple (lower, upper): range predicate lower <= column < upper. None denotes an
+              open bound.
+            - a list or set: the column value must be one of the given values.
+            - None: the column value must be NULL.
+            - any other value: the column value must be equal to the given value.
+
+            If None, all rows are returned. The default is None.
+
+        Returns
+        -------
+        query_columns : dict
+            Dictionary with the column names as keys and the NumPy arrays of the results as
+            values. FLOAT columns are returned as float64 (NULL as NaN), INTEGER columns as int64
+            (or float64, if they contain NULL values) and TEXT columns as unicode strings.
+
+        Examples
+        --------
+        Get the semi-major axis and absolute magnitude of all Atens with an absolute magnitude
+        below 22
+
+        >>> import SolarY
+        >>> neo_sqlite = SolarY.neo.data.NEOdysDatabase()  # doctest: +SKIP
+        >>> atens = neo_sqlite.select(  # doctest: +SKIP
+        ...     columns=["Name", "SemMajAxis_AU", "AbsMag_"],
+        ...     where={"NEOClass": "Aten", "AbsMag_": (None, 22.0)},
+        ... )
+        """
+        query_columns = _select_columns(self.cur, columns=columns, where=where)
+
+        return query_columns
+
+    def catalog(
+        self,
+        columns: t.Optional[t.Sequence[str]] = None,
+        where: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> catalog.NEOCatalog:
+        """
+        Get a catalog of the NEOs whose columns are queried lazily on their first access.
+
+        Parameters
+        ----------
+        columns : sequence, optional
+            Names of the columns of the catalog. If None, all columns are taken. The default is
+            None.
+        where : dict, optional
+            Predicates of the NEOs of the catalog (see select). If None, all NEOs are taken. The
+            default is None.
+
+        Returns
+        -------
+        neo_catalog : SolarY.neo.catalog.NEOCatalog
+            Catalog of the NEOs. The columns are sorted by the rowid of the main table.
+
+        Raises
+        ------
+        ValueError
+            If a column is unknown, or (on the first access of a column) if the database has been
+            changed by this instance or its snapshot has been refreshed since the catalog was
+            created.
+
+        Notes
+        -----
+        The columns of the catalog must correspond to the same state of the database. Thus, a
+        catalog is invalidated by writes of this instance (e.g., update or update_derived) and by
+        refresh in the in-memory mode: columns that have already been accessed remain available,
+        but accessing a new column raises a ValueError. Create a new catalog afterwards.
+        """
+        # Check the columns and count the NEOs
+        table_cols = self._table_cols()
+        columns = list(columns or table_cols)
+        unknown_cols = set(columns) - set(table_cols)
+        if unknown_cols:
+            raise ValueError(f"Unknown column(s) of the main table: {sorted(unknown_cols)}")
+        nr_rows = _count_rows(self.cur, where=where)
+
+        # Identity of the database state: the connection (replaced by refresh) and its number of
+        # changes (incremented by writes)
+        catalog_con, catalog_changes = self.con, self.con.total_changes
+
+        # Query a column on its first access, if the database state has not changed
+        def _load_column(col_name: str) -> np.ndarray:
+            if self.con is not catalog_con or self.con.total_changes != catalog_changes:
+                raise ValueError(
+                    f"The column {col_name} cannot be loaded: the database has changed since the "
+                    "catalog was created; create a new catalog"
+                )
+            return _select_columns(self.cur, columns=[col_name], where=where, ordered=True)[
+                col_name
+            ]
+
+        neo_catalog = catalog.NEOCatalog(_load_column, columns, nr_rows)
+
+        return neo_catalog
+
+    def read_pool(self) -> ReadOnlyConnectionPool:
+        """
+        Get a thread-safe pool of read-only connections to the database.
+
+        The database is switched to the WAL journal mode; thus, the pool's readers are not
+        blocked by writes of this instance (e.g., an update).
+
+        Returns
+        -------
+        read_pool : ReadOnlyConnectionPool
+            Pool of read-only connections.
+
+        Raises
+        ------
+        ValueError
+            If the database is in the in-memory mode.
+        """
+        # The pool reads the database file; thus, it would not see the snapshot
+        if self.in_memory:
+            raise ValueError("A read pool is not available in the in-memory mode")
+
+        # Commit pending changes (the journal mode cannot be changed within a transaction) and set
+        # the WAL journal mode with the connection of this instance
+        self.con.commit()
+        self.cur.execute("PRAGMA journal_mode = WAL").fetchone()
+        read_pool = ReadOnlyConnectionPool(self.db_filename, wal=False)
+
+        return read_pool
+
+    def sampler(
+        self,
+        columns: t.Optional[t.Sequence[str]] = None,
+        where: t.Optional[t.Dict[str, t.Any]] = None,
+        abs_mag_bin_width: float = 0.25,
+    ) -> NEOSampler:
+        """
+        Get a sampler of the NEOs of the database.
+
+        The columns are queried once; the sampler draws NEOs without accessing the database.
+
+        Parameters
+        ----------
+        columns : sequence, optional
+            Names of the columns of the drawn NEOs. If None, all columns are taken. The columns
+            NEOClass and AbsMag_ are always included. The default is None.
+        where : dict, optional
+            Predicates of the NEOs of the sampler (see select). If None, all NEOs are taken. The
+            default is None.
+        abs_mag_bin_width : float, optional
+            Width of the absolute magnitude bins of the bucket index. The default is 0.25.
+
+        Returns
+        -------
+        neo_sampler : NEOSampler
+            Sampler of the NEOs.
+        """
+        # Query the columns, including the ones of the bucket index
+        if columns is not None:
+            columns = list(columns) + [
+                col_name for col_name in ["NEOClass", "AbsMag_"] if col_name not in columns
+            ]
+        neo_sampler = NEOSampler(
+            self.select(columns=columns, where=where), abs_mag_bin_width=abs_mag_bin_width
+        )
+
+        return neo_sampler
+
+    def histogram_cube(
+        self, edges: t.Optional[t.Dict[str, np.ndarray]] = None
+    ) -> population.PopulationCube:
+        """
+        Get the population histogram cube over (a, e, i, H, NEO class) of the database.
+
+        The cube is built once per database content and bin edges and stored in the cache
+        directory of the database (keyed by the SHA256 hash of the database file). Afterwards,
+        marginal and sliced counts are answered from the cube without accessing the NEO rows.
+
+        Parameters
+        ----------
+        edges : dict, optional
+            Bin edges of the numerical dimensions (see population.CUBE_DIMS). Missing dimensions
+            get the default edges (population.DEFAULT_CUBE_EDGES). The default is None.
+
+        Returns
+        -------
+        pop_cube : population.PopulationCube
+            Histogram cube of the NEOs.
+        """
+        # Set the bin edges and their hash
+        edges = {
+            dim: np.asarray(dim_edges, dtype=np.float64)
+            for dim, dim_edges in {**population.DEFAULT_CUBE_EDGES, **(edges or {})}.items()
+        }
+        edges_hash = hashlib.sha256(
+            json.dumps({dim: edges[dim].tolist() for dim in population.CUBE_DIMS}).encode()
+        ).hexdigest()
+
+        # Write pending changes into the database file. The hash of the file reflects its content
+        # only if the WAL checkpoint is complete (no concurrent readers); otherwise, the cube is
+        # built without caching
+        self.con.commit()
+        checkpoint_busy = self.cur.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+        if self.in_memory:
+            # The in-memory snapshot corresponds to the file, if neither the file nor the snapshot
+            # has changed and the file has no pending WAL content
+            checkpoint_busy = (
+                self._file_signature() != self._snapshot_signature
+                or self.con.total_changes != self._snapshot_changes
+                or (self._snapshot_signature[1] or (0,))[0] > 0
+            )
+        cache_root = _cache_root(self.db_filename)
+        cache_file = None
+        if not checkpoint_busy and Path(self.db_filename).is_file():
+            cache_dir = cache_root / _get_sha256(self.db_filename)
+            cache_file = cache_dir / CACHE_CUBE_FILE.format(edges_hash[:16])
+
+            # Load the cached cube
+            if cache_file.exists():
+                return population.PopulationCube.load(cache_file)
+
+        # Build the cube from a single scan of the NEOs
+        pop_cube = population.PopulationCube.from_columns(
+            self.select(columns=list(population.CUBE_DIMS) + ["NEOClass"]), edges=edges
+        )
+
+        # Store the cube. The file is written into a temporary file that is renamed afterwards;
+        # caches of outdated database contents are deleted
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f".tmp-{os.getpid()}-{cache_file.name}")
+            pop_cube.save(tmp_file)
+            os.replace(tmp_file, cache_file)
+            _remove_outdated_caches(cache_root, cache_file.parent)
+
+        return pop_cube
+
+    def export(
+        self,
+        format: str = "parquet",  # pylint: disable=redefined-builtin
+        path_filename: t.Optional[str] = None,
+        batch_size: int = 100000,
+    ) -> str:
+        """
+        Export the main table to a columnar Parquet or Arrow IPC file.
+
+        The rows are fetched and written in record batches of batch_size rows; thus, the memory
+        usage is bounded, independent of the database size. The columns are typed (float64,
+        int64 and string) and the NEO class is dictionary-encoded. The file can be read with
+        load_export. Requires the optional dependency pyarrow.
+
+        Parameters
+        ----------
+        format : str, optional
+            Export format: "parquet" or "arrow" (Arrow IPC file format). The default is "parquet".
+        path_filename : str, optional
+            Absolute file path of the exported file. If None, the file is stored next to the
+            database with the file ending of the format (.parquet / .arrow). The default is None.
+        batch_size : int, optional
+            Number of rows per record batch. The default is 100000.
+
+        Returns
+        -------
+        path_filename : str
+            Absolute file path of the exported file.
+
+        Raises
+        ------
+        ValueError
+            If the format is unknown or if batch_size is smaller than 1.
+        ImportError
+            If pyarrow is not installed.
+        """
+        # Check the input
+        if format not in EXPORT_SUFFIXES:
+            raise ValueError(f"Unknown export format: {format}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        pyarrow = _import_pyarrow()
+
+        # Set the file path and the schema
+        if path_filename is None:
+            path_filename = str(Path(self.db_filename).with_suffix(EXPORT_SUFFIXES[format]))
+        table_cols = self._table_cols()
+        schema = _arrow_schema(table_cols, pyarrow)
+
+        # The NEO class dictionary is shared by all record batches (required by the Arrow IPC file
+        # format)
+        neo_classes = []
+        if "NEOClass" in table_cols:
+            neo_classes = [
+                neo_class
+                for (neo_class,) in self.con.execute(
+                    "SELECT DISTINCT NEOClass FROM main WHERE NEOClass IS NOT NULL ORDER BY 1"
+                )
+            ]
+        class_dict = pyarrow.array(neo_classes, pyarrow.string())
+        class_idx = {neo_class: idx for idx, neo_class in enumerate(neo_classes)}
+
+        # Set the writer of the format
+        if format == "parquet":
+            writer = pyarrow.parquet.ParquetWriter(path_filename, schema)
+        else:
+            writer = pyarrow.ipc.new_file(path_filename, schema)
+
+        # Fetch the rows batch-wise and write them as record batches
+        export_cur = self.con.execute(f"SELECT {', '.join(table_cols)} FROM main ORDER BY rowid")
+        with writer:
+            for batch_rows in iter(lambda: export_cur.fetchmany(batch_size), []):
+                batch_arrays = []
+                for field, col_values in zip(schema, zip(*batch_rows)):
+                    if field.name == "NEOClass":
+                        batch_arrays.append(
+                            pyarrow.DictionaryArray.from_arrays(
+                                pyarrow.array(
+                                    [class_idx.get(neo_class) for neo_class in col_values],
+                                    pyarrow.int8(),
+                                ),
+                                class_dict,
+                            )
+                        )
+                    else:
+                        batch_arrays.append(pyarrow.array(col_values, field.type))
+                writer.write_batch(pyarrow.record_batch(batch_arrays, schema=schema))
+
+        return path_filename
+
+    @contextlib.contextmanager
+    def _build_pragmas(self) -> t.Iterator[None]:
+        """
+        Context manager that tunes the SQLite settings for a bulk build.
+
+        The journal and synchronous writes are disabled and a large page cache is set. The
+        original settings are restored afterwards. If the database is still empty, a larger page
+        size is set, too (SQLite ignores the page size for databases that contain tables).
+
+        Yields
+        ------
+        None.
+        """
+        # Store the current settings
+        orig_pragmas = {
+            pragma: self.cur.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in BULK_BUILD_PRAGMAS
+        }
+
+        # Set the bulk build settings
+        if self.cur.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0:
+            self.cur.execute(f"PRAGMA page_size = {BULK_BUILD_PAGE_SIZE}")
+        for pragma, value in BULK_BUILD_PRAGMAS.items():
+            self.cur.execute(f"PRAGMA {pragma} = {value}")
+
+        try:
+            yield
+        finally:
+            # Restore the original settings
+            for pragma, value in orig_pragmas.items():
+                self.cur.execute(f"PRAGMA {pragma} = {value}")
+
+    def _bulk_insert(
+        self, neo_columns: t.Dict[str, np.ndarray], chunk_size: int, key: bool = True
+    ) -> None:
+        """
+        Insert NEO data columns and their derived columns chunk-wise into the main table.
+
+        The derived columns are computed per chunk before the insertion; thus, no subsequent
+        UPDATE statements are required.
+
+        Parameters
+        ----------
+        neo_columns : dict
+            Dictionary that contains the raw columns of the main table.
+        chunk_size : int
+            Number of rows that are inserted per executemany call.
+        key : bool, optional
+            If False, the primary key column is not inserted (e.g., for auto-incremented IDs). The
+            default is True.
+        """
+        # Check the chunk size; zero or negative values would never insert any data
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        # Set the INSERT statement with all raw and derived columns. The inserted rows are not
+        # dirty
+        raw_col_names = [col_name for col_name, _ in self._raw_cols[(0 if key else 1):]]
+        col_names = raw_col_names + [col_name for col_name, _ in self._deriv_cols]
+        sql_insert = (
+            f"INSERT OR IGNORE INTO main({', '.join(col_names)}, {DERIV_DIRTY_COL}) "
+            f"VALUES ({', '.join('?' * len(col_names))}, 0)"
+        )
+
+        # Insert the data chunk-wise. Each chunk is converted to Python objects only right before
+        # its insertion
+        nr_rows = len(neo_columns[raw_col_names[0]])
+        for chunk_start in range(0, nr_rows, chunk_size):
+            neo_chunk = {
+                col_name: neo_columns[col_name][chunk_start:chunk_start + chunk_size]
+                for col_name in raw_col_names
+            }
+            neo_chunk.update(_compute_derived_columns(neo_chunk))
+            self.cur.executemany(
+                sql_insert, zip(*(neo_chunk[col_name].tolist() for col_name in col_names))
+            )
+        self.con.commit()
+
+    def _create_bulk(
+        self,
+        neo_columns: t.Dict[str, np.ndarray],
+        chunk_size: int,
+        metrics: solary_auxiliary.metrics.StageMetrics,
+    ) -> None:
+        """
+        Build the main table in the bulk build mode.
+
+        The SQLite settings are tuned for the build, the data are inserted chunk-wise together
+        with the derived columns, and the secondary indexes are created after loading.
+
+        Parameters
+        ----------
+        neo_columns : dict
+            Dictionary that contains the raw columns of the main table.
+        chunk_size : int
+            Number of rows that are inserted per executemany call.
+        metrics : SolarY.auxiliary.metrics.StageMetrics
+            Collector of the stage metrics.
+        """
+        with self._build_pragmas():
+            self._create_main_table(deriv=True)
+            self._drop_indexes()
+            with metrics.stage("insert", rows=len(next(iter(neo_columns.values())))):
+                self._bulk_insert(neo_columns, chunk_size, key=self._key_col in neo_columns)
+            with metrics.stage("index"):
+                self._create_indexes()
+
+    def _update_derived(
+        self,
+        columns: t.Optional[t.Sequence[str]],
+        chunk_size: int,
+        metrics: solary_auxiliary.metrics.StageMetrics,
+        stage: str,
+    ) -> t.Dict[str, int]:
+        """
+        Compute the derived columns of all dirty rows in a single scan of the main table.
+
+        Parameters
+        ----------
+        columns : sequence or None
+            Names of the derived columns that shall be computed. Their derived inputs are
+            computed, too. If None, all derived columns are computed.
+        chunk_size : int
+            Number of rows that are fetched and updated at once.
+        metrics : SolarY.auxiliary.metrics.StageMetrics
+            Collector of the stage metrics.
+        stage : str
+            Name of the stage.
+
+        Returns
+        -------
+        deriv_counts : dict
+            Dictionary with the computed derived column names as keys and the number of
+            recomputed rows as values.
+
+        Raises
+        ------
+        ValueError
+            If a column is not a derived column of the database or chunk_size is not positive.
+        """
+        # Check the input
+        deriv_types = dict(self._deriv_cols)
+        if columns is None:
+            columns = list(deriv_types)
+        unknown_cols = set(columns) - set(deriv_types)
+        if unknown_cols:
+            raise ValueError(f"Unknown derived column(s): {sorted(unknown_cols)}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        # Synchronize the derived columns and set the computed columns (including their derived
+        # inputs) in dependency order
+        deriv_bits = self._sync_derived()
+        compute_closure = _deriv_inputs_closure(columns, DERIVED_COLUMNS)
+        compute_cols = [col_name for col_name in deriv_types if col_name in compute_closure]
+        compute_mask = sum(deriv_bits[col_name] for col_name in compute_cols)
+        col_types = {**dict(self._raw_cols), **deriv_types}
+        fetch_cols = list(
+            dict.fromkeys(
+                [
+                    input_col
+                    for col_name in compute_cols
+                    for input_col in DERIVED_COLUMNS[col_name].inputs
+                ]
+                + compute_cols
+            )
+        )
+
+        # Set the dirty bits of the derived inputs of each derived column
+        input_bits = {
+            col_name: sum(
+                deriv_bits.get(input_col, 0) for input_col in DERIVED_COLUMNS[col_name].inputs
+            )
+            for col_name in deriv_bits
+        }
+
+        # Set the SQL statements of the scan (keyset pagination of the dirty rows) and the update
+        sql_fetch = (
+            f"SELECT rowid, IFNULL({DERIV_DIRTY_COL}, 0), {', '.join(fetch_cols)} FROM main "
+            f"WHERE rowid > ? AND (IFNULL({DERIV_DIRTY_COL}, 0) & ?) != 0 ORDER BY rowid LIMIT ?"
+        )
+        sql_update = (
+            f"UPDATE main SET {', '.join(f'{col_name} = ?' for col_name in compute_cols)}, "
+            f"{DERIV_DIRTY_COL} = ? WHERE rowid = ?"
+        )
+
+        deriv_counts = {col_name: 0 for col_name in compute_cols}
+        with metrics.stage(stage) as stage_record:
+            stage_record["rows"] = 0
+            last_rowid = 0
+            while True:
+                neo_rows = self.cur.execute(
+                    sql_fetch, (last_rowid, compute_mask, chunk_size)
+                ).fetchall()
+                if not neo_rows:
+                    break
+                last_rowid = neo_rows[-1][0]
+                stage_record["rows"] += len(neo_rows)
+
+                # Convert the chunk into arrays. The stored values of the computed columns are kept
+                # as they are (e.g., NULL) for the rows that are not recomputed
+                chunk_rowids, chunk_flags, *chunk_values = zip(*neo_rows)
+                row_ids = np.array(chunk_rowids, dtype=np.int64)
+                row_flags = np.array(chunk_flags, dtype=np.int64)
+                chunk_cols = {
+                    col_name: _to_array(col_values, col_types[col_name])
+                    for col_name, col_values in zip(fetch_cols, chunk_values)
+                }
+                store_cols = {
+                    col_name: np.array(col_values, dtype=object)
+                    for col_name, col_values in zip(fetch_cols, chunk_values)
+                    if col_name in compute_cols
+                }
+
+                # Propagate the dirty flags to the dependent derived columns (in dependency order)
+                for col_name, col_bit in deriv_bits.items():
+                    row_flags[(row_flags & input_bits[col_name]) != 0] |= col_bit
+
+                # Compute the derived columns of the dirty rows in dependency order
+                for col_name in compute_cols:
+                    dirty_mask = (row_flags & deriv_bits[col_name]) != 0
+                    if not dirty_mask.any():
+                        continue
+                    deriv_col = DERIVED_COLUMNS[col_name]
+                    deriv_values = np.asarray(
+                        deriv_col.func(
+                            *(chunk_cols[input_col][dirty_mask] for input_col in deriv_col.inputs)
+                        )
+                    )
+                    col_values = chunk_cols[col_name].astype(
+                        np.result_type(chunk_cols[col_name], deriv_values)
+                    )
+                    col_values[dirty_mask] = deriv_values
+                    chunk_cols[col_name] = col_values
+                    store_cols[col_name][dirty_mask] = deriv_values.tolist()
+                    deriv_counts[col_name] += int(dirty_mask.sum())
+
+                # Store the derived columns and clear the dirty flags of the computed columns
+                self.cur.executemany(
+                    sql_update,
+                    zip(
+                        *(store_cols[col_name].tolist() for col_name in compute_cols),
+                        (row_flags & ~compute_mask).tolist(),
+                        row_ids.tolist(),
+                    ),
+                )
+                self.con.commit()
+
+        return deriv_counts
+
+    def update_derived(
+        self,
+        columns: t.Optional[t.Sequence[str]] = None,
+        chunk_size: int = 100000,
+        metrics: t.Optional[solary_auxiliary.metrics.StageMetrics] = None,
+    ) -> t.Dict[str, int]:
+        """
+        Compute the derived columns (see DERIVED_COLUMNS) of all rows with changed inputs.
+
+        The derived columns are computed in dependency order in a single scan of the main table.
+        A column is recomputed only for rows whose inputs changed since the last computation:
+        triggers mark the rows on insertions and on changes of the input columns. Newly registered
+        columns (see register_derived_column) are created and computed for all rows.
+
+        Parameters
+        ----------
+        columns : sequence, optional
+            Names of the derived columns that shall be computed. Their derived inputs are
+            computed, too. If None, all derived columns are computed. The default is None.
+        chunk_size : int, optional
+            Number of rows that are fetched and updated at once. The default is 100000.
+        metrics : SolarY.auxiliary.metrics.StageMetrics, optional
+            Collector of the stage metrics (wall time, rows, rows per second and peak memory) of
+            the stages "derived" and "index". If None, a new collector is used. The default is
+            None.
+
+        Returns
+        -------
+        deriv_counts : dict
+            Dictionary with the computed derived column names as keys and the number of
+            recomputed rows as values.
+
+        Examples
+        --------
+        Add the ratio of the perihelion and the semi-major axis to the NEODyS database
+
+        >>> import SolarY
+        >>> SolarY.neo.data.register_derived_column(
+        ...     "PerihelRatio_", "FLOAT", ("Perihel_AU", "SemMajAxis_AU"), lambda q, a: q / a
+        ... )  # doctest: +SKIP
+        >>> neo_sqlite = SolarY.neo.data.NEOdysDatabase()  # doctest: +SKIP
+        >>> deriv_counts = neo_sqlite.update_derived()  # doctest: +SKIP
+        """
+        # Set the collector of the stage metrics
+        if metrics is None:
+            metrics = solary_auxiliary.metrics.StageMetrics()
+
+        # Compute the derived columns and create the secondary indexes of new columns
+        self._create_main_table(deriv=True)
+        deriv_counts = self._update_derived(columns, chunk_size, metrics, stage="derived")
+        with metrics.stage("index"):
+            self._create_indexes()
+
+        return deriv_counts
+
+    def create_deriv_orb(
+        self, metrics: t.Optional[solary_auxiliary.metrics.StageMetrics] = None
+    ) -> t.Dict[str, t.Any]:
+        """
+        Compute and insert derived orbital elements (aphelion and perihelion) into the database.
+
+        Only rows with changed inputs are computed (see update_derived).
+
+        Parameters
+        ----------
+        metrics : SolarY.auxiliary.metrics.StageMetrics, optional
+            Collector of the stage metrics (wall time, rows, rows per second and peak memory).
+            If None, a new collector is used. The default is None.
+
+        Returns
+        -------
+        build_report : dict
+            Report of all stages recorded by the metrics collector (see
+            SolarY.auxiliary.metrics.StageMetrics.report).
+        """
+        # Set the collector of the stage metrics
+        if metrics is None:
+            metrics = solary_auxiliary.metrics.StageMetrics()
+
+        # Compute and store the derived orbital elements
+        self._create_main_table(deriv=True)
+        self._update_derived(["Aphel_AU", "Perihel_AU"], 100000, metrics, stage="deriv_orb")
+
+        # Create the secondary indexes of the new columns
+        with metrics.stage("index"):
+            self._create_indexes()
+
+        return metrics.report()
+
+    def create_neo_class(
+        self, metrics: t.Optional[solary_auxiliary.metrics.StageMetrics] = None
+    ) -> t.Dict[str, t.Any]:
+        """
+        Compute and insert the NEO classification into the database.
+
+        Only rows with changed inputs are computed (see update_derived).
+
+        Parameters
+        ----------
+        metrics : SolarY.auxiliary.metrics.StageMetrics, optional
+            Collector of the stage metrics (wall time, rows, rows per second and peak memory).
+            If None, a new collector is used. The default is None.
+
+        Returns
+        -------
+        build_report : dict
+            Report of all stages recorded by the metrics collector (see
+            SolarY.auxiliary.metrics.StageMetrics.report).
+        """
+        # Set the collector of the stage metrics
+        if metrics is None:
+            metrics = solary_auxiliary.metrics.StageMetrics()
+
+        # Compute and store the NEO class
+        self._create_main_table(deriv=True)
+        self._update_derived(["NEOClass"], 100000, metrics, stage="neo_class")
+
+        # Create the secondary indexes of the new columns
+        with metrics.stage("index"):
+            self._create_indexes()
+
+        return metrics.report()
+
+    def close(self) -> None:
+        """Close the SQLite database."""
+        self.con.close()
 
 
-class NEOdysDatabase:
+class NEOdysDatabase(_NEODatabase):
     """Class to create, update and read an SQLite based database.
 
     Class to create, update and read an SQLite based database that contains NEO data (raw and
@@ -171,17 +3072,37 @@ class NEOdysDatabase:
         Connection to the SQLite NEODyS database
     cur: sqlite3.Cursor
         Cursor to the SQLite NEODyS database
+    in_memory : bool
+        If True, the queries are served from an in-memory snapshot of the database file
 
     Methods
     -------
-    __init__(new=False)
+    __init__(new=False, db_filename=None, in_memory=False)
         Init function at the class call. Allows one to re-create a new SQLite database from
-        scratch.
-    create()
+        scratch or to load it into memory.
+    create(path_filename=None, bulk=False, chunk_size=100000, metrics=None)
         Create the main table of the SQLite NEODyS database (contains only the raw input data, no
-        derived parameters).
-    create_deriv_orb()
+        derived parameters). In the bulk build mode, the derived parameters are inserted, too.
+    create_deriv_orb(metrics=None)
         Compute derived orbital elements from the raw input data.
+    create_neo_class(metrics=None)
+        Compute the NEO class from the (derived) orbital elements.
+    update_derived(columns=None, chunk_size=100000, metrics=None)
+        Compute the registered derived columns of all rows with changed inputs.
+    update_incremental(path_filename=None, metrics=None)
+        Upsert new and changed NEOs and mark removed ones.
+    update(path_filename=None, metrics=None)
+        Update the SQLite database.
+    catalog(columns=None, where=None)
+        Get a catalog of the NEOs with lazily queried columns.
+    sampler(columns=None, where=None, abs_mag_bin_width=0.25)
+        Get a sampler of the NEOs of the database.
+    histogram_cube(edges=None)
+        Get the population histogram cube over (a, e, i, H, NEO class).
+    export(format="parquet", path_filename=None, batch_size=100000)
+        Export the main table to a columnar Parquet or Arrow IPC file.
+    refresh(force=False)
+        Reload the in-memory snapshot, if the database file has changed.
     close()
         Close the SQLite database.
 
@@ -191,7 +3112,13 @@ class NEOdysDatabase:
     SolarY.neo.data.read_neodys
     """
 
-    def __init__(self, new: bool = False) -> None:
+    _raw_cols = (("Name", "TEXT"),) + tuple(
+        (col_name, "FLOAT") for col_name in NEODYS_COLUMNS[1:]
+    )
+
+    def __init__(
+        self, new: bool = False, db_filename: t.Optional[str] = None, in_memory: bool = False
+    ) -> None:
         """
         Initialize the NEODySDatabase class.
 
@@ -204,188 +3131,269 @@ class NEOdysDatabase:
             If True: a new database will be created from scratch. WARNING: this will delete any
             previously built SQLite database with the name "neo_neodys.db" in the home directory.
             The default is False.
+        db_filename : str, optional
+            Absolute path to the SQLite database. If None, the path of the config file is taken.
+            The default is None.
+        in_memory : bool, optional
+            If True, the queries are served from an in-memory snapshot of the database (see
+            refresh). The default is False.
         """
         # Set / Get an SQLite database path + filename
-        self.db_filename = solary_auxiliary.parse.setnget_file_path(
-            PATH_CONFIG["neo"]["neodys_db_dir"], PATH_CONFIG["neo"]["neodys_db_file"]
-        )
-
-        # Delete any existing database, if requested
-        if new and os.path.exists(self.db_filename):
-            os.remove(self.db_filename)
-
-        # Connect / Build database and set a cursor
-        self.con = sqlite3.connect(self.db_filename)
-        self.cur = self.con.cursor()
-
-    def _create_col(self, table: str, col_name: str, col_type: str) -> None:
-        """
-        Private method to create new columns in tables.
-
-        Parameters
-        ----------
-        table : str
-            Table name, where a new column shall be added.
-        col_name : str
-            Column name.
-        col_type : str
-            SQLite column type (FLOAT, INT, TEXT, etc.).
-        """
-        # Generic f-string that represents an SQLite command to alter a table (adding a new column
-        # with its dtype).
-        sql_col_create = f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}"
+        if db_filename is None:
+            db_filename = solary_auxiliary.parse.setnget_file_path(
+                PATH_CONFIG["neo"]["neodys_db_dir"], PATH_CONFIG["neo"]["neodys_db_file"]
+            )
 
-        # Try to create a new column. If is exists an sqlite3.OperationalError weill raise. Pass
-        # this error.
-        # TODO: change the error passing
-        try:
-            self.cur.execute(sql_col_create)
-            self.con.commit()
-        except sqlite3.OperationalError:
-            pass
+        super().__init__(db_filename=db_filename, new=new, in_memory=in_memory)
 
-    def create(self) -> None:
+    def create(
+        self,
+        path_filename: t.Optional[str] = None,
+        bulk: bool = False,
+        chunk_size: int = 100000,
+        metrics: t.Optional[solary_auxiliary.metrics.StageMetrics] = None,
+    ) -> t.Dict[str, t.Any]:
         """
         Create the NEODyS main table.
 
         Method to create the NEODyS main table, read the downloaded content and fill the database
         with the raw data.
+
+        Parameters
+        ----------
+        path_filename : str, optional
+            Absolute file path of a NEODyS file. If None, the path of the config file is taken.
+            The default is None.
+        bulk : bool, optional
+            If True, the bulk build mode is used: the SQLite settings are tuned for the build, the
+            data are inserted in chunks together with the derived orbital elements and NEO class
+            (no separate UPDATE pass required), and the secondary indexes are created after
+            loading. The default is False.
+        chunk_size : int, optional
+            Number of rows per insertion chunk in the bulk build mode. The default is 100000.
+        metrics : SolarY.auxiliary.metrics.StageMetrics, optional
+            Collector of the stage metrics (wall time, rows, rows per second and peak memory).
+            If None, a new collector is used. The default is None.
+
+        Returns
+        -------
+        build_report : dict
+            Report of all stages recorded by the metrics collector (see
+            SolarY.auxiliary.metrics.StageMetrics.report).
         """
+        # Set the collector of the stage metrics
+        if metrics is None:
+            metrics = solary_auxiliary.metrics.StageMetrics()
+
+        # Bulk build mode: parse the file column-wise and insert all columns at once
+        if bulk:
+            with metrics.stage("parse") as stage_record:
+                neo_columns = load_neodys_array(path_filename)
+                stage_record["rows"] = len(neo_columns["Name"])
+            self._create_bulk(neo_columns, chunk_size=chunk_size, metrics=metrics)
+            return metrics.report()
+
         # Create the main table
-        self.cur.execute(
-            "CREATE TABLE IF NOT EXISTS main(Name TEXT PRIMARY KEY, "
-            "Epoch_MJD FLOAT, "
-            "SemMajAxis_AU FLOAT, "
-            "Ecc_ FLOAT, "
-            "Incl_deg FLOAT, "
-            "LongAscNode_deg FLOAT, "
-            "ArgP_deg FLOAT, "
-            "MeanAnom_deg FLOAT, "
-            "AbsMag_ FLOAT, "
-            "SlopeParamG_ FLOAT)"
-        )
-        self.con.commit()
+        self._create_main_table()
+
+        # Stream the NEODyS raw data into the database. The generator is consumed directly by
+        # executemany; thus, the complete catalog is never held in memory (parsing and inserting
+        # are one stage). The counter counts the parsed rows (including the rows that are ignored
+        # by INSERT OR IGNORE); it is advanced only after a row has been yielded
+        with metrics.stage("parse_insert") as stage_record:
+            row_counter = itertools.count()
+            self.cur.executemany(
+                "INSERT OR IGNORE INTO main(Name, "
+                "Epoch_MJD, "
+                "SemMajAxis_AU, "
+                "Ecc_, "
+                "Incl_deg, "
+                "LongAscNode_deg, "
+                "ArgP_deg, "
+                "MeanAnom_deg, "
+                "AbsMag_, "
+                "SlopeParamG_) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (neo_row for neo_row, _ in zip(_iter_neodys_rows(path_filename), row_counter)),
+            )
+            self.con.commit()
+            stage_record["rows"] = next(row_counter)
 
-        # Read the NEODyS raw data
-        _neo_data = read_neodys()
-
-        # Insert the raw data into the database
-        self.cur.executemany(
-            "INSERT OR IGNORE INTO main(Name, "
-            "Epoch_MJD, "
-            "SemMajAxis_AU, "
-            "Ecc_, "
-            "Incl_deg, "
-            "LongAscNode_deg, "
-            "ArgP_deg, "
-            "MeanAnom_deg, "
-            "AbsMag_, "
-            "SlopeParamG_) "
-            "VALUES (:Name, "
-            ":Epoch_MJD, "
-            ":SemMajAxis_AU, "
-            ":Ecc_, "
-            ":Incl_deg, "
-            ":LongAscNode_deg, "
-            ":ArgP_deg, "
-            ":MeanAnom_deg, "
-            ":AbsMag_, "
-            ":SlopeParamG_)",
-            _neo_data,
-        )
-        self.con.commit()
+        # Create the secondary indexes of the new columns
+        with metrics.stage("index"):
+            self._create_indexes()
 
-    def create_deriv_orb(self) -> None:
-        """Compute and insert derived orbital elements into the SQLite database."""
-        # Add new columns in the main table
-        self._create_col("main", "Aphel_AU", "FLOAT")
-        self._create_col("main", "Perihel_AU", "FLOAT")
+        return metrics.report()
 
-        # Get orbital elements to compute the derived parameters
-        self.cur.execute("SELECT Name, SemMajAxis_AU, Ecc_ FROM main")
+    def update_incremental(
+        self,
+        path_filename: t.Optional[str] = None,
+        metrics: t.Optional[solary_auxiliary.metrics.StageMetrics] = None,
+    ) -> t.Dict[str, t.Any]:
+        """
+        Update the NEODyS database incrementally.
 
-        # Fetch the data
-        _neo_data = self.cur.fetchall()
+        The downloaded catalog is compared with the database by name and all raw columns. Only new
+        NEOs and NEOs with changed raw values (e.g., a new orbit solution at the common epoch of the
+        catalog) are upserted; the derived columns (see update_derived) are computed only for rows
+        with changed inputs. NEOs that are no longer listed in the catalog are kept, but marked in
+        the column "Removed" (1: removed, 0 or NULL: listed).
 
-        # Iterate throuh the results, compute the derived elements and put them in a list of
-        # dicitionaries
-        _neo_deriv_param_dict = []
-        for _neo_data_line_f in _neo_data:
-            _neo_deriv_param_dict.append(
-                {
-                    "Name": _neo_data_line_f[0],
-                    "Aphel_AU": solary_general.astrodyn.kep_apoapsis(
-                        sem_maj_axis=_neo_data_line_f[1], ecc=_neo_data_line_f[2]
-                    ),
-                    "Perihel_AU": solary_general.astrodyn.kep_periapsis(
-                        sem_maj_axis=_neo_data_line_f[1], ecc=_neo_data_line_f[2]
-                    ),
-                }
+        Parameters
+        ----------
+        path_filename : str, optional
+            Absolute file path of a NEODyS file. If None, the path of the config file is taken.
+            The default is None.
+        metrics : SolarY.auxiliary.metrics.StageMetrics, optional
+            Collector of the stage metrics (wall time, rows, rows per second and peak memory) of
+            the stages "parse", "diff", "upsert", "derived" and "index". If None, a new collector
+            is used. The default is None.
+
+        Returns
+        -------
+        update_report : dict
+            Report of all stages recorded by the metrics collector (see
+            SolarY.auxiliary.metrics.StageMetrics.report) with the additional key "changes": the
+            number of inserted, updated, removed and unchanged NEOs.
+        """
+        # Set the collector of the stage metrics
+        if metrics is None:
+            metrics = solary_auxiliary.metrics.StageMetrics()
+
+        # Create the main table with all derived columns and the removal flag (if not present)
+        self._create_main_table(deriv=True)
+        self._create_col("main", "Removed", "INTEGER")
+
+        # Read the catalog
+        with metrics.stage("parse") as stage_record:
+            neo_columns = load_neodys_array(path_filename)
+            stage_record["rows"] = len(neo_columns["Name"])
+
+        with metrics.stage("diff", rows=len(neo_columns["Name"])):
+            # Get the raw values and the removal flag of all NEOs in the database. NEODyS lists
+            # all orbits at a common epoch; thus, all raw columns are compared (not only the epoch)
+            db_neos = {
+                db_row[0]: (db_row[1:-1], db_row[-1])
+                for db_row in self.cur.execute(
+                    f"SELECT {', '.join(NEODYS_COLUMNS)}, IFNULL(Removed, 0) FROM main"
+                )
+            }
+
+            # Determine the new and changed NEOs. Re-appearing NEOs are treated as changed. NaN
+            # values are stored as NULL and are compared as None
+            change_report = {"inserted": 0, "updated": 0, "removed": 0, "unchanged": 0}
+            touched_idx = []
+            for neo_idx, (name, *neo_values) in enumerate(
+                zip(*(neo_columns[col_name].tolist() for col_name in NEODYS_COLUMNS))
+            ):
+                db_neo = db_neos.pop(name, None)
+                raw_values = tuple(None if value != value else value for value in neo_values)
+                if db_neo is None:
+                    change_report["inserted"] += 1
+                elif db_neo != (raw_values, 0):
+                    change_report["updated"] += 1
+                else:
+                    change_report["unchanged"] += 1
+                    continue
+                touched_idx.append(neo_idx)
+
+            # The remaining NEOs of the database are not listed in the catalog anymore
+            removed_names = [name for name, (_, removed) in db_neos.items() if not removed]
+            change_report["removed"] = len(removed_names)
+
+        with metrics.stage("upsert", rows=len(touched_idx) + len(removed_names)):
+            # Upsert the raw data of the new and changed NEOs. The triggers of the derived columns
+            # mark the rows with new inputs
+            touched_idx_arr = np.asarray(touched_idx, dtype=np.intp)
+            touched_columns = {
+                col_name: col_values[touched_idx_arr]
+                for col_name, col_values in neo_columns.items()
+            }
+            col_names = list(NEODYS_COLUMNS)
+            self.cur.executemany(
+                f"INSERT INTO main({', '.join(col_names)}, Removed) "
+                f"VALUES ({', '.join('?' * len(col_names))}, 0) "
+                "ON CONFLICT(Name) DO UPDATE SET "
+                + ", ".join(f"{col_name} = excluded.{col_name}" for col_name in col_names[1:])
+                + ", Removed = 0",
+                zip(*(touched_columns[col_name].tolist() for col_name in col_names)),
             )
 
-        # Insert the data into the main table
-        self.cur.executemany(
-            "UPDATE main SET Aphel_AU = :Aphel_AU, Perihel_AU = :Perihel_AU "
-            "WHERE Name = :Name",
-            _neo_deriv_param_dict,
-        )
-        self.con.commit()
+            # Mark the NEOs that are not listed anymore
+            self.cur.executemany(
+                "UPDATE main SET Removed = 1 WHERE Name = ?", ((name,) for name in removed_names)
+            )
+            self.con.commit()
 
-    def create_neo_class(self) -> None:
-        """Compute and insert the NEO classification into the database."""
-        # Add a new column in the main table
-        self._create_col(table="main", col_name="NEOClass", col_type="Text")
+        # Compute the derived columns of the marked rows
+        self._update_derived(None, 100000, metrics, stage="derived")
 
-        # Get the orbital elements to compute the NEO class
-        self.cur.execute("SELECT Name, SemMajAxis_AU, Perihel_AU, Aphel_AU FROM main")
+        # Create the secondary indexes (if not present); SQLite maintains them afterwards
+        with metrics.stage("index"):
+            self._create_indexes()
 
-        # Fetch the data
-        _neo_data = self.cur.fetchall()
+        update_report = {**metrics.report(), "changes": change_report}
 
-        # Iterate throuh the results, compute the NEO class and put in into the results
-        _neo_class_param_dict = []
-        for _neo_data_line_f in _neo_data:
-            _neo_class_param_dict.append(
-                {
-                    "Name": _neo_data_line_f[0],
-                    "NEOClass": astrodyn.neo_class(
-                        sem_maj_axis_au=_neo_data_line_f[1],
-                        peri_helio_au=_neo_data_line_f[2],
-                        ap_helio_au=_neo_data_line_f[3]
-                    )
-                }
-            )
+        return update_report
 
-        # Insert the data into the main table
-        self.cur.executemany(
-            "UPDATE main SET NEOClass = :NEOClass "
-            "WHERE Name = :Name",
-            _neo_class_param_dict,
-        )
-        self.con.commit()
+    def update(
+        self,
+        path_filename: t.Optional[str] = None,
+        metrics: t.Optional[solary_auxiliary.metrics.StageMetrics] = None,
+    ) -> t.Dict[str, t.Any]:
+        """
+        Update the NEODyS Database with all content.
 
-    def update(self) -> None:
-        """Update the NEODyS Database with all content."""
-        # Call the create functions that insert new data
-        self.create()
-        self.create_deriv_orb()
-        self.create_neo_class()
+        Parameters
+        ----------
+        path_filename : str, optional
+            Absolute file path of a NEODyS file. If None, the path of the config file is taken.
+            The default is None.
+        metrics : SolarY.auxiliary.metrics.StageMetrics, optional
+            Collector of the stage metrics (see update_incremental). If None, a new collector is
+            used. The default is None.
+
+        Returns
+        -------
+        update_report : dict
+            Report of all stages with the additional key "changes": the number of inserted,
+            updated, removed and unchanged NEOs (see update_incremental).
+
+        See Also
+        --------
+        SolarY.neo.data.NEOdysDatabase.update_incremental
+        """
+        # Upsert only the new and changed NEOs
+        update_report = self.update_incremental(path_filename, metrics=metrics)
 
-    def close(self) -> None:
-        """Close the SQLite NEODyS database."""
-        self.con.close()
+        return update_report
 
 
-def download_granvik2018() -> str:
+def download_granvik2018(unzip: bool = True) -> str:
     """
     Download the model data from Granvik et al. (2018) -1-.
 
     The data can be found in -2-.
 
+    The gzip file is downloaded with a conditional request; if it is unchanged, it is neither
+    downloaded nor unzipped again.
+
+    Parameters
+    ----------
+    unzip : bool, optional
+        If True, the gzip file is unzipped next to the downloaded file. Both files are kept on
+        disk, since the HTTP validators of the conditional request refer to the gzip file; thus,
+        the disk usage is the size of the compressed plus the unzipped file (earlier versions
+        deleted the gzip file after unzipping). If False, only the compressed file is kept on disk
+        (a previously unzipped file is deleted); the readers of this module parse the rows
+        directly from the gzip stream. Use False on data volumes with limited disk space. The
+        default is True.
+
     Returns
     -------
     sha256_hash : str
-        SHA256 hash of the downloaded file.
+        SHA256 hash of the downloaded file: the hash of the unzipped file if unzip is True, the
+        hash of the compressed file otherwise.
 
     References
     ----------
@@ -400,61 +3408,120 @@ def download_granvik2018() -> str:
         PATH_CONFIG["neo"]["granvik2018_raw_file"],
     )
 
-    # Set the downlaod URL
-    url_location = (
-        "https://www.mv.helsinki.fi/home/mgranvik/data/"
-        "Granvik+_2018_Icarus/Granvik+_2018_Icarus.dat.gz"
-    )
+    # Retrieve the data (download). The request is conditional, streamed to disk and resumable.
+    # The gzip file is kept, since its HTTP validators refer to it
+    dl_result = solary_auxiliary.download.download_file(GRANVIK2018_URL, download_filename)
 
-    # Retrieve the data (download)
-    response = requests.get(url_location)
+    # Get the file name (without the gzip ending)
     downl_file_path = Path(download_filename)
-    with downl_file_path.open(mode="wb+") as file_obj:
-        file_obj.write(response.content)
-
-    # downl_file_path, _ = urllib.request.urlretrieve(url=url_location, \
-    #                                                 filename=download_filename)
-
-    # Get the file name (without the gzip ending). Open the gzip file and move the .dat file out.
-    # unzip_file_path = downl_file_path[:-3]
     unzip_file_path = downl_file_path.with_suffix("")
+
+    # Keep only the compressed file. Its hash has been computed during the download
+    if not unzip:
+        if unzip_file_path.exists():
+            os.remove(unzip_file_path)
+        _write_sha256_manifest(download_filename, dl_result["sha256"])
+        return str(dl_result["sha256"])
+
+    # Open the gzip file and move the .dat file out, if the gzip file has changed (or has not been
+    # unzipped before)
+    if dl_result["status"] == "not_modified" and unzip_file_path.exists():
+        return _get_sha256(str(unzip_file_path))
     with gzip.open(downl_file_path, "r") as f_in, open(unzip_file_path, "wb") as f_out:
         shutil.copyfileobj(f_in, f_out)
 
-    # Delete the gzip file
-    os.remove(downl_file_path)
-
-    # Compute the SHA256 hash
+    # Compute the SHA256 hash and store it for the binary cache
     sha256_hash = solary_auxiliary.parse.comp_sha256(unzip_file_path)
+    _write_sha256_manifest(str(unzip_file_path), sha256_hash)
 
     return sha256_hash
 
 
-def read_granvik2018() -> t.List[t.Dict[str, t.Any]]:
+def _granvik2018_file_path(path_filename: t.Optional[str] = None) -> str:
+    """
+    Get the file path of the Granvik et al. (2018) model file.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a Granvik et al. (2018) model file (unzipped or gzip compressed).
+        If None, the path of the config file is taken: the unzipped file if it exists, the gzip
+        file otherwise. The default is None.
+
+    Returns
+    -------
+    path_filename : str
+        Absolute file path of the model file.
+    """
+    # Set the download path of the model file
+    if path_filename is None:
+        path_filename = solary_auxiliary.parse.setnget_file_path(
+            PATH_CONFIG["neo"]["granvik2018_raw_dir"],
+            PATH_CONFIG["neo"]["granvik2018_unzip_file"],
+        )
+
+        # Use the compressed file, if no unzipped file is present
+        if not os.path.exists(path_filename):
+            path_filename = solary_auxiliary.parse.setnget_file_path(
+                PATH_CONFIG["neo"]["granvik2018_raw_dir"],
+                PATH_CONFIG["neo"]["granvik2018_raw_file"],
+            )
+
+    return path_filename
+
+
+def _open_granvik2018(path_filename: str) -> t.TextIO:
+    """
+    Open a Granvik et al. (2018) model file in text mode.
+
+    Gzip compressed files (file ending .gz) are decompressed on the fly while reading.
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of the model file.
+
+    Returns
+    -------
+    f_temp : typing.TextIO
+        Text file object of the model file.
+    """
+    if path_filename.endswith(".gz"):
+        f_temp = gzip.open(path_filename, "rt")
+    else:
+        f_temp = open(path_filename)
+
+    return f_temp
+
+
+def read_granvik2018(path_filename: t.Optional[str] = None) -> t.List[t.Dict[str, t.Any]]:
     """
     Read the content of the downloaded orbital elements file.
 
     Read the content of the downloaded Granvik et al. (2018) NEO model data file and return a
     dictionary with its content.
 
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a Granvik et al. (2018) model file. Gzip compressed files (file
+        ending .gz) are parsed directly from the decompression stream. If None, the path of the
+        config file is taken (see download_granvik2018). The default is None.
+
     Returns
     -------
     neo_dict : list
         List of dictionaries that contains the NEO data from the downloaded model data.
-    """
-    # Set the download path of the model file
-    path_filename = solary_auxiliary.parse.setnget_file_path(
-        PATH_CONFIG["neo"]["granvik2018_raw_dir"],
-        PATH_CONFIG["neo"]["granvik2018_unzip_file"],
-    )
 
+    See Also
+    --------
+    SolarY.neo.data.load_granvik2018_catalog
+    """
     # Iterate through the downloaded file and write the content in a list of dictionaries. Each
     # dictionary contains an individual simulated NEO
     neo_dict = []
-    with open(path_filename) as f_temp:
-        neo_data = f_temp.readlines()
-
-        for neo_data_line_f in neo_data:
+    with _open_granvik2018(_granvik2018_file_path(path_filename)) as f_temp:
+        for neo_data_line_f in f_temp:
             neo_data_line = neo_data_line_f.split()
             neo_dict.append(
                 {
@@ -471,7 +3538,198 @@ def read_granvik2018() -> t.List[t.Dict[str, t.Any]]:
     return neo_dict
 
 
-class Granvik2018Database:
+def _granvik2018_loadtxt(
+    neo_data_source: t.Union[t.TextIO, t.Iterable[str]]
+) -> t.Dict[str, np.ndarray]:
+    """
+    Parse Granvik et al. (2018) model rows into contiguous NumPy columns.
+
+    Parameters
+    ----------
+    neo_data_source : typing.TextIO or iterable
+        Text file object or lines of a Granvik et al. (2018) model file.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of GRANVIK2018_COLUMNS as keys and the corresponding
+        contiguous float64 arrays as values.
+    """
+    # Parse the rows into a 2D array (rows x columns)
+    neo_data = np.loadtxt(
+        neo_data_source,
+        dtype=np.float64,
+        usecols=range(len(GRANVIK2018_COLUMNS)),
+        ndmin=2,
+    )
+
+    # Transpose the array into a C-contiguous block, so that each column is a contiguous view
+    neo_data = np.ascontiguousarray(neo_data.T)
+    neo_columns = dict(zip(GRANVIK2018_COLUMNS, neo_data))
+
+    return neo_columns
+
+
+def _parse_granvik2018_shard(file_range: t.Tuple[str, int, int]) -> t.Dict[str, np.ndarray]:
+    """
+    Parse a byte range of a Granvik et al. (2018) model file (worker function of the parser).
+
+    Parameters
+    ----------
+    file_range : tuple
+        File path, start (inclusive) and end (exclusive) byte offset.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of GRANVIK2018_COLUMNS as keys and the corresponding
+        contiguous float64 arrays as values.
+    """
+    neo_columns = _granvik2018_loadtxt(_read_file_range(file_range))
+
+    return neo_columns
+
+
+def iter_granvik2018_shards(
+    path_filename: t.Optional[str] = None,
+    workers: t.Optional[int] = None,
+    nr_shards: t.Optional[int] = None,
+) -> t.Iterator[t.Dict[str, np.ndarray]]:
+    """
+    Parse the Granvik et al. (2018) model file in parallel and yield the shards in original order.
+
+    The file is split into newline-aligned byte ranges that are parsed in a process pool. Gzip
+    compressed files cannot be split; they are parsed as a single shard.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a Granvik et al. (2018) model file. If None, the path of the config
+        file is taken (see download_granvik2018). The default is None.
+    workers : int, optional
+        Number of worker processes. If None, the number of CPUs is taken. The default is None.
+    nr_shards : int, optional
+        Number of shards. If None, four shards per worker are used. The default is None.
+
+    Yields
+    ------
+    neo_columns : dict
+        Dictionary with the column names of GRANVIK2018_COLUMNS as keys and the column arrays of a
+        shard as values.
+    """
+    # Set the file path. A gzip stream can only be parsed sequentially
+    path_filename = _granvik2018_file_path(path_filename)
+    if path_filename.endswith(".gz"):
+        with _open_granvik2018(path_filename) as f_temp:
+            yield _granvik2018_loadtxt(f_temp)
+        return
+
+    yield from _iter_file_shards(
+        path_filename, _parse_granvik2018_shard, workers=workers, nr_shards=nr_shards
+    )
+
+
+def _parse_granvik2018_array(path_filename: str, workers: int = 1) -> t.Dict[str, np.ndarray]:
+    """
+    Parse a Granvik et al. (2018) model file into contiguous NumPy columns.
+
+    Parameters
+    ----------
+    path_filename : str
+        Absolute file path of a Granvik et al. (2018) model file.
+    workers : int, optional
+        Number of worker processes. If larger than 1, the (uncompressed) file is parsed in shards
+        by a process pool. The default is 1.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of GRANVIK2018_COLUMNS as keys and the corresponding
+        contiguous float64 arrays as values.
+    """
+    # Parse the complete file at once or in parallel shards. Compressed files are parsed directly
+    # from the gzip stream
+    if workers > 1 and not path_filename.endswith(".gz"):
+        neo_columns = _concat_columns(
+            iter_granvik2018_shards(path_filename, workers=workers, nr_shards=workers),
+            GRANVIK2018_COLUMNS,
+        )
+    else:
+        with _open_granvik2018(path_filename) as f_temp:
+            neo_columns = _granvik2018_loadtxt(f_temp)
+
+    return neo_columns
+
+
+def load_granvik2018_array(
+    path_filename: t.Optional[str] = None, cache: bool = False, workers: int = 1
+) -> t.Dict[str, np.ndarray]:
+    """
+    Load the Granvik et al. (2018) model file into contiguous NumPy columns.
+
+    The file is parsed in bulk by NumPy's text parser. No Python object is created per NEO.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of a Granvik et al. (2018) model file. Gzip compressed files (file
+        ending .gz) are parsed directly from the decompression stream. If None, the path of the
+        config file is taken (see download_granvik2018). The default is None.
+    cache : bool, optional
+        If True, the parsed columns are stored as .npy files next to the raw file (keyed by its
+        SHA256 hash) and returned as read-only memory-mapped arrays. Subsequent calls (e.g., from
+        other processes) load the cache instead of parsing the file again. The default is False.
+    workers : int, optional
+        Number of worker processes. If larger than 1, the (uncompressed) file is split into
+        newline-aligned shards that are parsed in parallel (see iter_granvik2018_shards). The
+        default is 1.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of GRANVIK2018_COLUMNS as keys and the corresponding
+        contiguous float64 arrays as values.
+
+    See Also
+    --------
+    SolarY.neo.data.read_granvik2018
+    """
+    # Parse the file or use the binary cache
+    path_filename = _granvik2018_file_path(path_filename)
+    if cache:
+        neo_columns = _load_column_cache(
+            path_filename, functools.partial(_parse_granvik2018_array, workers=workers)
+        )
+    else:
+        neo_columns = _parse_granvik2018_array(path_filename, workers=workers)
+
+    return neo_columns
+
+
+def load_granvik2018_catalog(path_filename: t.Optional[str] = None) -> catalog.NEOCatalog:
+    """
+    Load the Granvik et al. (2018) model file as a catalog of memory-mapped columns.
+
+    The columns are taken from the binary cache (see load_granvik2018_array with cache=True); they
+    are read from disk only when they are accessed.
+
+    Parameters
+    ----------
+    path_filename : str, optional
+        Absolute file path of the Granvik et al. (2018) model file. If None, the path of the config
+        file is taken. The default is None.
+
+    Returns
+    -------
+    neo_catalog : SolarY.neo.catalog.NEOCatalog
+        Catalog of the NEOs.
+    """
+    neo_catalog = catalog.NEOCatalog.from_columns(load_granvik2018_array(path_filename, cache=True))
+
+    return neo_catalog
+
+
+class Granvik2018Database(_NEODatabase):
     """
     Class to create, update and read an SQLite based database.
 
@@ -486,17 +3744,34 @@ class Granvik2018Database:
         Connection to the SQLite Granvik et al. (2018) database
     cur: sqlite3.Cursor
         Cursor to the SQLite Granvik et al. (2018) database
+    in_memory : bool
+        If True, the queries are served from an in-memory snapshot of the database file
 
     Methods
     -------
-    __init__(new=False)
+    __init__(new=False, db_filename=None, in_memory=False)
         Init function at the class call. Allows one to re-create a new SQLite database from
-        scratch.
-    create()
+        scratch or to load it into memory.
+    create(path_filename=None, bulk=False, chunk_size=100000, metrics=None)
         Create the main table of the SQLite Granvik et al. (2018) database (contains only the raw
-        input data, no derived parameters).
-    create_deriv_orb()
+        input data, no derived parameters). In the bulk build mode, the derived parameters are
+        inserted, too.
+    create_deriv_orb(metrics=None)
         Compute derived orbital elements from the raw input data.
+    create_neo_class(metrics=None)
+        Compute the NEO class from the (derived) orbital elements.
+    update_derived(columns=None, chunk_size=100000, metrics=None)
+        Compute the registered derived columns of all rows with changed inputs.
+    catalog(columns=None, where=None)
+        Get a catalog of the NEOs with lazily queried columns.
+    sampler(columns=None, where=None, abs_mag_bin_width=0.25)
+        Get a sampler of the NEOs of the database.
+    histogram_cube(edges=None)
+        Get the population histogram cube over (a, e, i, H, NEO class).
+    export(format="parquet", path_filename=None, batch_size=100000)
+        Export the main table to a columnar Parquet or Arrow IPC file.
+    refresh(force=False)
+        Reload the in-memory snapshot, if the database file has changed.
     close()
         Close the SQLite database.
 
@@ -506,7 +3781,13 @@ class Granvik2018Database:
     SolarY.neo.data.read_granvik2018
     """
 
-    def __init__(self, new: bool = False):
+    _raw_cols = (("ID", "INTEGER"),) + tuple(
+        (col_name, "FLOAT") for col_name in GRANVIK2018_COLUMNS
+    )
+
+    def __init__(
+        self, new: bool = False, db_filename: t.Optional[str] = None, in_memory: bool = False
+    ) -> None:
         """
         Init. function of the Granvik2018Database class.
 
@@ -519,155 +3800,99 @@ class Granvik2018Database:
             If True: a new database will be created from scratch. WARNING: this will delete any
             previously built SQLite database with the name "neo_granvik2018.db" in the home
             directory. The default is False.
+        db_filename : str, optional
+            Absolute path to the SQLite database. If None, the path of the config file is taken.
+            The default is None.
+        in_memory : bool, optional
+            If True, the queries are served from an in-memory snapshot of the database (see
+            refresh). The default is False.
         """
         # Set the database path to the home directory
-        self.db_filename = solary_auxiliary.parse.setnget_file_path(
-            PATH_CONFIG["neo"]["granvik2018_db_dir"],
-            PATH_CONFIG["neo"]["granvik2018_db_file"],
-        )
+        if db_filename is None:
+            db_filename = solary_auxiliary.parse.setnget_file_path(
+                PATH_CONFIG["neo"]["granvik2018_db_dir"],
+                PATH_CONFIG["neo"]["granvik2018_db_file"],
+            )
 
-        # Delete any existing database, if requested
-        if new and os.path.exists(self.db_filename):
-            os.remove(self.db_filename)
+        super().__init__(db_filename=db_filename, new=new, in_memory=in_memory)
 
-        # Establish a connection and set a cursor to the database
-        self.con = sqlite3.connect(self.db_filename)
-        self.cur = self.con.cursor()
+    def create(
+        self,
+        path_filename: t.Optional[str] = None,
+        bulk: bool = False,
+        chunk_size: int = 100000,
+        metrics: t.Optional[solary_auxiliary.metrics.StageMetrics] = None,
+    ) -> t.Dict[str, t.Any]:
+        """Create the Granvik et al. (2018) main table.
 
-    def _create_col(self, table: str, col_name: str, col_type: str) -> None:
-        """
-        Private method to create new columns in tables.
+        Method to create the Granvik et al. (2018) main table, read the downloaded content and fill
+        the database with the raw data.
 
         Parameters
         ----------
-        table : str
-            Table name, where a new column shall be added.
-        col_name : str
-            Column name.
-        col_type : str
-            SQLite column type (FLOAT, INT, TEXT, etc.).
+        path_filename : str, optional
+            Absolute file path of a Granvik et al. (2018) model file. If None, the path of the
+            config file is taken. The default is None.
+        bulk : bool, optional
+            If True, the bulk build mode is used: the SQLite settings are tuned for the build, the
+            data are inserted in chunks together with the derived orbital elements and NEO class
+            (no separate UPDATE pass required), and the secondary indexes are created after
+            loading. The default is False.
+        chunk_size : int, optional
+            Number of rows per insertion chunk in the bulk build mode. The default is 100000.
+        metrics : SolarY.auxiliary.metrics.StageMetrics, optional
+            Collector of the stage metrics (wall time, rows, rows per second and peak memory).
+            If None, a new collector is used. The default is None.
+
+        Returns
+        -------
+        build_report : dict
+            Report of all stages recorded by the metrics collector (see
+            SolarY.auxiliary.metrics.StageMetrics.report).
         """
-        # Generic f-string that represents an SQLite command to alter a table (adding a new column
-        # with its dtype).
-        sql_col_create = f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}"
-
-        # Try to create a new column. If is exists an sqlite3.OperationalError weill raise. Pass
-        # this error.
-        # TODO: change the error passing and merge with the same method in NEODySDatabase
-        try:
-            self.cur.execute(sql_col_create)
-            self.con.commit()
-        except sqlite3.OperationalError:
-            pass
-
-    def create(self) -> None:
-        """Create the Granvik et al. (2018) main table.
+        # Set the collector of the stage metrics
+        if metrics is None:
+            metrics = solary_auxiliary.metrics.StageMetrics()
+
+        # Bulk build mode: parse the file column-wise and insert all columns at once
+        if bulk:
+            with metrics.stage("parse") as stage_record:
+                neo_columns = load_granvik2018_array(path_filename)
+                stage_record["rows"] = len(neo_columns["SemMajAxis_AU"])
+            self._create_bulk(neo_columns, chunk_size=chunk_size, metrics=metrics)
+            return metrics.report()
 
-        Method to create the Granvik et al. (2018) main table, read the downloaded content and fill
-        the database with the raw data.
-        """
         # Create main table for the raw data
-        self.cur.execute(
-            "CREATE TABLE IF NOT EXISTS main(ID INTEGER PRIMARY KEY, "
-            "SemMajAxis_AU FLOAT, "
-            "Ecc_ FLOAT, "
-            "Incl_deg FLOAT, "
-            "LongAscNode_deg FLOAT, "
-            "ArgP_deg FLOAT, "
-            "MeanAnom_deg FLOAT, "
-            "AbsMag_ FLOAT)"
-        )
-        self.con.commit()
+        self._create_main_table()
 
         # Read the Granvik et al. (2018) data
-        _neo_data = read_granvik2018()
+        with metrics.stage("parse") as stage_record:
+            _neo_data = read_granvik2018(path_filename)
+            stage_record["rows"] = len(_neo_data)
 
         # Insert the raw Granvik et al. (2018) data into the SQLite database
-        self.cur.executemany(
-            "INSERT OR IGNORE INTO main(SemMajAxis_AU, "
-            "Ecc_, "
-            "Incl_deg, "
-            "LongAscNode_deg, "
-            "ArgP_deg, "
-            "MeanAnom_deg, "
-            "AbsMag_) "
-            "VALUES (:SemMajAxis_AU, "
-            ":Ecc_, "
-            ":Incl_deg, "
-            ":LongAscNode_deg, "
-            ":ArgP_deg, "
-            ":MeanAnom_deg, "
-            ":AbsMag_)",
-            _neo_data,
-        )
-        self.con.commit()
-
-    def create_deriv_orb(self) -> None:
-        """Compute and insert derived orbital elements into the SQLite database."""
-        # Create new columns
-        self._create_col("main", "Aphel_AU", "FLOAT")
-        self._create_col("main", "Perihel_AU", "FLOAT")
-
-        # Get all relevant information from the database
-        self.cur.execute("SELECT ID, SemMajAxis_AU, Ecc_ FROM main")
-        _neo_data = self.cur.fetchall()
-
-        # Iterate through the results and compute the derived orbital parameters
-        _neo_deriv_param_dict = []
-        for _neo_data_line_f in _neo_data:
-            _neo_deriv_param_dict.append(
-                {
-                    "ID": _neo_data_line_f[0],
-                    "Aphel_AU": solary_general.astrodyn.kep_apoapsis(
-                        sem_maj_axis=_neo_data_line_f[1], ecc=_neo_data_line_f[2]
-                    ),
-                    "Perihel_AU": solary_general.astrodyn.kep_periapsis(
-                        sem_maj_axis=_neo_data_line_f[1], ecc=_neo_data_line_f[2]
-                    ),
-                }
-            )
-
-        # Insert the derived paramters into the database
-        self.cur.executemany(
-            "UPDATE main SET Aphel_AU = :Aphel_AU, Perihel_AU = :Perihel_AU "
-            "WHERE ID = :ID",
-            _neo_deriv_param_dict,
-        )
-        self.con.commit()
-
-    def create_neo_class(self) -> None:
-        """Compute and insert the NEO classification into the database."""
-        # Add a new column in the main table
-        self._create_col(table="main", col_name="NEOClass", col_type="Text")
-
-        # Get the orbital elements to compute the NEO class
-        self.cur.execute("SELECT ID, SemMajAxis_AU, Perihel_AU, Aphel_AU FROM main")
-
-        # Fetch the data
-        _neo_data = self.cur.fetchall()
-
-        # Iterate throuh the results, compute the NEO class and put in into the results
-        _neo_class_param_dict = []
-        for _neo_data_line_f in _neo_data:
-            _neo_class_param_dict.append(
-                {
-                    "ID": _neo_data_line_f[0],
-                    "NEOClass": astrodyn.neo_class(
-                        sem_maj_axis_au=_neo_data_line_f[1],
-                        peri_helio_au=_neo_data_line_f[2],
-                        ap_helio_au=_neo_data_line_f[3]
-                    )
-                }
+        with metrics.stage("insert", rows=len(_neo_data)):
+            self.cur.executemany(
+                "INSERT OR IGNORE INTO main(SemMajAxis_AU, "
+                "Ecc_, "
+                "Incl_deg, "
+                "LongAscNode_deg, "
+                "ArgP_deg, "
+                "MeanAnom_deg, "
+                "AbsMag_) "
+                "VALUES (:SemMajAxis_AU, "
+                ":Ecc_, "
+                ":Incl_deg, "
+                ":LongAscNode_deg, "
+                ":ArgP_deg, "
+                ":MeanAnom_deg, "
+                ":AbsMag_)",
+                _neo_data,
             )
+            self.con.commit()
 
-        # Insert the data into the main table
-        self.cur.executemany(
-            "UPDATE main SET NEOClass = :NEOClass "
-            "WHERE ID = :ID",
-            _neo_class_param_dict,
-        )
-        self.con.commit()
+        # Create the secondary indexes of the new columns
+        with metrics.stage("index"):
+            self._create_indexes()
 
-    def close(self) -> None:
-        """Close the Granvik et al. (2018) database."""
-        self.con.close()
+        return metrics.report()
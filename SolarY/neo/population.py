@@ -0,0 +1,272 @@
+"""Population statistics of NEO catalogs and models based on histogram cubes."""
+import typing as t
+from pathlib import Path
+
+import numpy as np
+
+# Numerical dimensions of the histogram cube (the NEO class is the last, categorical dimension)
+CUBE_DIMS = ("SemMajAxis_AU", "Ecc_", "Incl_deg", "AbsMag_")
+
+# Default bin edges of the numerical dimensions. They cover the parameter space of the Granvik et
+# al. (2018) model; values outside the edges are not counted
+DEFAULT_CUBE_EDGES = {
+    "SemMajAxis_AU": np.linspace(0.0, 4.4, 23),
+    "Ecc_": np.linspace(0.0, 1.0, 21),
+    "Incl_deg": np.linspace(0.0, 90.0, 19),
+    "AbsMag_": np.linspace(15.0, 25.0, 21),
+}
+
+# Tolerance of the alignment of query ranges with the bin edges
+EDGE_TOL = 1e-9
+
+
+class PopulationCube:
+    """
+    Multi-dimensional histogram of a NEO population over (a, e, i, H, NEO class).
+
+    The cube stores the number of NEOs per cell; statistics like marginal counts or class
+    fractions are computed from the cube instead of the individual NEOs.
+
+    Attributes
+    ----------
+    counts : numpy.ndarray
+        Number of NEOs per cell of the shape (a bins, e bins, i bins, H bins, classes).
+    edges : dict
+        Bin edges of the numerical dimensions (keys: CUBE_DIMS).
+    neo_classes : numpy.ndarray
+        NEO classes of the last dimension.
+
+    Methods
+    -------
+    from_columns(neo_columns, edges=None)
+        Build the cube from NEO data columns.
+    load(path_filename)
+        Load a cube from an .npz file.
+    save(path_filename)
+        Save the cube in an .npz file.
+    query(where=None, dims=None)
+        Get the (marginal) counts of a slice of the cube.
+    class_fractions(dim="AbsMag_", where=None)
+        Get the fractions of the NEO classes per bin of a dimension.
+
+    Examples
+    --------
+    Number of Atens per absolute magnitude bin with an inclination below 10 degrees
+
+    >>> import SolarY
+    >>> granvik2018_sqlite = SolarY.neo.data.Granvik2018Database()  # doctest: +SKIP
+    >>> pop_cube = granvik2018_sqlite.histogram_cube()  # doctest: +SKIP
+    >>> aten_counts = pop_cube.query(
+    ...     where={"NEOClass": "Aten", "Incl_deg": (None, 10.0)}, dims=["AbsMag_"]
+    ... )  # doctest: +SKIP
+    """
+
+    def __init__(
+        self, counts: np.ndarray, edges: t.Dict[str, np.ndarray], neo_classes: np.ndarray
+    ) -> None:
+        """
+        Init function of the PopulationCube class.
+
+        Parameters
+        ----------
+        counts : numpy.ndarray
+            Number of NEOs per cell of the shape (a bins, e bins, i bins, H bins, classes).
+        edges : dict
+            Bin edges of the numerical dimensions (keys: CUBE_DIMS).
+        neo_classes : numpy.ndarray
+            NEO classes of the last dimension.
+        """
+        self.counts = counts
+        self.edges = {dim: np.asarray(edges[dim], dtype=np.float64) for dim in CUBE_DIMS}
+        self.neo_classes = np.asarray(neo_classes).astype(np.str_)
+
+    @classmethod
+    def from_columns(
+        cls,
+        neo_columns: t.Dict[str, np.ndarray],
+        edges: t.Optional[t.Dict[str, np.ndarray]] = None,
+    ) -> "PopulationCube":
+        """
+        Build the cube from NEO data columns.
+
+        Parameters
+        ----------
+        neo_columns : dict
+            Data columns of the NEOs (keys: CUBE_DIMS and NEOClass). NEOs without a class (empty
+            string) are ignored.
+        edges : dict, optional
+            Bin edges of the numerical dimensions. Missing dimensions get the default edges
+            (DEFAULT_CUBE_EDGES). The default is None.
+
+        Returns
+        -------
+        pop_cube : PopulationCube
+            Histogram cube of the NEOs.
+        """
+        edges = {**DEFAULT_CUBE_EDGES, **(edges or {})}
+
+        # Count the NEOs per class and numerical cell
+        neo_class = np.asarray(neo_columns["NEOClass"]).astype(np.str_)
+        neo_classes = np.unique(neo_class[neo_class != ""])
+        samples = np.column_stack([neo_columns[dim] for dim in CUBE_DIMS])
+        bins = [np.asarray(edges[dim], dtype=np.float64) for dim in CUBE_DIMS]
+        counts = np.zeros([len(dim_edges) - 1 for dim_edges in bins] + [len(neo_classes)], np.int64)
+        for class_idx, class_name in enumerate(neo_classes):
+            counts[..., class_idx] = np.histogramdd(samples[neo_class == class_name], bins=bins)[0]
+        pop_cube = cls(counts, edges, neo_classes)
+
+        return pop_cube
+
+    @classmethod
+    def load(cls, path_filename: t.Union[str, Path]) -> "PopulationCube":
+        """
+        Load a cube from an .npz file (see save).
+
+        Parameters
+        ----------
+        path_filename : str or pathlib.Path
+            File path of the .npz file.
+
+        Returns
+        -------
+        pop_cube : PopulationCube
+            Histogram cube.
+        """
+        with np.load(path_filename) as cube_file:
+            pop_cube = cls(
+                cube_file["counts"],
+                {dim: cube_file[f"edges_{dim}"] for dim in CUBE_DIMS},
+                cube_file["neo_classes"],
+            )
+
+        return pop_cube
+
+    def save(self, path_filename: t.Union[str, Path]) -> None:
+        """
+        Save the cube in an .npz file.
+
+        Parameters
+        ----------
+        path_filename : str or pathlib.Path
+            File path of the .npz file.
+        """
+        cube_arrays: t.Dict[str, t.Any] = {
+            "counts": self.counts,
+            "neo_classes": self.neo_classes,
+            **{f"edges_{dim}": self.edges[dim] for dim in CUBE_DIMS},
+        }
+        with open(path_filename, "wb") as f_temp:
+            np.savez(f_temp, **cube_arrays)
+
+    def _bin_selection(self, dim: str, dim_range: t.Tuple[t.Optional[float], ...]) -> slice:
+        """
+        Get the bins of a numerical dimension within a range.
+
+        Parameters
+        ----------
+        dim : str
+            Numerical dimension.
+        dim_range : tuple
+            Range (lower, upper). None denotes an open bound.
+
+        Returns
+        -------
+        bin_slice : slice
+            Bins within the range.
+
+        Raises
+        ------
+        ValueError
+            If a bound is not aligned with the bin edges.
+        """
+        dim_edges = self.edges[dim]
+        bin_bounds = []
+        for bound, default in zip(dim_range, [0, len(dim_edges) - 1]):
+            if bound is None:
+                bin_bounds.append(default)
+                continue
+            edge_idx = int(np.argmin(np.abs(dim_edges - bound)))
+            if abs(dim_edges[edge_idx] - bound) > EDGE_TOL:
+                raise ValueError(f"The bound {bound} of {dim} is not a bin edge: {dim_edges}")
+            bin_bounds.append(edge_idx)
+
+        return slice(bin_bounds[0], bin_bounds[1])
+
+    def query(
+        self,
+        where: t.Optional[t.Dict[str, t.Any]] = None,
+        dims: t.Optional[t.Sequence[str]] = None,
+    ) -> np.ndarray:
+        """
+        Get the (marginal) counts of a slice of the cube.
+
+        Parameters
+        ----------
+        where : dict, optional
+            Slice of the cube. The keys are dimensions; the values can be:
+
+            - numerical dimensions: a tuple (lower, upper) of bin edges. None denotes an open
+              bound.
+            - NEOClass: a class name or a list of class names.
+
+            If None, the complete cube is taken. The default is None.
+        dims : sequence, optional
+            Dimensions that are kept (in the order of the cube); the counts are summed over all
+            other dimensions. If None, the total count is returned. The default is None.
+
+        Returns
+        -------
+        query_counts : numpy.ndarray
+            Counts of the kept dimensions (a 0-dimensional array for the total count).
+
+        Raises
+        ------
+        ValueError
+            If a dimension is unknown or if a range is not aligned with the bin edges.
+        """
+        where = where or {}
+        dims = list(dims or [])
+        all_dims = list(CUBE_DIMS) + ["NEOClass"]
+        unknown_dims = (set(where) | set(dims)) - set(all_dims)
+        if unknown_dims:
+            raise ValueError(f"Unknown dimension(s) of the cube: {sorted(unknown_dims)}")
+
+        # Slice the cube
+        cube_slice: t.List[t.Any] = [slice(None)] * len(all_dims)
+        for dim, dim_cond in where.items():
+            if dim == "NEOClass":
+                class_names = [dim_cond] if isinstance(dim_cond, str) else list(dim_cond)
+                cube_slice[-1] = np.flatnonzero(np.isin(self.neo_classes, class_names))
+            else:
+                cube_slice[all_dims.index(dim)] = self._bin_selection(dim, dim_cond)
+        query_counts = self.counts[tuple(cube_slice)]
+
+        # Sum over the remaining dimensions
+        sum_axes = tuple(axis for axis, dim in enumerate(all_dims) if dim not in dims)
+        query_counts = query_counts.sum(axis=sum_axes)
+
+        return query_counts
+
+    def class_fractions(
+        self, dim: str = "AbsMag_", where: t.Optional[t.Dict[str, t.Any]] = None
+    ) -> np.ndarray:
+        """
+        Get the fractions of the NEO classes per bin of a numerical dimension.
+
+        Parameters
+        ----------
+        dim : str, optional
+            Numerical dimension. The default is "AbsMag_".
+        where : dict, optional
+            Slice of the cube (see query). The default is None.
+
+        Returns
+        -------
+        fractions : numpy.ndarray
+            Fractions of the shape (bins, classes). Bins without NEOs are NaN.
+        """
+        bin_counts = self.query(where=where, dims=[dim, "NEOClass"]).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fractions = bin_counts / bin_counts.sum(axis=1, keepdims=True)
+
+        return fractions
@@ -0,0 +1,627 @@
+"""Orbital similarity search of NEOs based on D-criteria."""
+import typing as t
+
+import numpy as np
+
+# Supported D-criteria: Southworth & Hawkins (1963) and Drummond (1981)
+CRITERIA = ("sh", "d")
+
+# Maximum number of pairwise distances that are computed at once by the brute force search
+BRUTE_FORCE_CHUNK = 2 ** 22
+
+# Number of embedded nearest neighbours per requested neighbour that set the search radius of the
+# kNN search. More candidates give a tighter radius (the lower bound ignores some terms of the
+# D-criteria) and thus a smaller search ball
+KNN_CANDIDATE_FACTOR = 16
+
+# Relative and absolute tolerance of the search radius in the embedded space. Candidates whose
+# lower bound equals their D-criterion value are not lost due to rounding errors
+EMBEDDING_RTOL = 1e-9
+EMBEDDING_ATOL = 1e-12
+
+
+def _import_ckdtree() -> t.Any:
+    """
+    Import the KD-tree of the optional dependency scipy.
+
+    Returns
+    -------
+    ckdtree : type or None
+        The class scipy.spatial.cKDTree; None, if scipy is not installed.
+    """
+    try:
+        from scipy.spatial import cKDTree  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    return cKDTree
+
+
+def orbital_elements(neo_columns: t.Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Get the orbital elements of the D-criteria from NEO data columns.
+
+    The columns can be taken from the query API of the NEO databases or from the array loaders
+    (e.g., SolarY.neo.data.load_granvik2018_array). If no perihelion column (Perihel_AU) is given,
+    the perihelion is computed from the semi-major axis and the eccentricity.
+
+    Parameters
+    ----------
+    neo_columns : dict
+        Dictionary with the columns Ecc_, Incl_deg, LongAscNode_deg, ArgP_deg and Perihel_AU (or
+        SemMajAxis_AU).
+
+    Returns
+    -------
+    elements : numpy.ndarray
+        Array of the shape (N, 5) with the perihelion in AU, the eccentricity, the inclination, the
+        longitude of the ascending node and the argument of perihelion in radians.
+    """
+    # Get or compute the perihelion
+    ecc = np.asarray(neo_columns["Ecc_"], dtype=np.float64)
+    if "Perihel_AU" in neo_columns:
+        peri = np.asarray(neo_columns["Perihel_AU"], dtype=np.float64)
+    else:
+        peri = np.asarray(neo_columns["SemMajAxis_AU"], dtype=np.float64) * (1.0 - ecc)
+
+    # Stack the elements and convert the angles to radians
+    elements = np.column_stack(
+        [
+            peri,
+            ecc,
+            np.radians(neo_columns["Incl_deg"]),
+            np.radians(neo_columns["LongAscNode_deg"]),
+            np.radians(neo_columns["ArgP_deg"]),
+        ]
+    )
+
+    return elements
+
+
+def _split_elements(elements: np.ndarray) -> t.Tuple[np.ndarray, ...]:
+    """
+    Split an array of orbital elements into the individual elements.
+
+    Parameters
+    ----------
+    elements : numpy.ndarray
+        Array of the shape (..., 5) (see orbital_elements).
+
+    Returns
+    -------
+    peri, ecc, incl, long_asc_node, arg_peri : numpy.ndarray
+        Arrays of the shape (...).
+    """
+    return tuple(np.moveaxis(np.asarray(elements, dtype=np.float64), -1, 0))
+
+
+def _sin_half_mutual_incl_sq(
+    incl_1: np.ndarray, incl_2: np.ndarray, d_node: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the squared sine of the half mutual inclination of two orbits.
+
+    Parameters
+    ----------
+    incl_1, incl_2 : numpy.ndarray
+        Inclinations of the orbits in radians.
+    d_node : numpy.ndarray
+        Difference of the longitudes of the ascending nodes in radians.
+
+    Returns
+    -------
+    sin_half_incl_sq : numpy.ndarray
+        Values of sin^2(I21 / 2), with the mutual inclination I21.
+    """
+    sin_half_incl_sq = np.sin((incl_2 - incl_1) / 2.0) ** 2 + np.sin(incl_1) * np.sin(
+        incl_2
+    ) * np.sin(d_node / 2.0) ** 2
+
+    return np.clip(sin_half_incl_sq, 0.0, 1.0)
+
+
+def d_southworth_hawkins(elements_1: np.ndarray, elements_2: np.ndarray) -> np.ndarray:
+    """
+    Compute the D-criterion of Southworth & Hawkins (1963) -1-.
+
+    The function is vectorized; the input arrays are broadcast against each other.
+
+    Parameters
+    ----------
+    elements_1 : numpy.ndarray
+        Orbital elements of the shape (..., 5) (see orbital_elements).
+    elements_2 : numpy.ndarray
+        Orbital elements of the shape (..., 5) (see orbital_elements).
+
+    Returns
+    -------
+    d_sh : numpy.ndarray
+        D-criterion values of the broadcast shape of the inputs (without the last axis).
+
+    References
+    ----------
+    -1- Southworth, R. B. and Hawkins, G. S. (1963). Statistics of meteor streams. Smithsonian
+    Contributions to Astrophysics, 7, 261-285.
+    """
+    # Get the elements. The difference of the nodes is mapped to (-pi, pi]; this reverses the sign
+    # of the arcsine term below for differences larger than 180 degrees
+    peri_1, ecc_1, incl_1, node_1, arg_peri_1 = _split_elements(elements_1)
+    peri_2, ecc_2, incl_2, node_2, arg_peri_2 = _split_elements(elements_2)
+    d_node = np.remainder(node_2 - node_1 + np.pi, 2.0 * np.pi) - np.pi
+
+    # Mutual inclination term (2 sin(I21 / 2))^2
+    sin_half_incl_sq = _sin_half_mutual_incl_sq(incl_1, incl_2, d_node)
+
+    # Difference of the longitudes of perihelion measured from the mutual node
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sin_arg = np.cos((incl_2 + incl_1) / 2.0) * np.sin(d_node / 2.0) / np.sqrt(
+            1.0 - sin_half_incl_sq
+        )
+    sin_arg = np.clip(np.nan_to_num(sin_arg), -1.0, 1.0)
+    d_peri_long = arg_peri_2 - arg_peri_1 + 2.0 * np.arcsin(sin_arg)
+
+    # Combine all terms
+    d_sh = np.sqrt(
+        (ecc_2 - ecc_1) ** 2
+        + (peri_2 - peri_1) ** 2
+        + 4.0 * sin_half_incl_sq
+        + ((ecc_1 + ecc_2) / 2.0) ** 2 * (2.0 * np.sin(d_peri_long / 2.0)) ** 2
+    )
+
+    return d_sh
+
+
+def d_drummond(elements_1: np.ndarray, elements_2: np.ndarray) -> np.ndarray:
+    """
+    Compute the D-criterion of Drummond (1981) -1-.
+
+    The function is vectorized; the input arrays are broadcast against each other.
+
+    Parameters
+    ----------
+    elements_1 : numpy.ndarray
+        Orbital elements of the shape (..., 5) (see orbital_elements).
+    elements_2 : numpy.ndarray
+        Orbital elements of the shape (..., 5) (see orbital_elements).
+
+    Returns
+    -------
+    d_d : numpy.ndarray
+        D-criterion values of the broadcast shape of the inputs (without the last axis).
+
+    References
+    ----------
+    -1- Drummond, J. D. (1981). A test of comet and meteor shower associations. Icarus, 45(3),
+    545-553.
+    """
+    # Get the elements
+    peri_1, ecc_1, incl_1, node_1, arg_peri_1 = _split_elements(elements_1)
+    peri_2, ecc_2, incl_2, node_2, arg_peri_2 = _split_elements(elements_2)
+
+    # Mutual inclination
+    mutual_incl = 2.0 * np.arcsin(
+        np.sqrt(_sin_half_mutual_incl_sq(incl_1, incl_2, node_2 - node_1))
+    )
+
+    # Angle between the perihelion directions, based on the ecliptic longitudes and latitudes of
+    # the perihelia
+    peri_long_1 = node_1 + np.arctan2(np.cos(incl_1) * np.sin(arg_peri_1), np.cos(arg_peri_1))
+    peri_long_2 = node_2 + np.arctan2(np.cos(incl_2) * np.sin(arg_peri_2), np.cos(arg_peri_2))
+    peri_lat_1 = np.arcsin(np.sin(incl_1) * np.sin(arg_peri_1))
+    peri_lat_2 = np.arcsin(np.sin(incl_2) * np.sin(arg_peri_2))
+    peri_angle = np.arccos(
+        np.clip(
+            np.cos(peri_lat_1) * np.cos(peri_lat_2) * np.cos(peri_long_2 - peri_long_1)
+            + np.sin(peri_lat_1) * np.sin(peri_lat_2),
+            -1.0,
+            1.0,
+        )
+    )
+
+    # Relative differences of the eccentricity and perihelion (zero for identical values)
+    ecc_sum = ecc_1 + ecc_2
+    peri_sum = peri_1 + peri_2
+    rel_ecc = np.divide(ecc_2 - ecc_1, ecc_sum, out=np.zeros_like(ecc_sum), where=ecc_sum != 0)
+    rel_peri = np.divide(
+        peri_2 - peri_1, peri_sum, out=np.zeros_like(peri_sum), where=peri_sum != 0
+    )
+
+    # Combine all terms
+    d_d = np.sqrt(
+        rel_ecc ** 2
+        + rel_peri ** 2
+        + (mutual_incl / np.pi) ** 2
+        + (ecc_sum / 2.0 * peri_angle / np.pi) ** 2
+    )
+
+    return d_d
+
+
+def pole_vectors(elements: np.ndarray) -> np.ndarray:
+    """
+    Compute the unit vectors of the orbital poles (ecliptic coordinates).
+
+    The chord length between two pole vectors is 2 sin(I21 / 2), with the mutual inclination I21
+    of the orbits.
+
+    Parameters
+    ----------
+    elements : numpy.ndarray
+        Orbital elements of the shape (..., 5) (see orbital_elements).
+
+    Returns
+    -------
+    poles : numpy.ndarray
+        Unit vectors of the shape (..., 3).
+    """
+    _, _, incl, node, _ = _split_elements(elements)
+    poles = np.stack(
+        [np.sin(incl) * np.sin(node), -np.sin(incl) * np.cos(node), np.cos(incl)], axis=-1
+    )
+
+    return poles
+
+
+class OrbitSimilarityIndex:
+    """
+    Index for nearest neighbour and radius searches of orbits based on D-criteria.
+
+    The orbits are embedded into a 5 dimensional space (eccentricity, perihelion and the pole unit
+    vector; scaled per D-criterion), where the Euclidean distance is a lower bound of the
+    D-criterion:
+
+    - Southworth & Hawkins: the embedded distance equals the D-criterion without the perihelion
+      longitude term.
+    - Drummond: the eccentricity and perihelion are scaled by twice their maximum values of the
+      catalog and the pole vector by 1 / pi (the chord length is smaller than the mutual
+      inclination).
+
+    If scipy is installed, a KD-tree of the embedded catalog pre-filters the candidates of the
+    queries; the exact D-criterion is then computed for the candidates only. Thus, the results are
+    identical to a brute force search. Without scipy (or with use_tree=False), the D-criterion is
+    computed for all catalog orbits in vectorized chunks.
+
+    Attributes
+    ----------
+    neo_columns : dict
+        Data columns of the catalog (e.g., with the names or IDs of the NEOs).
+    elements : numpy.ndarray
+        Orbital elements of the catalog of the shape (N, 5) (see orbital_elements).
+    criterion : str
+        D-criterion: "sh" (Southworth & Hawkins) or "d" (Drummond).
+
+    Methods
+    -------
+    from_database(neo_db, where=None, criterion="sh", use_tree=True)
+        Create the index from the main table of a NEO database.
+    distances(query_elements)
+        Compute the D-criterion between a query orbit and all catalog orbits.
+    query_knn(query_elements, k=10)
+        Find the k most similar catalog orbits of each query orbit.
+    query_radius(query_elements, radius)
+        Find all catalog orbits within a D-criterion radius of each query orbit.
+
+    Examples
+    --------
+    Find the 5 orbits of the NEODyS database that are most similar to the orbit of (433) Eros
+
+    >>> import SolarY
+    >>> neo_sqlite = SolarY.neo.data.NEOdysDatabase()  # doctest: +SKIP
+    >>> sim_index = SolarY.neo.similarity.OrbitSimilarityIndex.from_database(
+    ...     neo_sqlite
+    ... )  # doctest: +SKIP
+    >>> eros_idx = list(sim_index.neo_columns["Name"]).index("433")  # doctest: +SKIP
+    >>> dist, idx = sim_index.query_knn(sim_index.elements[eros_idx], k=5)  # doctest: +SKIP
+    >>> similar_neos = sim_index.neo_columns["Name"][idx[0]]  # doctest: +SKIP
+    """
+
+    def __init__(
+        self, neo_columns: t.Dict[str, np.ndarray], criterion: str = "sh", use_tree: bool = True
+    ) -> None:
+        """
+        Init function of the OrbitSimilarityIndex class.
+
+        Parameters
+        ----------
+        neo_columns : dict
+            Data columns of the catalog (see orbital_elements for the required columns).
+        criterion : str, optional
+            D-criterion: "sh" (Southworth & Hawkins) or "d" (Drummond). The default is "sh".
+        use_tree : bool, optional
+            If True, a KD-tree pre-filters the candidates (requires scipy). The default is True.
+
+        Raises
+        ------
+        ValueError
+            If the D-criterion is unknown.
+        """
+        if criterion not in CRITERIA:
+            raise ValueError(f"Unknown D-criterion: {criterion}")
+
+        self.neo_columns = neo_columns
+        self.elements = orbital_elements(neo_columns)
+        self.criterion = criterion
+        self._d_func = d_southworth_hawkins if criterion == "sh" else d_drummond
+
+        # Set the scale factors of the embedding (eccentricity, perihelion, pole vector). For the
+        # Drummond criterion, the bound holds for orbits within the catalog maxima only
+        self._max_ecc = float(self.elements[:, 1].max(initial=0.0))
+        self._max_peri = float(self.elements[:, 0].max(initial=0.0))
+        if criterion == "sh":
+            self._scales = np.array([1.0, 1.0, 1.0])
+        else:
+            self._scales = np.array(
+                [
+                    0.5 / self._max_ecc if self._max_ecc > 0.0 else 0.0,
+                    0.5 / self._max_peri if self._max_peri > 0.0 else 0.0,
+                    1.0 / np.pi,
+                ]
+            )
+
+        # Build the KD-tree of the embedded catalog
+        ckdtree = _import_ckdtree() if use_tree else None
+        self._tree: t.Any = None
+        if ckdtree is not None and len(self.elements):
+            self._tree = ckdtree(self._embed(self.elements))
+
+    @classmethod
+    def from_database(
+        cls,
+        neo_db: t.Any,
+        where: t.Optional[t.Dict[str, t.Any]] = None,
+        criterion: str = "sh",
+        use_tree: bool = True,
+    ) -> "OrbitSimilarityIndex":
+        """
+        Create the index from the main table of a NEO database.
+
+        Parameters
+        ----------
+        neo_db : SolarY.neo.data.NEOdysDatabase or SolarY.neo.data.Granvik2018Database
+            NEO database (including the derived orbital elements).
+        where : dict, optional
+            Predicates of the catalog orbits (see NEOdysDatabase.select). If None, all orbits are
+            indexed. The default is None.
+        criterion : str, optional
+            D-criterion: "sh" (Southworth & Hawkins) or "d" (Drummond). The default is "sh".
+        use_tree : bool, optional
+            If True, a KD-tree pre-filters the candidates (requires scipy). The default is True.
+
+        Returns
+        -------
+        sim_index : OrbitSimilarityIndex
+            Index of the catalog orbits. The neo_columns contain the primary key (Name or ID),
+            too.
+        """
+        neo_columns = neo_db.select(
+            columns=[
+                neo_db._key_col,  # pylint: disable=protected-access
+                "Perihel_AU",
+                "Ecc_",
+                "Incl_deg",
+                "LongAscNode_deg",
+                "ArgP_deg",
+            ],
+            where=where,
+        )
+        sim_index = cls(neo_columns, criterion=criterion, use_tree=use_tree)
+
+        return sim_index
+
+    def _embed(self, elements: np.ndarray) -> np.ndarray:
+        """
+        Embed orbital elements into the 5 dimensional space of the index.
+
+        Parameters
+        ----------
+        elements : numpy.ndarray
+            Orbital elements of the shape (N, 5).
+
+        Returns
+        -------
+        embedding : numpy.ndarray
+            Embedded orbits of the shape (N, 5).
+        """
+        embedding = np.column_stack(
+            [
+                elements[:, 1] * self._scales[0],
+                elements[:, 0] * self._scales[1],
+                pole_vectors(elements) * self._scales[2],
+            ]
+        )
+
+        return embedding
+
+    def _tree_mask(self, query_elements: np.ndarray) -> np.ndarray:
+        """
+        Get the query orbits that can be searched with the KD-tree.
+
+        Parameters
+        ----------
+        query_elements : numpy.ndarray
+            Orbital elements of the shape (Q, 5).
+
+        Returns
+        -------
+        tree_mask : numpy.ndarray
+            Boolean array of the shape (Q,). The lower bound of the Drummond criterion holds only
+            for query orbits within the catalog maxima of the eccentricity and perihelion.
+        """
+        if self._tree is None:
+            return np.zeros(len(query_elements), dtype=bool)
+        if self.criterion == "sh":
+            return np.ones(len(query_elements), dtype=bool)
+        tree_mask = (query_elements[:, 1] <= self._max_ecc) & (
+            query_elements[:, 0] <= self._max_peri
+        )
+
+        return tree_mask
+
+    def distances(self, query_elements: np.ndarray) -> np.ndarray:
+        """
+        Compute the D-criterion between a query orbit and all catalog orbits.
+
+        Parameters
+        ----------
+        query_elements : numpy.ndarray
+            Orbital elements of a query orbit of the shape (5,) (see orbital_elements).
+
+        Returns
+        -------
+        d_values : numpy.ndarray
+            D-criterion values of the shape (N,).
+        """
+        d_values = self._d_func(np.asarray(query_elements, dtype=np.float64), self.elements)
+
+        return d_values
+
+    def _brute_force_chunks(
+        self, query_elements: np.ndarray
+    ) -> t.Iterator[t.Tuple[int, np.ndarray]]:
+        """
+        Compute the D-criterion between query orbits and all catalog orbits chunk-wise.
+
+        Parameters
+        ----------
+        query_elements : numpy.ndarray
+            Orbital elements of the shape (Q, 5).
+
+        Yields
+        ------
+        chunk_start : int
+            Index of the first query orbit of the chunk.
+        d_values : numpy.ndarray
+            D-criterion values of the shape (chunk size, N).
+        """
+        chunk_size = max(1, BRUTE_FORCE_CHUNK // max(1, len(self.elements)))
+        for chunk_start in range(0, len(query_elements), chunk_size):
+            chunk_end = chunk_start + chunk_size
+            chunk_elements = query_elements[chunk_start:chunk_end]
+            yield chunk_start, self._d_func(chunk_elements[:, np.newaxis, :], self.elements)
+
+    def query_knn(
+        self, query_elements: np.ndarray, k: int = 10
+    ) -> t.Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar catalog orbits of each query orbit.
+
+        Parameters
+        ----------
+        query_elements : numpy.ndarray
+            Orbital elements of the query orbits of the shape (Q, 5) or (5,) (see
+            orbital_elements).
+        k : int, optional
+            Number of nearest neighbours. If the catalog contains fewer orbits, all orbits are
+            returned. The default is 10.
+
+        Returns
+        -------
+        knn_dist : numpy.ndarray
+            D-criterion values of the shape (Q, k), sorted in ascending order per query orbit.
+        knn_idx : numpy.ndarray
+            Indices of the corresponding catalog orbits (rows of neo_columns) of the shape (Q, k).
+
+        Raises
+        ------
+        ValueError
+            If k is smaller than 1.
+        """
+        if k < 1:
+            raise ValueError("k must be a positive integer")
+        query_elements = np.atleast_2d(np.asarray(query_elements, dtype=np.float64))
+        k = min(k, len(self.elements))
+        knn_dist = np.empty((len(query_elements), k))
+        knn_idx = np.empty((len(query_elements), k), dtype=np.intp)
+
+        # KD-tree search. The k-th smallest exact D-criterion of the nearest embedded orbits sets
+        # a search radius, whose ball contains the k nearest orbits w.r.t. the D-criterion
+        tree_mask = self._tree_mask(query_elements)
+        if k > 0 and tree_mask.any():
+            tree_queries = query_elements[tree_mask]
+            query_emb = self._embed(tree_queries)
+            nr_cand = min(KNN_CANDIDATE_FACTOR * k, len(self.elements))
+            _, cand_idx = self._tree.query(query_emb, k=nr_cand)
+            cand_idx = np.reshape(cand_idx, (len(tree_queries), nr_cand))
+            cand_radii = np.partition(
+                self._d_func(tree_queries[:, np.newaxis, :], self.elements[cand_idx]), k - 1, axis=1
+            )[:, k - 1]
+            ball_idx_list = self._tree.query_ball_point(
+                query_emb, r=cand_radii * (1.0 + EMBEDDING_RTOL) + EMBEDDING_ATOL
+            )
+            for query_idx, query_el, ball_idx in zip(
+                np.flatnonzero(tree_mask), tree_queries, ball_idx_list
+            ):
+                ball_idx = np.asarray(ball_idx, dtype=np.intp)
+                ball_dist = self._d_func(query_el, self.elements[ball_idx])
+                order = np.argsort(ball_dist, kind="stable")[:k]
+                knn_dist[query_idx] = ball_dist[order]
+                knn_idx[query_idx] = ball_idx[order]
+
+        # Brute force search of the remaining query orbits
+        brute_idx = np.flatnonzero(~tree_mask)
+        if k > 0 and len(brute_idx):
+            for chunk_start, d_values in self._brute_force_chunks(query_elements[brute_idx]):
+                part_idx = np.argpartition(d_values, k - 1, axis=1)[:, :k]
+                part_dist = np.take_along_axis(d_values, part_idx, axis=1)
+                order = np.argsort(part_dist, axis=1, kind="stable")
+                chunk_idx = brute_idx[chunk_start:][: len(d_values)]
+                knn_dist[chunk_idx] = np.take_along_axis(part_dist, order, axis=1)
+                knn_idx[chunk_idx] = np.take_along_axis(part_idx, order, axis=1)
+
+        return knn_dist, knn_idx
+
+    def query_radius(
+        self, query_elements: np.ndarray, radius: float
+    ) -> t.List[t.Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find all catalog orbits within a D-criterion radius of each query orbit.
+
+        Parameters
+        ----------
+        query_elements : numpy.ndarray
+            Orbital elements of the query orbits of the shape (Q, 5) or (5,) (see
+            orbital_elements).
+        radius : float
+            Maximum D-criterion value (inclusive).
+
+        Returns
+        -------
+        radius_res : list
+            List with a tuple per query orbit: the D-criterion values (sorted in ascending order)
+            and the indices of the corresponding catalog orbits (rows of neo_columns).
+        """
+        query_elements = np.atleast_2d(np.asarray(query_elements, dtype=np.float64))
+        radius_res: t.List[t.Tuple[np.ndarray, np.ndarray]] = [
+            (np.empty(0), np.empty(0, dtype=np.intp))
+        ] * len(query_elements)
+
+        # Set the candidates: the embedded ball of the KD-tree or all catalog orbits
+        def _set_result(query_idx: int, cand_idx: np.ndarray, cand_dist: np.ndarray) -> None:
+            in_radius = cand_dist <= radius
+            order = np.argsort(cand_dist[in_radius], kind="stable")
+            radius_res[query_idx] = (cand_dist[in_radius][order], cand_idx[in_radius][order])
+
+        # KD-tree search
+        tree_mask = self._tree_mask(query_elements)
+        if tree_mask.any():
+            tree_queries = query_elements[tree_mask]
+            ball_idx_list = self._tree.query_ball_point(
+                self._embed(tree_queries), r=radius * (1.0 + EMBEDDING_RTOL) + EMBEDDING_ATOL
+            )
+            for query_idx, query_el, ball_idx in zip(
+                np.flatnonzero(tree_mask), tree_queries, ball_idx_list
+            ):
+                ball_idx = np.asarray(ball_idx, dtype=np.intp)
+                _set_result(
+                    int(query_idx), ball_idx, self._d_func(query_el, self.elements[ball_idx])
+                )
+
+        # Brute force search of the remaining query orbits
+        brute_idx = np.flatnonzero(~tree_mask)
+        if len(brute_idx):
+            all_idx = np.arange(len(self.elements))
+            for chunk_start, d_values in self._brute_force_chunks(query_elements[brute_idx]):
+                for chunk_offset, cand_dist in enumerate(d_values):
+                    _set_result(int(brute_idx[chunk_start + chunk_offset]), all_idx, cand_dist)
+
+        return radius_res
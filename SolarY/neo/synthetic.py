@@ -0,0 +1,198 @@
+"""Synthetic NEODyS catalogs and Granvik et al. (2018) model files for offline tests."""
+import gzip
+import typing as t
+
+import numpy as np
+
+from . import data
+
+# Number of rows that are drawn and written at once. The memory usage of the generators is
+# bounded by this chunk size, independent of the file size
+SYNTH_CHUNK_SIZE = 1000000
+
+# Header of the synthetic NEODyS files (same number of rows as the original header; see
+# SolarY.neo.data.NEODYS_HEADER_ROWS)
+NEODYS_SYNTH_HEADER = (
+    "format  = 'OEF2.0'       ! file format\n"
+    "rectype = 'ML'           ! record type (1L/ML)\n"
+    "elem    = 'KEP'          ! type of orbital elements\n"
+    "refsys  = ECLM J2000     ! default reference system\n"
+    "END_OF_HEADER\n"
+    "! Name, Epoch(MJD), a[AU], e, i[deg], long. node[deg], Arg. Pericenter[deg], mean "
+    "anomaly[deg], absolute magnitude, slope param., non-grav param.\n"
+)
+
+# Row formats of the synthetic files
+NEODYS_SYNTH_ROW = "%-10s %12.6f %13.9f %13.9f %9.5f %11.5f %11.5f %11.5f %6.2f %5.2f  0\n"
+GRANVIK2018_SYNTH_ROW = "%13.9g" + "%17.9g" * (len(data.GRANVIK2018_COLUMNS) - 1) + "\n"
+
+
+def draw_neo_columns(nr_rows: int, rng: np.random.Generator) -> t.Dict[str, np.ndarray]:
+    """
+    Draw random orbital elements and absolute magnitudes of NEOs in plausible ranges.
+
+    Parameters
+    ----------
+    nr_rows : int
+        Number of NEOs.
+    rng : numpy.random.Generator
+        Random number generator.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the column names of SolarY.neo.data.GRANVIK2018_COLUMNS as keys and the
+        drawn values as values.
+    """
+    neo_columns = {
+        "SemMajAxis_AU": rng.uniform(0.6, 4.2, nr_rows),
+        "Ecc_": rng.uniform(0.0, 0.95, nr_rows),
+        "Incl_deg": rng.uniform(0.0, 60.0, nr_rows),
+        "LongAscNode_deg": rng.uniform(0.0, 360.0, nr_rows),
+        "ArgP_deg": rng.uniform(0.0, 360.0, nr_rows),
+        "MeanAnom_deg": rng.uniform(0.0, 360.0, nr_rows),
+        "AbsMag_": rng.uniform(15.0, 25.0, nr_rows),
+    }
+
+    return neo_columns
+
+
+def _open_synth_file(path_filename: str) -> t.TextIO:
+    """
+    Open a synthetic file for writing. Files with the ending ".gz" are gzip-compressed.
+
+    Parameters
+    ----------
+    path_filename : str
+        File path of the synthetic file.
+
+    Returns
+    -------
+    f_synth : typing.TextIO
+        Text file object.
+    """
+    # Compress the file, if applicable
+    if path_filename.endswith(".gz"):
+        return t.cast(t.TextIO, gzip.open(path_filename, mode="wt"))
+
+    return open(path_filename, mode="w")
+
+
+def _iter_chunks(
+    nr_rows: int, seed: int, chunk_size: int
+) -> t.Iterator[t.Tuple[int, t.Dict[str, np.ndarray]]]:
+    """
+    Iterate through the chunks of a synthetic file and yield the drawn NEO data.
+
+    Parameters
+    ----------
+    nr_rows : int
+        Number of NEOs.
+    seed : int
+        Seed of the random number generator.
+    chunk_size : int
+        Number of NEOs per chunk.
+
+    Yields
+    ------
+    chunk_start : int
+        Index of the first NEO of the chunk.
+    neo_columns : dict
+        Drawn NEO data of the chunk (see draw_neo_columns).
+    """
+    # Check the input
+    if nr_rows < 0:
+        raise ValueError("nr_rows must not be negative")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    # Draw the NEOs chunk-wise with a single generator. The drawn values depend on the seed and
+    # the chunk size
+    rng = np.random.default_rng(seed)
+    for chunk_start in range(0, nr_rows, chunk_size):
+        yield chunk_start, draw_neo_columns(min(chunk_size, nr_rows - chunk_start), rng)
+
+
+def write_neodys(
+    path_filename: str, nr_rows: int, seed: int = 0, chunk_size: int = SYNTH_CHUNK_SIZE
+) -> str:
+    """
+    Write a synthetic catalog in the NEODyS format (.cat).
+
+    The NEOs are named by their running number ("1", "2", ...) and share a common epoch. The file
+    can be read with all NEODyS readers and databases of SolarY.neo.data.
+
+    Parameters
+    ----------
+    path_filename : str
+        File path of the synthetic catalog. Files with the ending ".gz" are gzip-compressed.
+    nr_rows : int
+        Number of NEOs.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+    chunk_size : int, optional
+        Number of NEOs that are drawn and written at once. The default is SYNTH_CHUNK_SIZE.
+
+    Returns
+    -------
+    path_filename : str
+        File path of the synthetic catalog.
+    """
+    with _open_synth_file(path_filename) as f_synth:
+        f_synth.write(NEODYS_SYNTH_HEADER)
+
+        # Write the NEOs chunk-wise: name (in single quotes), epoch, orbital elements, absolute
+        # magnitude and slope parameter
+        for chunk_start, neo_columns in _iter_chunks(nr_rows, seed, chunk_size):
+            nr_chunk_rows = len(neo_columns["SemMajAxis_AU"])
+            neo_names = [
+                f"'{neo_nr}'" for neo_nr in range(chunk_start + 1, chunk_start + nr_chunk_rows + 1)
+            ]
+            f_synth.writelines(
+                NEODYS_SYNTH_ROW % row
+                for row in zip(
+                    neo_names,
+                    [59600.0] * nr_chunk_rows,
+                    *(neo_columns[col_name].tolist() for col_name in data.GRANVIK2018_COLUMNS),
+                    [0.15] * nr_chunk_rows,
+                )
+            )
+
+    return path_filename
+
+
+def write_granvik2018(
+    path_filename: str, nr_rows: int, seed: int = 0, chunk_size: int = SYNTH_CHUNK_SIZE
+) -> str:
+    """
+    Write a synthetic model file in the Granvik et al. (2018) format (.dat).
+
+    The file can be read with all Granvik et al. (2018) readers and databases of
+    SolarY.neo.data.
+
+    Parameters
+    ----------
+    path_filename : str
+        File path of the synthetic model file. Files with the ending ".gz" are gzip-compressed.
+    nr_rows : int
+        Number of NEOs.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+    chunk_size : int, optional
+        Number of NEOs that are drawn and written at once. The default is SYNTH_CHUNK_SIZE.
+
+    Returns
+    -------
+    path_filename : str
+        File path of the synthetic model file.
+    """
+    with _open_synth_file(path_filename) as f_synth:
+        for _, neo_columns in _iter_chunks(nr_rows, seed, chunk_size):
+            f_synth.writelines(
+                GRANVIK2018_SYNTH_ROW % row
+                for row in zip(
+                    *(neo_columns[col_name].tolist() for col_name in data.GRANVIK2018_COLUMNS)
+                )
+            )
+
+    return path_filename
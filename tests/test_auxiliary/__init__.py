@@ -1,4 +1,5 @@
 from . import test_config
 from . import test_download
+from . import test_metrics
 from . import test_parse
 from . import test_reader
@@ -4,9 +4,108 @@ test_download.py
 Testing suite for SolarY/auxiliary/download.py
 
 """
+import hashlib
+import http.server
+import json
+import threading
+import time
+
+import pytest
+import requests
+
 import SolarY
 
 
+class _FileRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Request handler of a local stand-in HTTP server that serves a single file.
+
+    The file content, its ETag and an optional truncation (to simulate an interrupted transfer)
+    are set as server attributes. Conditional (If-None-Match) and range (Range, If-Range) requests
+    are supported.
+    """
+
+    def do_GET(self):
+        """Serve the file."""
+
+        # Log the request headers and simulate the server's latency
+        self.server.request_log.append(dict(self.headers))
+        time.sleep(self.server.delay)
+
+        # The client's file is up to date
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.server.etag)
+            self.end_headers()
+            return
+
+        # Serve the remaining part of the file, if the client's partial file is up to date.
+        # Otherwise, serve the complete file
+        start = 0
+        if "Range" in self.headers and self.headers.get("If-Range") == self.server.etag:
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+
+            # The range starts behind the end of the file
+            if start >= len(self.server.content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(self.server.content)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                f"bytes {start}-{len(self.server.content) - 1}/{len(self.server.content)}",
+            )
+        else:
+            self.send_response(200)
+        body = self.server.content[start:]
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        # Send the body; a truncated transfer is interrupted by closing the connection
+        if self.server.truncate_at is not None:
+            self.wfile.write(body[: self.server.truncate_at])
+            self.server.truncate_at = None
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Suppress the logging of the requests."""
+
+
+@pytest.fixture(name="file_server")
+def fixture_file_server():
+    """
+    Fixture that starts a local stand-in HTTP server in a background thread.
+
+    Returns
+    -------
+    file_server : http.server.ThreadingHTTPServer
+        Running server. The URL is stored in the attribute "url".
+
+    """
+
+    # Start the server on a free port
+    file_server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FileRequestHandler)
+    file_server.content = bytes(range(256)) * 1000
+    file_server.etag = '"v1"'
+    file_server.truncate_at = None
+    file_server.delay = 0.0
+    file_server.request_log = []
+    file_server.url = f"http://127.0.0.1:{file_server.server_address[1]}/data.bin"
+    server_thread = threading.Thread(target=file_server.serve_forever, daemon=True)
+    server_thread.start()
+
+    yield file_server
+
+    # Shut the server down
+    file_server.shutdown()
+    file_server.server_close()
+
+
 def test_spice_generic_kernels():
     """
     Test function for the download function spice_generic_kernels.
@@ -41,3 +140,146 @@ def test_spice_generic_kernels():
 
     # ... correspond with the expectations
     assert res_dl_kernel_dict == exp_kernel_dict
+
+
+def test_download_file(file_server, tmp_path):
+    """
+    Test the conditional and streaming download function with a local HTTP server.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Download the file for the first time and check the content and the streamed hash
+    file_path = tmp_path / "data.bin"
+    dl_result = SolarY.auxiliary.download.download_file(
+        file_server.url, file_path, chunk_size=4096
+    )
+    assert dl_result["status"] == "downloaded"
+    assert dl_result["bytes"] == len(file_server.content)
+    assert file_path.read_bytes() == file_server.content
+    assert dl_result["sha256"] == SolarY.auxiliary.parse.comp_sha256(file_path)
+
+    # A second download is conditional; the unchanged file is not transferred again
+    dl_result_2 = SolarY.auxiliary.download.download_file(file_server.url, file_path)
+    assert dl_result_2 == {"status": "not_modified", "sha256": dl_result["sha256"], "bytes": 0}
+    assert file_server.request_log[-1]["If-None-Match"] == '"v1"'
+
+    # A changed file is downloaded again
+    file_server.content = file_server.content[::-1]
+    file_server.etag = '"v2"'
+    dl_result_3 = SolarY.auxiliary.download.download_file(file_server.url, file_path)
+    assert dl_result_3["status"] == "downloaded"
+    assert file_path.read_bytes() == file_server.content
+
+
+def test_download_file_resume(file_server, tmp_path):
+    """
+    Test the resumption of an interrupted download with a local HTTP server.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Interrupt the first transfer after 20 chunks. The partial file is kept
+    file_path = tmp_path / "data.bin"
+    file_server.truncate_at = 20 * 4096
+    with pytest.raises(requests.RequestException):
+        SolarY.auxiliary.download.download_file(file_server.url, file_path, chunk_size=4096)
+    assert not file_path.exists()
+    assert (tmp_path / "data.bin.part").stat().st_size == 20 * 4096
+
+    # The second call resumes the transfer with a range request and transfers only the rest
+    dl_result = SolarY.auxiliary.download.download_file(file_server.url, file_path)
+    assert file_server.request_log[-1]["Range"] == f"bytes={20 * 4096}-"
+    assert dl_result["status"] == "resumed"
+    assert dl_result["bytes"] == len(file_server.content) - 20 * 4096
+    assert file_path.read_bytes() == file_server.content
+    assert dl_result["sha256"] == SolarY.auxiliary.parse.comp_sha256(file_path)
+    assert not (tmp_path / "data.bin.part").exists()
+
+    # A complete partial file (the process stopped before replacing the file) is rejected by the
+    # server (416); it is deleted and the file is downloaded again without range
+    file_path = tmp_path / "stale.bin"
+    (tmp_path / "stale.bin.part").write_bytes(file_server.content)
+    (tmp_path / "stale.bin.manifest.json").write_text(
+        json.dumps({"url": file_server.url, "part_etag": file_server.etag})
+    )
+    dl_result = SolarY.auxiliary.download.download_file(file_server.url, file_path)
+    assert file_server.request_log[-2]["Range"] == f"bytes={len(file_server.content)}-"
+    assert "Range" not in file_server.request_log[-1]
+    assert dl_result["status"] == "downloaded"
+    assert dl_result["bytes"] == len(file_server.content)
+    assert file_path.read_bytes() == file_server.content
+    assert not (tmp_path / "stale.bin.part").exists()
+
+
+def test_configured_datasets():
+    """
+    Test the download information of all configured datasets.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # The NEO datasets and all generic SPICE kernels are configured. The kernels have a hash
+    datasets = SolarY.auxiliary.download.configured_datasets()
+    assert {"neodys", "granvik2018", "spice_generic_leapseconds"} <= set(datasets.keys())
+    assert datasets["neodys"]["url"] == SolarY.neo.data.NEODYS_URL
+    assert datasets["neodys"]["sha256"] is None
+    assert datasets["spice_generic_leapseconds"]["file"].endswith("naif0012.tls")
+    assert datasets["spice_generic_leapseconds"]["sha256"] is not None
+
+
+def test_fetch_all(file_server, tmp_path):
+    """
+    Test the concurrent download of several datasets with a local HTTP server.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Set 4 datasets; 2 of them with the expected hash
+    exp_sha256 = hashlib.sha256(file_server.content).hexdigest()
+    datasets = {
+        f"data_{idx}": {
+            "url": f"{file_server.url}?idx={idx}",
+            "file": str(tmp_path / f"data_{idx}.bin"),
+            "sha256": exp_sha256 if idx % 2 == 0 else None,
+        }
+        for idx in range(4)
+    }
+
+    # Download the datasets concurrently. Each request takes at least 0.5 s; the total time is
+    # bound by a single request, rather than by the sum of all requests
+    file_server.delay = 0.5
+    start_time = time.perf_counter()
+    fetch_report = SolarY.auxiliary.download.fetch_all(datasets, max_workers=4)
+    assert time.perf_counter() - start_time < 4 * 0.5
+    assert list(fetch_report.keys()) == list(datasets.keys())
+    for idx, fetch_result in enumerate(fetch_report.values()):
+        assert fetch_result["status"] == "downloaded"
+        assert fetch_result["bytes"] == len(file_server.content)
+        assert fetch_result["seconds"] >= 0.5
+        assert fetch_result["verified"] is (True if idx % 2 == 0 else None)
+        assert (tmp_path / f"data_{idx}.bin").read_bytes() == file_server.content
+
+    # A hash mismatch is reported
+    datasets["data_1"]["sha256"] = "0" * 64
+    with pytest.raises(ValueError):
+        SolarY.auxiliary.download.fetch_all(datasets)
+    fetch_report = SolarY.auxiliary.download.fetch_all(datasets, verify=False)
+    assert fetch_report["data_1"]["verified"] is False
+    assert fetch_report["data_1"]["status"] == "not_modified"
+
+    # The number of concurrent downloads must be positive
+    with pytest.raises(ValueError):
+        SolarY.auxiliary.download.fetch_all(datasets, max_workers=0)
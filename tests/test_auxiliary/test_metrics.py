@@ -0,0 +1,58 @@
+"""
+test_metrics.py
+
+Testing suite for SolarY/auxiliary/metrics.py
+
+"""
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import SolarY
+
+
+def test_StageMetrics():
+    """
+    Test the stage metrics collector.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Collect the metrics of two stages; the callback receives each finished stage
+    callback_records = []
+    metrics = SolarY.auxiliary.metrics.StageMetrics(
+        callback=callback_records.append, trace_memory=True
+    )
+    with metrics.stage("sleep", rows=100):
+        time.sleep(0.05)
+    with metrics.stage("alloc") as stage_record:
+        alloc_array = np.ones(1000000)
+        stage_record["rows"] = len(alloc_array)
+        del alloc_array
+    assert [record["stage"] for record in callback_records] == ["sleep", "alloc"]
+
+    # Wall time, throughput and peak memory
+    stage_report = metrics.report()
+    sleep_record, alloc_record = stage_report["stages"]
+    assert sleep_record["wall_sec"] >= 0.05
+    assert sleep_record["rows_per_sec"] == pytest.approx(100 / sleep_record["wall_sec"])
+    assert alloc_record["rows"] == 1000000
+    assert alloc_record["peak_memory_bytes"] >= 8000000
+    assert stage_report["wall_sec"] == pytest.approx(
+        sleep_record["wall_sec"] + alloc_record["wall_sec"]
+    )
+    assert not tracemalloc.is_tracing()
+
+    # Stages without rows or memory tracing; failed stages are recorded, too
+    metrics = SolarY.auxiliary.metrics.StageMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.stage("fail"):
+            raise RuntimeError("stage failed")
+    assert metrics.stages[0]["stage"] == "fail"
+    assert metrics.stages[0]["rows_per_sec"] is None
+    assert metrics.stages[0]["peak_memory_bytes"] is None
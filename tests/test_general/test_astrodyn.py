@@ -5,7 +5,9 @@ Testing suite for SolarY/general/astrodyn.py
 
 """
 import math
+import time
 
+import numpy as np
 import pytest
 
 import SolarY
@@ -73,6 +75,21 @@ def test_tisserand():
     )
     assert tisserand_parameter4 == 2.2698684153570663
 
+    # Compute the Tisserand parameters of arrays element-wise. Hyperbolic orbits (negative
+    # semi-major axis) are valid; a negative semi-latus rectum results in NaN
+    tisserand_parameters = SolarY.general.astrodyn.tisserand(
+        sem_maj_axis_obj=np.array([5.0, 4.0, 4.0, -2.0, 4.0]),
+        inc=np.array([0.0, 0.0, math.radians(30.0), 0.0, 0.0]),
+        ecc=np.array([0.0, 0.65, 0.65, 1.5, 1.5]),
+    )
+    assert tisserand_parameters[:3].tolist() == pytest.approx(
+        [tisserand_parameter1, tisserand_parameter2, tisserand_parameter3]
+    )
+    assert tisserand_parameters[3] == pytest.approx(
+        5.20336301 / -2.0 + 2.0 * math.sqrt(-2.0 / 5.20336301 * (1.0 - 1.5 ** 2.0))
+    )
+    assert np.isnan(tisserand_parameters[4])
+
 
 def test_kep_apoapsis():
     """
@@ -142,6 +159,234 @@ def test_jd2mjd():
     assert mjd1 == 56000.0
 
 
+def test_solve_kepler():
+    """
+    Testing the vectorized Kepler equation solver and its scalar wrapper.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Random elliptic orbits with mean anomalies of several revolutions
+    rng = np.random.default_rng(0)
+    mean_anom = rng.uniform(-20.0, 20.0, 10000)
+    ecc = rng.uniform(0.0, 0.999, 10000)
+    ecc_anom = SolarY.general.astrodyn.solve_kepler(mean_anom, ecc)
+    np.testing.assert_allclose(ecc_anom - ecc * np.sin(ecc_anom), mean_anom, rtol=0.0, atol=1e-13)
+    assert np.all(np.abs(ecc_anom - mean_anom) <= ecc + 1e-12)
+
+    # Near-parabolic orbits with tiny mean anomalies: the relative residual is small, too
+    mean_anom = np.logspace(-12.0, 0.0, 1000)
+    ecc = np.full(1000, 1.0 - 1e-9)
+    ecc_anom = SolarY.general.astrodyn.solve_kepler(mean_anom, ecc)
+    resid = (1.0 - ecc) * ecc_anom + ecc * (ecc_anom - np.sin(ecc_anom)) - mean_anom
+    assert np.all(np.abs(resid) < 1e-9 * mean_anom + 1e-15)
+    assert np.all(np.diff(ecc_anom) > 0.0)
+
+    # Broadcasting, circular orbits and the scalar wrapper
+    assert SolarY.general.astrodyn.solve_kepler(np.zeros((2, 3)), 0.5).shape == (2, 3)
+    np.testing.assert_allclose(
+        SolarY.general.astrodyn.solve_kepler(np.array([0.3, -2.0]), 0.0), [0.3, -2.0]
+    )
+    ecc_anom = SolarY.general.astrodyn.kep_ecc_anom(mean_anom=1.0, ecc=0.5)
+    assert isinstance(ecc_anom, float)
+    assert pytest.approx(ecc_anom - 0.5 * math.sin(ecc_anom), abs=1e-14) == 1.0
+
+    # True anomaly: pericentre, apocentre and the relation tan(v/2) = sqrt((1+e)/(1-e)) tan(E/2)
+    true_anom = SolarY.general.astrodyn.kep_true_anom(np.array([0.0, np.pi, 1.0, 7.0]), 0.5)
+    assert true_anom[:2].tolist() == pytest.approx([0.0, np.pi])
+    assert math.tan(true_anom[2] / 2.0) == pytest.approx(math.sqrt(3.0) * math.tan(0.5))
+    assert true_anom[3] == pytest.approx(
+        2.0 * np.pi + SolarY.general.astrodyn.kep_true_anom(7.0 - 2.0 * np.pi, 0.5)
+    )
+
+    # Invalid eccentricities
+    with pytest.raises(ValueError):
+        SolarY.general.astrodyn.solve_kepler(np.array([1.0]), 1.0)
+
+
+@pytest.mark.benchmark
+def test_solve_kepler_benchmark(record_property):
+    """
+    Benchmark the vectorized Kepler equation solver with 10^6 elements.
+
+    Returns
+    -------
+    None.
+
+    """
+    rng = np.random.default_rng(1)
+    mean_anom = rng.uniform(0.0, 2.0 * np.pi, 1000000)
+    ecc = rng.uniform(0.0, 0.99, 1000000)
+
+    start_time = time.perf_counter()
+    SolarY.general.astrodyn.solve_kepler(mean_anom, ecc)
+    solve_sec = time.perf_counter() - start_time
+
+    record_property("solve_kepler_sec", solve_sec)
+
+
+def test_kep2cart_cart2kep():
+    """
+    Testing the conversion between Keplerian elements and Cartesian state vectors.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Circular orbit of 1 AU: the orbital speed is about 29.78 km/s (about 0.0172 AU/day)
+    position, velocity = SolarY.general.astrodyn.kep2cart(
+        SolarY.general.astrodyn.ONE_AU_KM, 0.0, 0.0, 0.0, 0.0, 0.0, spatial_unit="km"
+    )
+    assert position.shape == velocity.shape == (1, 3)
+    assert position[0].tolist() == pytest.approx([SolarY.general.astrodyn.ONE_AU_KM, 0.0, 0.0])
+    assert velocity[0, 1] == pytest.approx(29.7847, abs=1e-4)
+
+    # Perihelion and aphelion distance, and the units (AU, km, deg, rad) are consistent
+    position, velocity = SolarY.general.astrodyn.kep2cart(
+        np.array([2.0, 2.0]), 0.5, 10.0, 20.0, 30.0, np.array([0.0, 180.0])
+    )
+    assert np.linalg.norm(position, axis=1).tolist() == pytest.approx([1.0, 3.0])
+    position_km, velocity_km = SolarY.general.astrodyn.kep2cart(
+        np.array([2.0, 2.0]) * SolarY.general.astrodyn.ONE_AU_KM,
+        0.5,
+        math.radians(10.0),
+        math.radians(20.0),
+        math.radians(30.0),
+        np.array([0.0, math.pi]),
+        spatial_unit="km",
+        angle_unit="rad",
+    )
+    np.testing.assert_allclose(
+        position_km / SolarY.general.astrodyn.ONE_AU_KM, position, atol=1e-14
+    )
+    np.testing.assert_allclose(
+        velocity_km * SolarY.general.astrodyn.SEC_PER_DAY / SolarY.general.astrodyn.ONE_AU_KM,
+        velocity,
+        atol=1e-16,
+    )
+
+    # Round trip of random elliptic orbits
+    rng = np.random.default_rng(0)
+    elements = (
+        rng.uniform(0.6, 4.2, 10000),
+        rng.uniform(0.01, 0.95, 10000),
+        rng.uniform(1.0, 179.0, 10000),
+        rng.uniform(0.0, 360.0, 10000),
+        rng.uniform(0.0, 360.0, 10000),
+        rng.uniform(0.0, 360.0, 10000),
+    )
+    position, velocity = SolarY.general.astrodyn.kep2cart(*elements)
+    elements_back = SolarY.general.astrodyn.cart2kep(position, velocity)
+    for element, element_back in zip(elements, elements_back):
+        angle_diff = np.abs(element - element_back)
+        assert np.all(np.minimum(angle_diff, 360.0 - angle_diff) < 1e-9)
+
+    # Circular and equatorial orbits: the state vectors are reproduced
+    position, velocity = SolarY.general.astrodyn.kep2cart(
+        [1.0, 1.0, 2.0], [0.0, 0.3, 0.0], [0.0, 0.0, 180.0], 30.0, 10.0, 45.0
+    )
+    elements_back = SolarY.general.astrodyn.cart2kep(position, velocity, angle_unit="rad")
+    assert elements_back[1][0] == pytest.approx(0.0, abs=1e-12)
+    assert elements_back[3].tolist() == [0.0, 0.0, 0.0]
+    position_back, velocity_back = SolarY.general.astrodyn.kep2cart(
+        *elements_back, angle_unit="rad"
+    )
+    np.testing.assert_allclose(position_back, position, atol=1e-14)
+    np.testing.assert_allclose(velocity_back, velocity, atol=1e-16)
+
+    # Unbound orbits have no mean anomaly
+    elements_back = SolarY.general.astrodyn.cart2kep(np.array([1.0, 0.0, 0.0]), [0.0, 0.03, 0.0])
+    assert elements_back[0][0] < 0.0 and elements_back[1][0] > 1.0
+    assert np.isnan(elements_back[5][0])
+
+    # Unknown units
+    with pytest.raises(ValueError):
+        SolarY.general.astrodyn.kep2cart(1.0, 0.0, 0.0, 0.0, 0.0, 0.0, spatial_unit="m")
+    with pytest.raises(ValueError):
+        SolarY.general.astrodyn.cart2kep(position, velocity, angle_unit="grad")
+
+
+def test_propagate_kepler():
+    """
+    Testing the block-wise two-body propagator.
+
+    Returns
+    -------
+    None.
+
+    """
+    rng = np.random.default_rng(0)
+    elements = (
+        rng.uniform(0.6, 4.2, 100),
+        rng.uniform(0.0, 0.95, 100),
+        rng.uniform(0.0, 60.0, 100),
+        rng.uniform(0.0, 360.0, 100),
+        rng.uniform(0.0, 360.0, 100),
+        rng.uniform(0.0, 360.0, 100),
+    )
+    epoch_mjd = rng.uniform(59000.0, 60000.0, 100)
+    times_mjd = SolarY.general.astrodyn.jd2mjd(
+        SolarY.general.astrodyn.mjd2jd(59600.0 + np.arange(48) / 24.0)
+    )
+
+    # Blocks of consecutive times with at most block_size positions
+    blocks = list(
+        SolarY.general.astrodyn.propagate_kepler(*elements, epoch_mjd, times_mjd, block_size=1000)
+    )
+    assert [len(times_block) for times_block, _ in blocks] == [10, 10, 10, 10, 8]
+    assert all(position.shape == (100, len(times_block), 3) for times_block, position in blocks)
+    np.testing.assert_array_equal(
+        np.concatenate([times_block for times_block, _ in blocks]), times_mjd
+    )
+    position = np.concatenate([position for _, position in blocks], axis=1)
+
+    # The positions correspond to the state vectors of the propagated mean anomalies
+    mean_motion_deg = np.degrees(
+        np.sqrt(
+            SolarY.general.astrodyn.GM_SUN_KM3_S2
+            * SolarY.general.astrodyn.SEC_PER_DAY ** 2
+            / SolarY.general.astrodyn.ONE_AU_KM ** 3
+            / elements[0] ** 3
+        )
+    )
+    for time_idx in (0, 25, 47):
+        position_time, _ = SolarY.general.astrodyn.kep2cart(
+            *elements[:5], elements[5] + mean_motion_deg * (times_mjd[time_idx] - epoch_mjd)
+        )
+        np.testing.assert_allclose(position[:, time_idx], position_time, atol=1e-12)
+
+    # Units: km and radians; at least one time per block
+    blocks_km = list(
+        SolarY.general.astrodyn.propagate_kepler(
+            elements[0] * SolarY.general.astrodyn.ONE_AU_KM,
+            elements[1],
+            *(np.radians(angle) for angle in elements[2:]),
+            epoch_mjd,
+            times_mjd[:3],
+            spatial_unit="km",
+            angle_unit="rad",
+            block_size=1,
+        )
+    )
+    assert len(blocks_km) == 3
+    np.testing.assert_allclose(
+        blocks_km[2][1][:, 0] / SolarY.general.astrodyn.ONE_AU_KM, position[:, 2], atol=1e-12
+    )
+
+    # Invalid input
+    with pytest.raises(ValueError):
+        next(
+            SolarY.general.astrodyn.propagate_kepler(*elements, epoch_mjd, times_mjd, block_size=0)
+        )
+    with pytest.raises(ValueError):
+        next(SolarY.general.astrodyn.propagate_kepler(1.0, 1.2, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+
+
 def test_sphere_of_influence():
     """
     Test function to check the Sphere Of Influence (SOI) computation function.
@@ -1,2 +1,7 @@
 from . import test_astrodyn
+from . import test_benchmark
+from . import test_catalog
 from . import test_data
+from . import test_population
+from . import test_similarity
+from . import test_synthetic
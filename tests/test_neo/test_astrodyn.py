@@ -1,4 +1,9 @@
 """Testing suite for SolarY/neo/astrodyn.py"""
+import sqlite3
+import time
+
+import numpy as np
+import pytest
 
 # Import SolarY
 import SolarY
@@ -38,3 +43,208 @@ def test_neo_class():
 
         # Check the classification with the expectation
         assert neo_class_res == _neo_class_exp
+
+
+def test_neo_state_vectors():
+    """
+    Testing the state vectors of NEO columns.
+
+    Returns
+    -------
+    None.
+
+    """
+    neo_columns = {
+        "Name": np.array(["1", "2"]),
+        "SemMajAxis_AU": np.array([1.0, 2.0]),
+        "Ecc_": np.array([0.0, 0.5]),
+        "Incl_deg": np.array([0.0, 10.0]),
+        "LongAscNode_deg": np.array([0.0, 20.0]),
+        "ArgP_deg": np.array([0.0, 30.0]),
+        "MeanAnom_deg": np.array([90.0, 0.0]),
+    }
+
+    # Dictionary of columns
+    position, velocity = SolarY.neo.astrodyn.neo_state_vectors(neo_columns)
+    assert position.shape == velocity.shape == (2, 3)
+    assert position[0].tolist() == pytest.approx([0.0, 1.0, 0.0], abs=1e-12)
+    assert np.linalg.norm(position[1]) == pytest.approx(1.0)
+
+    # NEO catalog and km
+    position_km, _ = SolarY.neo.astrodyn.neo_state_vectors(
+        SolarY.neo.catalog.NEOCatalog.from_columns(neo_columns), spatial_unit="km"
+    )
+    np.testing.assert_allclose(position_km / SolarY.general.astrodyn.ONE_AU_KM, position)
+
+
+def test_propagate_neos():
+    """
+    Testing the propagation of NEO columns.
+
+    Returns
+    -------
+    None.
+
+    """
+    neo_columns = SolarY.neo.catalog.NEOCatalog.from_columns(
+        {
+            "SemMajAxis_AU": np.array([1.0, 2.0]),
+            "Ecc_": np.array([0.0, 0.5]),
+            "Incl_deg": np.array([0.0, 10.0]),
+            "LongAscNode_deg": np.array([0.0, 20.0]),
+            "ArgP_deg": np.array([0.0, 30.0]),
+            "MeanAnom_deg": np.array([90.0, 0.0]),
+            "Epoch_MJD": np.array([59600.0, 59610.0]),
+        }
+    )
+
+    # At the epochs the positions are the state vectors of the elements
+    blocks = list(SolarY.neo.astrodyn.propagate_neos(neo_columns, [59600.0, 59610.0], block_size=2))
+    assert len(blocks) == 2
+    position, _ = SolarY.neo.astrodyn.neo_state_vectors(neo_columns)
+    np.testing.assert_allclose(blocks[0][1][0, 0], position[0], atol=1e-12)
+    np.testing.assert_allclose(blocks[1][1][1, 0], position[1], atol=1e-12)
+
+    # The circular orbit keeps its radius (km)
+    _, position_km = next(
+        SolarY.neo.astrodyn.propagate_neos(neo_columns, np.linspace(59000.0, 60000.0, 5), "km")
+    )
+    assert np.linalg.norm(position_km[0], axis=1) == pytest.approx(
+        SolarY.general.astrodyn.ONE_AU_KM
+    )
+
+
+def _random_orbits(nr_orbits, seed=0):
+    """
+    Draw random orbits with their Tisserand parameters.
+
+    Parameters
+    ----------
+    nr_orbits : int
+        Number of orbits.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+
+    Returns
+    -------
+    orbit_vars : dict
+        Keyword arguments of SolarY.neo.astrodyn.classify_orbits.
+    """
+    rng = np.random.default_rng(seed)
+    sem_maj_axis_au = rng.uniform(0.5, 6.0, nr_orbits)
+    ecc = rng.uniform(0.0, 0.9, nr_orbits)
+    incl_deg = rng.uniform(0.0, 40.0, nr_orbits)
+    orbit_vars = {
+        "sem_maj_axis_au": sem_maj_axis_au,
+        "peri_helio_au": (1.0 - ecc) * sem_maj_axis_au,
+        "ap_helio_au": (1.0 + ecc) * sem_maj_axis_au,
+        "incl_deg": incl_deg,
+        "tisserand_jup": SolarY.general.astrodyn.tisserand(
+            sem_maj_axis_obj=sem_maj_axis_au, inc=np.radians(incl_deg), ecc=ecc
+        ),
+    }
+
+    return orbit_vars
+
+
+def test_classify_orbits():
+    """
+    Testing the vectorized rule-table classification and its SQL equivalent.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # The NEO rules correspond to the scalar classification
+    orbit_vars = _random_orbits(2000)
+    class_codes = SolarY.neo.astrodyn.classify_orbits(
+        orbit_vars["sem_maj_axis_au"],
+        orbit_vars["peri_helio_au"],
+        orbit_vars["ap_helio_au"],
+        rules=SolarY.neo.astrodyn.NEO_CLASS_RULES,
+    )
+    assert class_codes.dtype == np.int8
+    class_names = SolarY.neo.astrodyn.orbit_class_names(SolarY.neo.astrodyn.NEO_CLASS_RULES)
+    assert [class_names[class_code] for class_code in class_codes] == [
+        SolarY.neo.astrodyn.neo_class(
+            sem_maj_axis_au=sem_maj_axis_au, peri_helio_au=peri_helio_au, ap_helio_au=ap_helio_au
+        )
+        for sem_maj_axis_au, peri_helio_au, ap_helio_au in zip(
+            orbit_vars["sem_maj_axis_au"], orbit_vars["peri_helio_au"], orbit_vars["ap_helio_au"]
+        )
+    ]
+
+    # Further classes: Mars-crosser, main-belt, Hilda, Jupiter Trojan, JFC and NaN values
+    class_codes = SolarY.neo.astrodyn.classify_orbits(
+        sem_maj_axis_au=np.array([1.8, 2.7, 3.95, 5.2, 6.5, np.nan]),
+        peri_helio_au=np.array([1.4, 2.4, 3.2, 4.9, 2.0, np.nan]),
+        ap_helio_au=np.array([2.2, 3.0, 4.7, 5.5, 11.0, np.nan]),
+        incl_deg=np.array([10.0, 5.0, 8.0, 20.0, 10.0, np.nan]),
+        tisserand_jup=np.array([4.0, 3.3, 3.0, 2.9, 2.5, np.nan]),
+    )
+    class_names = SolarY.neo.astrodyn.orbit_class_names()
+    assert [class_names[class_code] for class_code in class_codes] == [
+        "Mars-crosser",
+        "Main-belt",
+        "Hilda",
+        "Jupiter Trojan",
+        "JFC",
+        "Other",
+    ]
+
+    # Missing and unknown variables are rejected
+    with pytest.raises(ValueError):
+        SolarY.neo.astrodyn.classify_orbits(
+            orbit_vars["sem_maj_axis_au"], orbit_vars["peri_helio_au"], orbit_vars["ap_helio_au"]
+        )
+    with pytest.raises(ValueError):
+        SolarY.neo.astrodyn.classify_orbits(
+            orbit_vars["sem_maj_axis_au"],
+            orbit_vars["peri_helio_au"],
+            orbit_vars["ap_helio_au"],
+            rules=[("Centaur", {"e": (None, 0.5)})],
+        )
+
+    # The SQL CASE expression classifies the orbits in the database in the same way (as names
+    # and as codes)
+    con = sqlite3.connect(":memory:")
+    con.execute(
+        "CREATE TABLE main(SemMajAxis_AU FLOAT, Perihel_AU FLOAT, Aphel_AU FLOAT, Incl_deg FLOAT, "
+        "TisserandJup_ FLOAT)"
+    )
+    con.executemany(
+        "INSERT INTO main VALUES (?, ?, ?, ?, ?)",
+        zip(*(col_values.tolist() for col_values in orbit_vars.values())),
+    )
+    class_codes = SolarY.neo.astrodyn.classify_orbits(**orbit_vars)
+    sql_classes = con.execute(
+        f"SELECT {SolarY.neo.astrodyn.orbit_class_sql()} FROM main ORDER BY rowid"
+    ).fetchall()
+    assert [sql_class for (sql_class,) in sql_classes] == [
+        class_names[class_code] for class_code in class_codes
+    ]
+    sql_codes = con.execute(
+        f"SELECT {SolarY.neo.astrodyn.orbit_class_sql(codes=True)} FROM main ORDER BY rowid"
+    ).fetchall()
+    assert [sql_code for (sql_code,) in sql_codes] == class_codes.tolist()
+    con.close()
+
+
+@pytest.mark.benchmark
+def test_classify_orbits_benchmark(record_property):
+    """
+    Benchmark the vectorized classification with the size of the Granvik et al. (2018) model.
+
+    Returns
+    -------
+    None.
+
+    """
+    orbit_vars = _random_orbits(802000)
+    start_time = time.perf_counter()
+    SolarY.neo.astrodyn.classify_orbits(**orbit_vars)
+    classify_sec = time.perf_counter() - start_time
+
+    record_property("classify_sec", classify_sec)
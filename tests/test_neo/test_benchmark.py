@@ -0,0 +1,91 @@
+"""
+test_benchmark.py
+
+Testing suite for SolarY/neo/benchmark.py
+
+"""
+import json
+import os
+
+import pytest
+
+import SolarY
+
+
+def test_run_ingest_benchmark(tmp_path):
+    """
+    Test the structure of the ingest benchmark results with a small synthetic file.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Run the benchmark and store the results in a JSON file
+    benchmark_report = SolarY.neo.benchmark.run_ingest_benchmark(
+        tmp_path / "bench", nr_rows=[500], output=tmp_path / "bench.json"
+    )
+    with open(tmp_path / "bench.json") as f_temp:
+        assert json.load(f_temp) == benchmark_report
+
+    # All steps are measured for both datasets
+    for dataset in SolarY.neo.benchmark.BENCHMARK_DATASETS:
+        steps = [
+            result["step"] for result in benchmark_report["results"] if result["dataset"] == dataset
+        ]
+        for exp_step in [
+            "generate",
+            "read",
+            "load_array",
+            "load_array_cache_build",
+            "load_array_cached",
+            "rowwise.deriv_orb",
+            "rowwise.neo_class",
+            "bulk.insert",
+            "bulk.index",
+            "query_box",
+            "query_scan",
+        ]:
+            assert exp_step in steps
+    for result in benchmark_report["results"]:
+        assert result["nr_rows"] == 500
+        assert result["wall_sec"] >= 0.0
+        if result["step"] in ["load_array", "bulk.insert", "rowwise.neo_class"]:
+            assert result["rows"] == 500
+            assert result["rows_per_sec"] > 0.0
+
+    # Invalid input
+    with pytest.raises(ValueError):
+        SolarY.neo.benchmark.run_ingest_benchmark(tmp_path / "bench", datasets=["xyz"])
+
+
+@pytest.mark.benchmark
+def test_run_ingest_benchmark_suite(tmp_path, record_property):
+    """
+    Run the ingest benchmark suite.
+
+    The numbers of rows can be set with the environment variable SOLARY_BENCHMARK_ROWS (comma
+    separated, e.g., "10000,1000000,10000000") and the results are stored in the JSON file
+    SOLARY_BENCHMARK_OUTPUT (if set).
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Run the benchmark suite
+    nr_rows = [
+        int(rows) for rows in os.environ.get("SOLARY_BENCHMARK_ROWS", "10000,100000").split(",")
+    ]
+    benchmark_report = SolarY.neo.benchmark.run_ingest_benchmark(
+        tmp_path, nr_rows=nr_rows, output=os.environ.get("SOLARY_BENCHMARK_OUTPUT")
+    )
+
+    # Report the results
+    for result in benchmark_report["results"]:
+        record_property(
+            f"{result['dataset']}_{result['nr_rows']}_{result['step']}_rows_per_sec",
+            result["rows_per_sec"],
+        )
@@ -0,0 +1,134 @@
+"""
+test_catalog.py
+
+Testing suite for SolarY/neo/catalog.py
+
+"""
+import numpy as np
+import pytest
+
+import SolarY
+
+
+def _counting_catalog(nr_rows=10):
+    """
+    Create a catalog whose loader counts the loaded columns.
+
+    Parameters
+    ----------
+    nr_rows : int, optional
+        Number of NEOs. The default is 10.
+
+    Returns
+    -------
+    neo_catalog : SolarY.neo.catalog.NEOCatalog
+        Catalog with the columns Name, SemMajAxis_AU and AbsMag_.
+    loaded_cols : list
+        Names of the loaded columns (in the order of the loads).
+    """
+    neo_columns = {
+        "Name": np.array([f"NEO{row}" for row in range(nr_rows)]),
+        "SemMajAxis_AU": np.linspace(0.5, 3.0, nr_rows),
+        "AbsMag_": np.arange(nr_rows, dtype=np.float64) + 15.0,
+    }
+    loaded_cols = []
+
+    def _loader(col_name):
+        loaded_cols.append(col_name)
+        return neo_columns[col_name]
+
+    neo_catalog = SolarY.neo.catalog.NEOCatalog(_loader, list(neo_columns), nr_rows)
+
+    return neo_catalog, loaded_cols
+
+
+def test_NEOCatalog():
+    """
+    Test the lazy columns, views and records of the NEO catalog.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Columns are loaded once, on their first access
+    neo_catalog, loaded_cols = _counting_catalog()
+    assert len(neo_catalog) == 10
+    assert loaded_cols == []
+    sem_maj_axis_au = neo_catalog["SemMajAxis_AU"]
+    neo_catalog.column("SemMajAxis_AU")
+    assert loaded_cols == ["SemMajAxis_AU"]
+
+    # Slices of slices are views of the loaded column
+    neo_view = neo_catalog[2:9][::2]
+    assert len(neo_view) == 4
+    assert np.shares_memory(neo_view["SemMajAxis_AU"], sem_maj_axis_au)
+    np.testing.assert_array_equal(neo_view["SemMajAxis_AU"], sem_maj_axis_au[2:9:2])
+    assert neo_catalog[::-1]["AbsMag_"].tolist() == list(np.arange(24.0, 14.0, -1.0))
+    assert loaded_cols == ["SemMajAxis_AU", "AbsMag_"]
+
+    # Boolean masks and row arrays of views select the rows of the views
+    neo_view = neo_catalog[neo_catalog["AbsMag_"] >= 18.0]
+    assert neo_view["Name"].tolist() == [f"NEO{row}" for row in range(3, 10)]
+    neo_view = neo_view[neo_view["AbsMag_"] < 20.0]
+    assert neo_view["Name"].tolist() == ["NEO3", "NEO4"]
+    assert neo_catalog[1:][[0, -1]]["Name"].tolist() == ["NEO1", "NEO9"]
+
+    # Records of single NEOs
+    neo_record = neo_view[-1]
+    assert neo_record["Name"] == "NEO4"
+    assert neo_record.AbsMag_ == 19.0
+    assert isinstance(neo_record["AbsMag_"], float)
+    assert neo_record.to_dict() == {
+        "Name": "NEO4",
+        "SemMajAxis_AU": pytest.approx(0.5 + 4.0 * 2.5 / 9),
+        "AbsMag_": 19.0,
+    }
+    assert not hasattr(neo_record, "__dict__")
+    assert [neo_record["Name"] for neo_record in neo_catalog[7:]] == ["NEO7", "NEO8", "NEO9"]
+
+    # Column views
+    neo_view = neo_catalog[["Name", "AbsMag_"]][:3]
+    assert neo_view.columns == ["Name", "AbsMag_"]
+    assert list(neo_view.to_dict()) == ["Name", "AbsMag_"]
+    assert neo_view[0].keys() == ["Name", "AbsMag_"]
+
+    # Invalid access
+    with pytest.raises(KeyError):
+        neo_catalog["Incl_deg"]
+    with pytest.raises(KeyError):
+        neo_view[0]["SemMajAxis_AU"]
+    with pytest.raises(AttributeError):
+        neo_catalog[0].Incl_deg
+    with pytest.raises(IndexError):
+        neo_catalog[10]
+    with pytest.raises(IndexError):
+        neo_catalog[np.ones(3, dtype=bool)]
+    with pytest.raises(IndexError):
+        neo_catalog[[0, 10]]
+
+
+def test_NEOCatalog_from_columns(tmp_path):
+    """
+    Test the catalog of memory-mapped cache columns.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Load a synthetic NEODyS file from its binary cache
+    raw_path = str(tmp_path / "neodys_synth.cat")
+    SolarY.neo.synthetic.write_neodys(raw_path, 100)
+    neo_catalog = SolarY.neo.data.load_neodys_catalog(raw_path)
+    assert len(neo_catalog) == 100
+    assert neo_catalog.columns == list(SolarY.neo.data.NEODYS_COLUMNS)
+    assert not neo_catalog["Ecc_"].flags.owndata
+    assert not neo_catalog["Ecc_"].flags.writeable
+    assert neo_catalog[5]["Name"] == "6"
+
+    # Columns of different lengths are rejected
+    with pytest.raises(ValueError):
+        SolarY.neo.catalog.NEOCatalog.from_columns({"Name": np.array(["1"]), "Ecc_": np.zeros(2)})
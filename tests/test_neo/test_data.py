@@ -4,13 +4,91 @@ test_data.py
 Testing suite for SolarY/neo/data.py
 
 """
+import concurrent.futures
+import gzip
+import os
+import shutil
 import sqlite3
+import threading
+import time
+from pathlib import Path
 
+import numpy as np
 import pytest
 
 import SolarY
 
 
+@pytest.fixture(name="neodys_sample_path")
+def fixture_neodys_sample_path():
+    """
+    Fixture to get the file path of the NEODyS sample file.
+
+    Returns
+    -------
+    neodys_sample_path : str
+        Absolute file path of the NEODyS sample file.
+
+    """
+
+    # Get the test config file paths
+    test_paths_config = SolarY.auxiliary.config.get_paths(test=True)
+
+    neodys_sample_path = SolarY.auxiliary.parse.get_test_file_path(
+        "../" + test_paths_config["neo"]["neodys_sample"]
+    )
+
+    return neodys_sample_path
+
+
+@pytest.fixture(name="granvik2018_sample_path")
+def fixture_granvik2018_sample_path():
+    """
+    Fixture to get the file path of the Granvik et al. (2018) sample file.
+
+    Returns
+    -------
+    granvik2018_sample_path : str
+        Absolute file path of the Granvik et al. (2018) sample file.
+
+    """
+
+    # Get the test config file paths
+    test_paths_config = SolarY.auxiliary.config.get_paths(test=True)
+
+    granvik2018_sample_path = SolarY.auxiliary.parse.get_test_file_path(
+        "../" + test_paths_config["neo"]["granvik2018_sample"]
+    )
+
+    return granvik2018_sample_path
+
+
+@pytest.fixture(name="synthetic_granvik2018_db")
+def fixture_synthetic_granvik2018_db(tmp_path):
+    """
+    Fixture to build Granvik et al. (2018) databases from synthetic model files.
+
+    Returns
+    -------
+    _synthetic_granvik2018_db : callable
+        Function that writes a synthetic model file with the given number of rows into the
+        temporary directory and returns the database (granvik.db) built from it in the bulk mode.
+
+    """
+
+    def _synthetic_granvik2018_db(nr_rows):
+        raw_path = str(tmp_path / "granvik_synth.dat")
+        SolarY.neo.synthetic.write_granvik2018(raw_path, nr_rows)
+        granvik2018_sqlite = SolarY.neo.data.Granvik2018Database(
+            new=True, db_filename=str(tmp_path / "granvik.db")
+        )
+        granvik2018_sqlite.create(path_filename=raw_path, bulk=True)
+
+        return granvik2018_sqlite
+
+    return _synthetic_granvik2018_db
+
+
 def test__get_neodys_neo_nr():
     """
     Testing the hidden function that gets the current number of known NEOs from the NEODyS webpage.
@@ -74,6 +152,110 @@ def test_read_neodys():
     assert pytest.approx(neo_dict_data[0]["Ecc_"], abs=1e-2) == 0.22
 
 
+def test_iter_neodys(neodys_sample_path):
+    """
+    Test the streaming reader of the NEODyS data.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # The generator must not read anything before the first item is requested
+    neo_iter = SolarY.neo.data.iter_neodys(path_filename=neodys_sample_path)
+    first_neo = next(neo_iter)
+
+    # The first entry must be (433) Eros
+    assert first_neo["Name"] == "433"
+    assert pytest.approx(first_neo["SemMajAxis_AU"], abs=1e-2) == 1.46
+    assert pytest.approx(first_neo["Ecc_"], abs=1e-2) == 0.22
+
+    # The remaining entries follow; and the list based reader must return the same content
+    neo_dict_data = [first_neo] + list(neo_iter)
+    assert len(neo_dict_data) == 6
+    assert neo_dict_data == SolarY.neo.data.read_neodys(path_filename=neodys_sample_path)
+
+
+def test_iter_neodys_chunks(neodys_sample_path):
+    """
+    Test the chunked streaming reader of the NEODyS data.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Read the sample file in chunks of 4 rows. 6 rows result in 2 chunks with 4 and 2 rows
+    neo_chunks = list(
+        SolarY.neo.data.iter_neodys_chunks(chunk_size=4, path_filename=neodys_sample_path)
+    )
+    assert [len(neo_chunk) for neo_chunk in neo_chunks] == [4, 2]
+
+    # The tuples are ordered like the column names
+    assert neo_chunks[0][0][0] == "433"
+    assert neo_chunks[1][-1][SolarY.neo.data.NEODYS_COLUMNS.index("Name")] == "2021AB"
+    assert len(neo_chunks[0][0]) == len(SolarY.neo.data.NEODYS_COLUMNS)
+
+    # Invalid chunk sizes are not accepted
+    with pytest.raises(ValueError):
+        next(SolarY.neo.data.iter_neodys_chunks(chunk_size=0, path_filename=neodys_sample_path))
+
+
+def test_load_neodys_array(neodys_sample_path):
+    """
+    Test the columnar NumPy loader of the NEODyS data.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Load the columns and compare them with the row-wise reader
+    neo_columns = SolarY.neo.data.load_neodys_array(path_filename=neodys_sample_path)
+    neo_dict_data = SolarY.neo.data.read_neodys(path_filename=neodys_sample_path)
+
+    assert set(neo_columns) == set(SolarY.neo.data.NEODYS_COLUMNS)
+    for col_name, col_values in neo_columns.items():
+        assert col_values.flags["C_CONTIGUOUS"]
+        assert col_values.tolist() == [neo_data[col_name] for neo_data in neo_dict_data]
+
+    # The names are stored without quotes, all other columns as floats
+    assert neo_columns["Name"][0] == "433"
+    assert neo_columns["SemMajAxis_AU"].dtype == np.float64
+
+
+def test_iter_neodys_shards(neodys_sample_path):
+    """
+    Test the sharded, parallel parser of the NEODyS data.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Parse the sample file with 2 workers in 3 shards. The shards are returned in order
+    neo_shards = list(
+        SolarY.neo.data.iter_neodys_shards(
+            path_filename=neodys_sample_path, workers=2, nr_shards=3
+        )
+    )
+    assert len(neo_shards) == 3
+    assert neo_shards[0]["Name"][0] == "433"
+    assert neo_shards[-1]["Name"][-1] == "2021AB"
+
+    # The merged result of the parallel loader equals the serial one
+    neo_columns = SolarY.neo.data.load_neodys_array(path_filename=neodys_sample_path)
+    neo_columns_par = SolarY.neo.data.load_neodys_array(
+        path_filename=neodys_sample_path, workers=2
+    )
+    for col_name, col_values in neo_columns.items():
+        assert np.array_equal(neo_columns_par[col_name], col_values)
+
+
 def test_NEOdysDatabase():
     """
     Test the NEODyS database.
@@ -155,6 +337,475 @@ def test_NEOdysDatabase():
     neo_sqlite.close()
 
 
+def test_NEOdysDatabase_bulk(neodys_sample_path, tmp_path):
+    """
+    Test the bulk build mode of the NEODyS database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build a database in the default mode. The stages of all build steps are collected
+    metrics = SolarY.auxiliary.metrics.StageMetrics()
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    neo_sqlite.create(path_filename=neodys_sample_path, metrics=metrics)
+    neo_sqlite.create_deriv_orb(metrics=metrics)
+    build_report = neo_sqlite.create_neo_class(metrics=metrics)
+    assert [stage_record["stage"] for stage_record in build_report["stages"]] == [
+        "parse_insert",
+        "index",
+        "deriv_orb",
+        "index",
+        "neo_class",
+        "index",
+    ]
+    assert build_report["stages"][0]["rows"] == 6
+    assert build_report["stages"][4]["rows"] == 6
+
+    # A repeated streamed build counts the parsed rows, although all of them are ignored
+    assert neo_sqlite.create(path_filename=neodys_sample_path)["stages"][0]["rows"] == 6
+    assert neo_sqlite.cur.execute("SELECT COUNT(*) FROM main").fetchone()[0] == 6
+
+    # The remaining derived columns are computed for all rows; the ones of the previous steps
+    # are not recomputed
+    deriv_counts = neo_sqlite.update_derived()
+    assert deriv_counts == {
+        "Aphel_AU": 0,
+        "Perihel_AU": 0,
+        "NEOClass": 0,
+        "TisserandJup_": 6,
+        "OrbitClass": 6,
+    }
+    exp_rows = neo_sqlite.cur.execute("SELECT * FROM main ORDER BY Name").fetchall()
+    neo_sqlite.close()
+
+    # ... and in the bulk build mode. The derived columns are inserted directly
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(
+        new=True, db_filename=str(tmp_path / "neo_bulk.db")
+    )
+    build_report = neo_sqlite.create(path_filename=neodys_sample_path, bulk=True, chunk_size=4)
+    res_rows = neo_sqlite.cur.execute("SELECT * FROM main ORDER BY Name").fetchall()
+
+    # Both databases must have the same content
+    assert res_rows == exp_rows
+
+    # The build report covers parsing, inserting and indexing
+    assert [stage_record["stage"] for stage_record in build_report["stages"]] == [
+        "parse",
+        "insert",
+        "index",
+    ]
+    assert build_report["stages"][1]["rows"] == 6
+    assert build_report["stages"][1]["rows_per_sec"] > 0.0
+    assert build_report["wall_sec"] > 0.0
+
+    # The index is created and the original SQLite settings are restored after the build
+    index_names = neo_sqlite.cur.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+    ).fetchall()
+    assert ("idx_main_NEOClass",) in index_names
+    assert neo_sqlite.cur.execute("PRAGMA synchronous").fetchone()[0] == 2
+    assert neo_sqlite.cur.execute("PRAGMA page_size").fetchone()[0] == 16384
+
+    neo_sqlite.close()
+
+
+def test_NEOdysDatabase_select(neodys_sample_path, tmp_path):
+    """
+    Test the query API of the NEODyS database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create the database from the sample file
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    neo_sqlite.create(path_filename=neodys_sample_path)
+    neo_sqlite.create_deriv_orb()
+
+    # NEOs that have not been classified yet have an empty NEO class (NULL) and are ignored by
+    # the sampler and the histogram cube
+    query_res = neo_sqlite.select(columns=["NEOClass", "AbsMag_", *SolarY.neo.population.CUBE_DIMS])
+    assert query_res["NEOClass"].tolist() == [""] * 6
+    assert neo_sqlite.sampler().neo_classes.tolist() == []
+    assert SolarY.neo.population.PopulationCube.from_columns(query_res).neo_classes.tolist() == []
+    neo_sqlite.create_neo_class()
+
+    # Query all Amors with an absolute magnitude below 20 and a perihelion of at least 1.1 AU
+    query_res = neo_sqlite.select(
+        columns=["Name", "Perihel_AU", "AbsMag_"],
+        where={"NEOClass": "Amor", "AbsMag_": (None, 20.0), "Perihel_AU": (1.1, None)},
+    )
+    assert list(query_res) == ["Name", "Perihel_AU", "AbsMag_"]
+    assert query_res["Name"].tolist() == ["433"]
+    assert query_res["AbsMag_"].dtype == np.float64
+
+    # Query with a list of values; without a projection all columns are returned
+    query_res = neo_sqlite.select(where={"Name": ["1862", "2062", "9999"]})
+    assert sorted(query_res["Name"].tolist()) == ["1862", "2062"]
+    assert sorted(query_res["NEOClass"].tolist()) == ["Apollo", "Aten"]
+    assert "SemMajAxis_AU" in query_res
+
+    # Empty results are returned as empty arrays
+    query_res = neo_sqlite.select(columns=["SemMajAxis_AU"], where={"NEOClass": "Other"})
+    assert query_res["SemMajAxis_AU"].shape == (0,)
+
+    # The predicates use the secondary indexes
+    for col_name in ["NEOClass", "AbsMag_", "Perihel_AU", "Aphel_AU", "SemMajAxis_AU"]:
+        query_plan = neo_sqlite.cur.execute(
+            f"EXPLAIN QUERY PLAN SELECT Name FROM main WHERE {col_name} = 1"
+        ).fetchall()
+        assert f"idx_main_{col_name}" in str(query_plan)
+
+    # Unknown columns are rejected
+    with pytest.raises(ValueError):
+        neo_sqlite.select(columns=["Name; DROP TABLE main"])
+
+    neo_sqlite.close()
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_NEOdysDatabase_export(neodys_sample_path, tmp_path, export_format):
+    """
+    Test the export of the NEODyS database to Parquet / Arrow IPC files.
+
+    Returns
+    -------
+    None.
+
+    """
+    pyarrow = pytest.importorskip("pyarrow")
+
+    # Create the database from the sample file and export it in record batches of 4 rows
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    neo_sqlite.create(path_filename=neodys_sample_path, bulk=True)
+    export_path = neo_sqlite.export(format=export_format, batch_size=4)
+    assert export_path == str(tmp_path / f"neo.{export_format}")
+
+    # The exported columns are typed and correspond to the database content
+    neo_table = SolarY.neo.data.load_export(export_path)
+    db_columns = neo_sqlite.select()
+    assert neo_table.column_names == list(db_columns)
+    assert neo_table.schema.field("Name").type == pyarrow.string()
+    assert neo_table.schema.field("SemMajAxis_AU").type == pyarrow.float64()
+    assert pyarrow.types.is_dictionary(neo_table.schema.field("NEOClass").type)
+    for col_name, col_values in db_columns.items():
+        assert neo_table.column(col_name).to_pylist() == col_values.tolist()
+
+    # A column selection
+    neo_table = SolarY.neo.data.load_export(export_path, columns=["Name", "NEOClass"])
+    assert neo_table.column_names == ["Name", "NEOClass"]
+
+    # Invalid input
+    with pytest.raises(ValueError):
+        neo_sqlite.export(format="csv")
+    with pytest.raises(ValueError):
+        neo_sqlite.export(format=export_format, batch_size=0)
+    with pytest.raises(ValueError):
+        SolarY.neo.data.load_export(str(tmp_path / "neo.db"))
+
+    neo_sqlite.close()
+
+
+def test_Granvik2018Database_export_arrow_zero_copy(synthetic_granvik2018_db):
+    """
+    Test the streamed export of the Granvik et al. (2018) database and its zero-copy loading.
+
+    Returns
+    -------
+    None.
+
+    """
+    pyarrow = pytest.importorskip("pyarrow")
+
+    # Create the database from a synthetic file and export it in record batches of 1000 rows
+    granvik2018_sqlite = synthetic_granvik2018_db(10000)
+    export_path = granvik2018_sqlite.export(format="arrow", batch_size=1000)
+    with pyarrow.memory_map(export_path, "r") as source:
+        assert pyarrow.ipc.open_file(source).num_record_batches == 10
+
+    # The loaded table refers to the memory-mapped file; no memory is allocated for its columns
+    allocated_bytes = pyarrow.total_allocated_bytes()
+    neo_table = SolarY.neo.data.load_export(export_path)
+    assert pyarrow.total_allocated_bytes() == allocated_bytes
+    assert neo_table.num_rows == 10000
+    assert neo_table.column("ID").type == pyarrow.int64()
+    db_columns = granvik2018_sqlite.select(columns=["ID", "SemMajAxis_AU"])
+    assert np.allclose(
+        neo_table.column("SemMajAxis_AU").to_numpy(),
+        db_columns["SemMajAxis_AU"][np.argsort(db_columns["ID"])],
+    )
+    assert set(neo_table.column("NEOClass").to_pylist()) <= {
+        "Amor",
+        "Apollo",
+        "Aten",
+        "Atira",
+        "Other",
+    }
+
+    granvik2018_sqlite.close()
+
+
+def test_ReadOnlyConnectionPool(neodys_sample_path, tmp_path):
+    """
+    Test the pool of read-only connections to the NEODyS database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create the database from the sample file and get a read pool. The database is set to WAL
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    neo_sqlite.create(path_filename=neodys_sample_path, bulk=True)
+    with neo_sqlite.read_pool() as read_pool:
+        assert neo_sqlite.cur.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        # Each thread gets its own connection; the same thread re-uses its connection. The
+        # barrier ensures that all queries run in separate threads
+        thread_cons = {}
+        barrier = threading.Barrier(4)
+
+        def _query(thread_idx):
+            with read_pool.connection() as con_1, read_pool.connection() as con_2:
+                assert con_1 is con_2
+                thread_cons[thread_idx] = con_1
+                barrier.wait()
+            return read_pool.select(columns=["Name"], where={"NEOClass": "Amor"})["Name"]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            query_results = list(executor.map(_query, range(4)))
+        assert all(sorted(query_res.tolist()) == ["1221", "433"]
+                   for query_res in query_results)
+        assert len({id(con) for con in thread_cons.values()}) == 4
+
+        # The connections are read-only
+        with read_pool.connection() as con:
+            with pytest.raises(sqlite3.OperationalError):
+                con.execute("DELETE FROM main")
+
+        # Readers are not blocked by an open write transaction and see the committed state only
+        neo_sqlite.cur.execute("DELETE FROM main WHERE Name = '433'")
+        assert len(read_pool.select(columns=["Name"])["Name"]) == 6
+        neo_sqlite.con.commit()
+        assert len(read_pool.select(columns=["Name"])["Name"]) == 5
+
+    neo_sqlite.close()
+
+
+@pytest.mark.benchmark
+def test_ReadOnlyConnectionPool_benchmark(synthetic_granvik2018_db, record_property):
+    """
+    Benchmark the read throughput of the read pool with concurrent threads and a writer.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create a synthetic database
+    granvik2018_sqlite = synthetic_granvik2018_db(50000)
+    read_pool = granvik2018_sqlite.read_pool()
+
+    # Writer that refreshes the database until all readers are done
+    readers_done = threading.Event()
+
+    def _writer():
+        writer_sqlite = SolarY.neo.data.Granvik2018Database(
+            db_filename=granvik2018_sqlite.db_filename
+        )
+        while not readers_done.is_set():
+            writer_sqlite.cur.execute("UPDATE main SET AbsMag_ = AbsMag_ WHERE ID % 50 = 0")
+            writer_sqlite.con.commit()
+        writer_sqlite.close()
+
+    def _reader(nr_queries):
+        for query_idx in range(nr_queries):
+            read_pool.select(
+                columns=["ID", "AbsMag_"],
+                where={"NEOClass": "Aten", "AbsMag_": (15.0 + query_idx % 10, 16.0)},
+            )
+
+    # Measure the queries per second for an increasing number of reader threads
+    nr_queries = 200
+    for nr_threads in [1, 2, 4]:
+        readers_done.clear()
+        writer_thread = threading.Thread(target=_writer)
+        writer_thread.start()
+        start_time = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=nr_threads) as executor:
+            list(executor.map(_reader, [nr_queries] * nr_threads))
+        queries_per_sec = nr_threads * nr_queries / (time.perf_counter() - start_time)
+        readers_done.set()
+        writer_thread.join()
+
+        record_property(f"queries_per_sec_{nr_threads}_threads", queries_per_sec)
+
+    read_pool.close()
+    granvik2018_sqlite.close()
+
+
+def test_NEOdysDatabase_update_incremental(neodys_sample_path, tmp_path):
+    """
+    Test the incremental update of the NEODyS database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create the database from the sample file. The first update inserts all NEOs
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    update_report = neo_sqlite.update(path_filename=neodys_sample_path)
+    assert update_report["changes"] == {"inserted": 6, "updated": 0, "removed": 0, "unchanged": 0}
+    assert [stage_record["stage"] for stage_record in update_report["stages"]] == [
+        "parse",
+        "diff",
+        "upsert",
+        "derived",
+        "index",
+    ]
+    assert update_report["stages"][2]["rows"] == 6
+    assert update_report["wall_sec"] >= 0.0
+
+    # A second update with the same file changes nothing. The stages are passed to the callback
+    stage_names = []
+    metrics = SolarY.auxiliary.metrics.StageMetrics(
+        callback=lambda stage_record: stage_names.append(stage_record["stage"])
+    )
+    change_report = neo_sqlite.update(path_filename=neodys_sample_path, metrics=metrics)["changes"]
+    assert change_report == {"inserted": 0, "updated": 0, "removed": 0, "unchanged": 6}
+    assert stage_names == ["parse", "diff", "upsert", "derived", "index"]
+    assert metrics.report()["stages"][2]["rows"] == 0
+
+    # Create a modified catalog: Eros gets a new orbit solution, 2021AB is removed and a new NEO
+    # is added
+    with open(neodys_sample_path) as f_temp:
+        catalog_lines = f_temp.readlines()
+    catalog_lines[6] = catalog_lines[6].replace("59600.000000   1.458045729", "59700.000000   1.5")
+    catalog_lines = [line for line in catalog_lines if "'2021AB'" not in line]
+    catalog_lines.append(
+        "'2022AA'   59700.000000   0.950000000   0.100000000   3.00000    10.00000    20.00000"
+        "    30.00000   25.00  0.15  0\n"
+    )
+    new_catalog_path = tmp_path / "neodys_new.cat"
+    new_catalog_path.write_text("".join(catalog_lines))
+
+    # Update the database and check the report
+    change_report = neo_sqlite.update_incremental(path_filename=str(new_catalog_path))["changes"]
+    assert change_report == {"inserted": 1, "updated": 1, "removed": 1, "unchanged": 4}
+
+    # The new orbit solution and its derived parameters have been upserted
+    query_res = neo_sqlite.cur.execute(
+        "SELECT Epoch_MJD, SemMajAxis_AU, Aphel_AU, Removed FROM main WHERE Name = '433'"
+    ).fetchone()
+    assert query_res[:2] == (59700.0, 1.5)
+    assert pytest.approx(query_res[2]) == 1.5 * (1.0 + 0.222838278)
+    assert query_res[3] == 0
+
+    # The new NEO has been classified; the removed NEO is marked
+    query_res = neo_sqlite.cur.execute(
+        "SELECT NEOClass FROM main WHERE Name = '2022AA'"
+    ).fetchone()
+    assert query_res[0] == "Aten"
+    query_res = neo_sqlite.cur.execute("SELECT Removed FROM main WHERE Name = '2021AB'").fetchone()
+    assert query_res[0] == 1
+
+    # A removed NEO that re-appears in the catalog is updated and not marked anymore
+    change_report = neo_sqlite.update_incremental(path_filename=neodys_sample_path)["changes"]
+    assert change_report == {"inserted": 0, "updated": 2, "removed": 1, "unchanged": 4}
+    query_res = neo_sqlite.cur.execute("SELECT Removed FROM main WHERE Name = '2021AB'").fetchone()
+    assert query_res[0] == 0
+
+    # A re-fitted orbit at the same epoch is updated, too
+    with open(neodys_sample_path) as f_temp:
+        catalog_lines = f_temp.readlines()
+    catalog_lines[6] = catalog_lines[6].replace("1.458045729", "1.958045729")
+    new_catalog_path.write_text("".join(catalog_lines))
+    change_report = neo_sqlite.update_incremental(path_filename=str(new_catalog_path))["changes"]
+    assert change_report == {"inserted": 0, "updated": 1, "removed": 0, "unchanged": 5}
+    query_res = neo_sqlite.cur.execute(
+        "SELECT Epoch_MJD, SemMajAxis_AU, Aphel_AU FROM main WHERE Name = '433'"
+    ).fetchone()
+    assert query_res[:2] == (59600.0, 1.958045729)
+    assert pytest.approx(query_res[2]) == 1.958045729 * (1.0 + 0.222838278)
+
+    neo_sqlite.close()
+
+
+def test_NEOdysDatabase_update_derived(neodys_sample_path, tmp_path, monkeypatch):
+    """
+    Test the derived-column pipeline and its dirty tracking.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Use a copy of the registry; the registration below shall not affect other tests
+    monkeypatch.setattr(
+        SolarY.neo.data, "DERIVED_COLUMNS", dict(SolarY.neo.data.DERIVED_COLUMNS)
+    )
+
+    # Build the database in the bulk build mode. No row is dirty afterwards
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    neo_sqlite.create(path_filename=neodys_sample_path, bulk=True)
+    assert set(neo_sqlite.update_derived().values()) == {0}
+
+    # The Tisserand parameter corresponds to the scalar function
+    query_res = neo_sqlite.cur.execute(
+        "SELECT SemMajAxis_AU, Incl_deg, Ecc_, TisserandJup_ FROM main WHERE Name = '433'"
+    ).fetchone()
+    assert pytest.approx(query_res[3]) == SolarY.general.astrodyn.tisserand(
+        sem_maj_axis_obj=query_res[0], inc=np.radians(query_res[1]), ecc=query_res[2]
+    )
+
+    # A changed input marks only the dependent columns of the changed row
+    neo_sqlite.cur.execute("UPDATE main SET Ecc_ = 0.9 WHERE Name = '433'")
+    neo_sqlite.cur.execute("UPDATE main SET AbsMag_ = 30.0 WHERE Name = '1862'")
+    neo_sqlite.con.commit()
+    deriv_counts = neo_sqlite.update_derived(columns=["NEOClass"])
+    assert deriv_counts == {"Aphel_AU": 1, "Perihel_AU": 1, "NEOClass": 1}
+    query_res = neo_sqlite.cur.execute(
+        "SELECT Perihel_AU, NEOClass FROM main WHERE Name = '433'"
+    ).fetchone()
+    assert pytest.approx(query_res[0]) == 1.458045729 * 0.1
+    assert query_res[1] == "Apollo"
+    assert neo_sqlite.update_derived() == {
+        "Aphel_AU": 0,
+        "Perihel_AU": 0,
+        "NEOClass": 0,
+        "TisserandJup_": 1,
+        "OrbitClass": 1,
+    }
+
+    # A new column is created and computed for all rows
+    SolarY.neo.data.register_derived_column(
+        "PerihelRatio_", "FLOAT", ("Perihel_AU", "SemMajAxis_AU"), lambda q, a: q / a
+    )
+    assert neo_sqlite.update_derived(columns=["PerihelRatio_"])["PerihelRatio_"] == 6
+    query_res = neo_sqlite.select(columns=["Ecc_", "PerihelRatio_"])
+    assert query_res["PerihelRatio_"] == pytest.approx(1.0 - query_res["Ecc_"])
+
+    # Cyclic dependencies and unknown columns are rejected
+    with pytest.raises(ValueError):
+        SolarY.neo.data.register_derived_column(
+            "Perihel_AU", "FLOAT", ("PerihelRatio_",), lambda ratio: ratio
+        )
+    with pytest.raises(ValueError):
+        neo_sqlite.update_derived(columns=["Name"])
+
+    neo_sqlite.close()
+
+
 def test_download_granvik2018():
     """
     Testing the download of the Granvik et al. (2018) NEO data.
@@ -192,6 +843,156 @@ def test_read_granvik2018():
     assert pytest.approx(neo_dict_data[0]["AbsMag_"]) == 21.0643673
 
 
+def test_load_granvik2018_array(granvik2018_sample_path):
+    """
+    Test the columnar NumPy loader of the Granvik et al. (2018) data.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Load the columns and compare them with the row-wise reader
+    neo_columns = SolarY.neo.data.load_granvik2018_array(path_filename=granvik2018_sample_path)
+    neo_dict_data = SolarY.neo.data.read_granvik2018(path_filename=granvik2018_sample_path)
+
+    assert tuple(neo_columns) == SolarY.neo.data.GRANVIK2018_COLUMNS
+    for col_name, col_values in neo_columns.items():
+        assert col_values.flags["C_CONTIGUOUS"]
+        assert col_values.dtype == np.float64
+        assert col_values.tolist() == [neo_data[col_name] for neo_data in neo_dict_data]
+
+    # Check the very first entry
+    assert neo_columns["SemMajAxis_AU"][0] == 2.57498121
+    assert neo_columns["AbsMag_"][0] == 21.0643673
+
+
+def test_read_granvik2018_gzip(granvik2018_sample_path, tmp_path):
+    """
+    Test the readers of the Granvik et al. (2018) data with a gzip compressed file.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Compress the sample file
+    gzip_path = tmp_path / "granvik2018.dat.gz"
+    with open(granvik2018_sample_path, "rb") as f_in, gzip.open(gzip_path, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+
+    # Both readers must return the same content as for the uncompressed file
+    assert SolarY.neo.data.read_granvik2018(
+        path_filename=str(gzip_path)
+    ) == SolarY.neo.data.read_granvik2018(path_filename=granvik2018_sample_path)
+
+    neo_columns = SolarY.neo.data.load_granvik2018_array(path_filename=granvik2018_sample_path)
+    neo_columns_gzip = SolarY.neo.data.load_granvik2018_array(path_filename=str(gzip_path))
+    for col_name, col_values in neo_columns.items():
+        assert np.array_equal(neo_columns_gzip[col_name], col_values)
+
+
+def test_iter_granvik2018_shards(granvik2018_sample_path):
+    """
+    Test the sharded, parallel parser of the Granvik et al. (2018) data.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Parse the sample file in 4 shards. The merged shards equal the serial result
+    neo_columns = SolarY.neo.data.load_granvik2018_array(path_filename=granvik2018_sample_path)
+    neo_shards = list(
+        SolarY.neo.data.iter_granvik2018_shards(
+            path_filename=granvik2018_sample_path, workers=2, nr_shards=4
+        )
+    )
+    assert len(neo_shards) == 4
+    for col_name, col_values in neo_columns.items():
+        assert np.array_equal(
+            np.concatenate([neo_shard[col_name] for neo_shard in neo_shards]), col_values
+        )
+
+
+@pytest.mark.benchmark
+def test_load_granvik2018_array_benchmark(tmp_path, record_property):
+    """
+    Benchmark the scaling of the parallel Granvik et al. (2018) parser from 1 to N cores.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Write a synthetic model file
+    nr_rows = 400000
+    raw_path = str(tmp_path / "granvik_synth.dat")
+    SolarY.neo.synthetic.write_granvik2018(raw_path, nr_rows)
+
+    # Parse the file with an increasing number of workers
+    max_workers = max(os.cpu_count() or 1, 2)
+    parse_times = {}
+    for workers in sorted({1, 2, max_workers // 2, max_workers} - {0}):
+        start_time = time.perf_counter()
+        neo_columns = SolarY.neo.data.load_granvik2018_array(
+            path_filename=raw_path, workers=workers
+        )
+        parse_times[workers] = time.perf_counter() - start_time
+        assert len(neo_columns["SemMajAxis_AU"]) == nr_rows
+
+    # Report the rows per second and the speed-up w.r.t. a single worker
+    for workers, parse_time in parse_times.items():
+        record_property(f"rows_per_sec_{workers}_workers", nr_rows / parse_time)
+        record_property(f"speed_up_{workers}_workers", parse_times[1] / parse_time)
+
+
+def test_load_granvik2018_array_cache(granvik2018_sample_path, tmp_path):
+    """
+    Test the memory-mapped binary cache of the Granvik et al. (2018) loader.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Copy the sample file into a temporary directory, since the cache is stored next to it
+    raw_path = tmp_path / "granvik2018.dat"
+    shutil.copyfile(granvik2018_sample_path, raw_path)
+
+    # The first call parses the file and creates the cache; the result is memory-mapped
+    neo_columns = SolarY.neo.data.load_granvik2018_array(path_filename=str(raw_path), cache=True)
+    assert isinstance(neo_columns["SemMajAxis_AU"], np.memmap)
+    assert neo_columns["SemMajAxis_AU"][0] == 2.57498121
+
+    # The cache is keyed by the SHA256 hash of the raw file
+    sha256_hash = SolarY.auxiliary.parse.comp_sha256(raw_path)
+    cache_root = tmp_path / "granvik2018.dat.cache"
+    assert (cache_root / sha256_hash / "SemMajAxis_AU.npy").exists()
+
+    # The second call uses the cache and returns the same content
+    neo_columns_cached = SolarY.neo.data.load_granvik2018_array(
+        path_filename=str(raw_path), cache=True
+    )
+    for col_name, col_values in neo_columns.items():
+        assert np.array_equal(neo_columns_cached[col_name], col_values)
+
+    # Modify the raw file. The cache is invalidated and rebuilt; the outdated cache is deleted
+    with raw_path.open(mode="a") as f_temp:
+        f_temp.write("   1.0   0.1   1.0   1.0   1.0   1.0   25.0\n")
+    neo_columns_new = SolarY.neo.data.load_granvik2018_array(
+        path_filename=str(raw_path), cache=True
+    )
+    assert len(neo_columns_new["AbsMag_"]) == len(neo_columns["AbsMag_"]) + 1
+    assert not (cache_root / sha256_hash).exists()
+    assert (cache_root / SolarY.auxiliary.parse.comp_sha256(raw_path)).exists()
+
+
 def test_Granvik2018Database():
     """
     Test the Granvik et al. (2018) SQLite database
@@ -239,6 +1040,539 @@ def test_Granvik2018Database():
     granvik2018_sqlite.close()
 
 
+def test_Granvik2018Database_bulk(granvik2018_sample_path, tmp_path):
+    """
+    Test the bulk build mode of the Granvik et al. (2018) database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database in the bulk build mode and check the first entry (including the derived
+    # parameters)
+    granvik2018_sqlite = SolarY.neo.data.Granvik2018Database(
+        new=True, db_filename=str(tmp_path / "granvik.db")
+    )
+    granvik2018_sqlite.create(path_filename=granvik2018_sample_path, bulk=True)
+    query_res = granvik2018_sqlite.cur.execute(
+        "SELECT SemMajAxis_AU, Ecc_, Aphel_AU, Perihel_AU, NEOClass FROM main WHERE ID = 1"
+    ).fetchone()
+    assert query_res == (2.57498121, 0.783616960, 4.592780157837321, 0.5571822621626783, "Apollo")
+
+    # All rows have been inserted
+    assert granvik2018_sqlite.cur.execute("SELECT COUNT(*) FROM main").fetchone()[0] == 6
+
+    granvik2018_sqlite.close()
+
+
+@pytest.mark.benchmark
+def test_Granvik2018Database_bulk_benchmark(tmp_path, record_property):
+    """
+    Benchmark the bulk build mode of the Granvik et al. (2018) database.
+
+    The number of inserted rows per second (raw data and derived parameters) of the bulk build and
+    of the default build (create, create_deriv_orb and create_neo_class) are reported.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Write a synthetic model file
+    nr_rows = 100000
+    raw_path = str(tmp_path / "granvik_synth.dat")
+    SolarY.neo.synthetic.write_granvik2018(raw_path, nr_rows)
+
+    # Build the database in both modes and measure the rows per second
+    rows_per_sec = {}
+    for bulk in [False, True]:
+        granvik2018_sqlite = SolarY.neo.data.Granvik2018Database(
+            new=True, db_filename=str(tmp_path / f"granvik_{bulk}.db")
+        )
+        start_time = time.perf_counter()
+        granvik2018_sqlite.create(path_filename=raw_path, bulk=bulk)
+        if not bulk:
+            granvik2018_sqlite.create_deriv_orb()
+            granvik2018_sqlite.create_neo_class()
+        rows_per_sec[bulk] = nr_rows / (time.perf_counter() - start_time)
+
+        assert granvik2018_sqlite.cur.execute("SELECT COUNT(*) FROM main").fetchone()[0] == nr_rows
+        granvik2018_sqlite.close()
+
+    # Report the results
+    record_property("rows_per_sec_default", rows_per_sec[False])
+    record_property("rows_per_sec_bulk", rows_per_sec[True])
+
+
+def test_Granvik2018Database_rtree(synthetic_granvik2018_db):
+    """
+    Test the R*Tree index of the Granvik et al. (2018) database for box queries.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database from a synthetic file
+    granvik2018_sqlite = synthetic_granvik2018_db(20000)
+    assert granvik2018_sqlite.cur.execute("SELECT COUNT(*) FROM main_rtree").fetchone()[0] == 20000
+
+    # Box queries use the R*Tree; single ranges are served by the secondary indexes
+    box_where = {"SemMajAxis_AU": (0.9, 1.1), "Ecc_": (None, 0.2), "Incl_deg": (None, 5.0)}
+    assert SolarY.neo.data._rtree_sql(granvik2018_sqlite.cur, box_where)[0]
+    assert not SolarY.neo.data._rtree_sql(
+        granvik2018_sqlite.cur, {"SemMajAxis_AU": (0.9, 1.1), "NEOClass": "Aten"}
+    )[0]
+
+    # The box query returns exactly the objects within the box
+    all_columns = granvik2018_sqlite.select(columns=["ID", "SemMajAxis_AU", "Ecc_", "Incl_deg"])
+    exp_mask = (
+        (all_columns["SemMajAxis_AU"] >= 0.9)
+        & (all_columns["SemMajAxis_AU"] < 1.1)
+        & (all_columns["Ecc_"] < 0.2)
+        & (all_columns["Incl_deg"] < 5.0)
+    )
+    query_res = granvik2018_sqlite.select(columns=["ID"], where=box_where)
+    assert sorted(query_res["ID"].tolist()) == sorted(all_columns["ID"][exp_mask].tolist())
+    assert len(query_res["ID"]) > 0
+
+    # The R*Tree is maintained on updates and deletions of the main table
+    granvik2018_sqlite.cur.execute(
+        "UPDATE main SET SemMajAxis_AU = 1.0, Ecc_ = 0.1, Incl_deg = 1.0 WHERE ID = 1"
+    )
+    assert 1 in granvik2018_sqlite.select(columns=["ID"], where=box_where)["ID"]
+    granvik2018_sqlite.cur.execute("DELETE FROM main WHERE ID = 1")
+    assert 1 not in granvik2018_sqlite.select(columns=["ID"], where=box_where)["ID"]
+    assert granvik2018_sqlite.cur.execute("SELECT COUNT(*) FROM main_rtree").fetchone()[0] == 19999
+
+    granvik2018_sqlite.close()
+
+
+def test_NEOdysDatabase_rtree(neodys_sample_path, tmp_path):
+    """
+    Test the R*Tree index of the NEODyS database in the default build and in the update.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # The R*Tree is built, once the derived orbital elements exist
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    neo_sqlite.create(path_filename=neodys_sample_path)
+    rtree_exists_sql = "SELECT COUNT(*) FROM sqlite_master WHERE name = 'main_rtree'"
+    assert neo_sqlite.cur.execute(rtree_exists_sql).fetchone()[0] == 0
+    neo_sqlite.create_deriv_orb()
+    assert neo_sqlite.cur.execute(rtree_exists_sql).fetchone()[0] == 1
+
+    # Box query of the perihelion and aphelion
+    query_res = neo_sqlite.select(
+        columns=["Name"], where={"Perihel_AU": (1.0, 1.3), "Aphel_AU": (1.5, None)}
+    )
+    assert sorted(query_res["Name"].tolist()) == ["1221", "433"]
+
+    # Upserts of the incremental update are reflected by the R*Tree
+    neo_sqlite.update_incremental(path_filename=neodys_sample_path)
+    assert neo_sqlite.cur.execute("SELECT COUNT(*) FROM main_rtree").fetchone()[0] == 6
+    neo_sqlite.cur.execute("UPDATE main SET Perihel_AU = 5.0 WHERE Name = '433'")
+    query_res = neo_sqlite.select(
+        columns=["Name"], where={"Perihel_AU": (1.0, 1.3), "Aphel_AU": (1.5, None)}
+    )
+    assert query_res["Name"].tolist() == ["1221"]
+
+    neo_sqlite.close()
+
+
+def test_Granvik2018Database_sampler(synthetic_granvik2018_db):
+    """
+    Test the sampler of the Granvik et al. (2018) database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database from a synthetic file and get a sampler. The sampler does not access the
+    # database anymore
+    granvik2018_sqlite = synthetic_granvik2018_db(20000)
+    db_columns = granvik2018_sqlite.select(columns=["ID", "NEOClass", "AbsMag_"])
+    sampler = granvik2018_sqlite.sampler(columns=["ID", "SemMajAxis_AU"])
+    granvik2018_sqlite.close()
+    assert set(sampler.neo_columns) == {"ID", "SemMajAxis_AU", "NEOClass", "AbsMag_"}
+    assert sampler.bucket_counts.sum() == 20000
+    assert sampler.bucket_counts.shape == (len(sampler.neo_classes), len(sampler.abs_mag_edges) - 1)
+
+    # The absolute magnitude bins span the magnitudes of the model, starting at the smallest one
+    assert sampler.abs_mag_edges[0] <= db_columns["AbsMag_"].min()
+    assert sampler.abs_mag_edges[0] > db_columns["AbsMag_"].min() - 0.25
+    assert sampler.abs_mag_edges[-1] > db_columns["AbsMag_"].max()
+    assert sampler.bucket_counts[:, 0].sum() > 0
+
+    # Without NEOs, the sampler has a single empty bin starting at 0
+    empty_sampler = SolarY.neo.data.NEOSampler(
+        {"NEOClass": np.array([], dtype=np.str_), "AbsMag_": np.array([], dtype=np.float64)}
+    )
+    assert empty_sampler.abs_mag_edges.tolist() == [0.0, 0.25]
+    assert empty_sampler.bucket_counts.shape == (0, 1)
+
+    # Constrained draws fulfil the constraints exactly and cover all matching NEOs
+    rng = np.random.default_rng(0)
+    neo_draws = sampler.draw(
+        50000, neo_classes=["Apollo", "Aten"], abs_mag=(18.1, 22.3), rng=rng
+    )
+    assert len(neo_draws["ID"]) == 50000
+    assert set(neo_draws["NEOClass"].tolist()) == {"Apollo", "Aten"}
+    assert neo_draws["AbsMag_"].min() >= 18.1
+    assert neo_draws["AbsMag_"].max() < 22.3
+    exp_mask = (
+        np.isin(db_columns["NEOClass"], ["Apollo", "Aten"])
+        & (db_columns["AbsMag_"] >= 18.1)
+        & (db_columns["AbsMag_"] < 22.3)
+    )
+    assert set(neo_draws["ID"].tolist()) <= set(db_columns["ID"][exp_mask].tolist())
+
+    # Uniform draws reproduce the class fractions of the model
+    neo_draws = sampler.draw(200000, rng=rng)
+    for neo_class in sampler.neo_classes:
+        assert np.mean(neo_draws["NEOClass"] == neo_class) == pytest.approx(
+            np.mean(db_columns["NEOClass"] == neo_class), abs=0.01
+        )
+
+    # Stratified draws allocate the draws proportionally to the buckets
+    neo_draws = sampler.draw(20000, stratified=True, rng=rng)
+    draw_counts = np.array(
+        [
+            np.histogram(
+                neo_draws["AbsMag_"][neo_draws["NEOClass"] == neo_class], sampler.abs_mag_edges
+            )[0]
+            for neo_class in sampler.neo_classes
+        ]
+    )
+    assert np.array_equal(draw_counts, sampler.bucket_counts)
+
+    # Weighted draws: Atens are excluded by a zero weight
+    weights = np.ones(sampler.bucket_counts.shape)
+    weights[sampler.neo_classes.tolist().index("Aten")] = 0.0
+    neo_draws = sampler.draw(10000, weights=weights, rng=rng)
+    assert "Aten" not in neo_draws["NEOClass"]
+
+    # Invalid draws
+    with pytest.raises(ValueError):
+        sampler.draw(10, neo_classes=["Aten"], abs_mag=(40.0, None), rng=rng)
+    with pytest.raises(ValueError):
+        sampler.draw(10, weights=np.ones(3), rng=rng)
+
+
+@pytest.mark.benchmark
+def test_Granvik2018Database_sampler_benchmark(synthetic_granvik2018_db, record_property):
+    """
+    Benchmark constrained draws of the sampler of the Granvik et al. (2018) database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database from a synthetic file and get a sampler
+    granvik2018_sqlite = synthetic_granvik2018_db(200000)
+    start_time = time.perf_counter()
+    sampler = granvik2018_sqlite.sampler()
+    index_sec = time.perf_counter() - start_time
+    granvik2018_sqlite.close()
+
+    # Measure the draws per second of repeated constrained draws
+    nr_draws = 1000000
+    rng = np.random.default_rng(0)
+    start_time = time.perf_counter()
+    for _ in range(5):
+        sampler.draw(nr_draws, neo_classes=["Apollo"], abs_mag=(18.0, 22.0), rng=rng)
+    draws_per_sec = 5 * nr_draws / (time.perf_counter() - start_time)
+
+    # Report the results
+    record_property("sampler_index_sec", index_sec)
+    record_property("draws_per_sec", draws_per_sec)
+
+
+@pytest.mark.benchmark
+def test_Granvik2018Database_rtree_benchmark(synthetic_granvik2018_db, record_property):
+    """
+    Benchmark box queries of the Granvik et al. (2018) database with and without R*Tree.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database from a synthetic file
+    granvik2018_sqlite = synthetic_granvik2018_db(200000)
+
+    # Measure the queries per second of narrow population slices, with the R*Tree and after
+    # dropping it (secondary indexes only)
+    nr_queries = 50
+    queries_per_sec = {}
+    query_results = {}
+    for rtree in [True, False]:
+        if not rtree:
+            granvik2018_sqlite.cur.execute("DROP TABLE main_rtree")
+        start_time = time.perf_counter()
+        query_results[rtree] = [
+            granvik2018_sqlite.select(
+                columns=["ID"],
+                where={
+                    "SemMajAxis_AU": (0.9 + 0.05 * query_idx, 1.0 + 0.05 * query_idx),
+                    "Ecc_": (None, 0.2),
+                    "Incl_deg": (None, 5.0),
+                },
+            )["ID"].tolist()
+            for query_idx in range(nr_queries)
+        ]
+        queries_per_sec[rtree] = nr_queries / (time.perf_counter() - start_time)
+
+    # Report the results
+    record_property("queries_per_sec_rtree", queries_per_sec[True])
+    record_property("queries_per_sec_index", queries_per_sec[False])
+
+    assert [sorted(res) for res in query_results[True]] == [
+        sorted(res) for res in query_results[False]
+    ]
+    granvik2018_sqlite.close()
+
+
+def test_Granvik2018Database_catalog(synthetic_granvik2018_db):
+    """
+    Test the catalog of the Granvik et al. (2018) database with lazily queried columns.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database from a synthetic file
+    granvik2018_sqlite = synthetic_granvik2018_db(1000)
+
+    # The catalog of the Atens corresponds to the query results
+    neo_catalog = granvik2018_sqlite.catalog(
+        columns=["ID", "SemMajAxis_AU", "NEOClass"], where={"NEOClass": "Aten"}
+    )
+    exp_columns = granvik2018_sqlite.select(
+        columns=["ID", "SemMajAxis_AU"], where={"NEOClass": "Aten"}
+    )
+    assert len(neo_catalog) == len(exp_columns["ID"])
+    assert neo_catalog["ID"].tolist() == sorted(exp_columns["ID"].tolist())
+    assert set(neo_catalog["NEOClass"].tolist()) == {"Aten"}
+    neo_record = neo_catalog[0]
+    assert neo_record["SemMajAxis_AU"] < 1.0
+
+    # Writes invalidate the catalog: loaded columns remain available, new ones are rejected
+    neo_catalog = granvik2018_sqlite.catalog(columns=["ID", "Ecc_"], where={"NEOClass": "Aten"})
+    exp_ids = neo_catalog["ID"].tolist()
+    granvik2018_sqlite.cur.execute("DELETE FROM main WHERE ID = ?", (exp_ids[0],))
+    granvik2018_sqlite.con.commit()
+    assert neo_catalog["ID"].tolist() == exp_ids
+    with pytest.raises(ValueError):
+        neo_catalog["Ecc_"]
+    assert len(granvik2018_sqlite.catalog(where={"NEOClass": "Aten"})) == len(exp_ids) - 1
+
+    # Unknown columns are rejected
+    with pytest.raises(ValueError):
+        granvik2018_sqlite.catalog(columns=["Name"])
+    with pytest.raises(ValueError):
+        granvik2018_sqlite.catalog(where={"Name": "433"})
+
+    granvik2018_sqlite.close()
+
+
+def test_Granvik2018Database_in_memory(synthetic_granvik2018_db, tmp_path):
+    """
+    Test the in-memory snapshot mode of the Granvik et al. (2018) database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database from a synthetic file without the indexes
+    granvik2018_sqlite = synthetic_granvik2018_db(2000)
+    db_filename = granvik2018_sqlite.db_filename
+    granvik2018_sqlite._drop_indexes()
+    exp_columns = granvik2018_sqlite.select(where={"NEOClass": "Amor"})
+    granvik2018_sqlite.close()
+
+    # Load the snapshot. The indexes are built in memory only; the queries are served from memory
+    granvik2018_mem = SolarY.neo.data.Granvik2018Database(db_filename=db_filename, in_memory=True)
+    index_names = granvik2018_mem.cur.execute("SELECT name FROM sqlite_master").fetchall()
+    assert ("idx_main_NEOClass",) in index_names
+    assert ("main_rtree",) in index_names
+    file_con = sqlite3.connect(db_filename)
+    assert ("idx_main_NEOClass",) not in file_con.execute(
+        "SELECT name FROM sqlite_master"
+    ).fetchall()
+    res_columns = granvik2018_mem.select(where={"NEOClass": "Amor"})
+    for col_name, col_values in exp_columns.items():
+        np.testing.assert_array_equal(res_columns[col_name], col_values)
+
+    # The snapshot is only reloaded, if the file has changed
+    assert not granvik2018_mem.refresh()
+    file_con.execute("DELETE FROM main WHERE ID <= 500")
+    file_con.commit()
+    file_con.close()
+    assert granvik2018_mem.refresh()
+    assert granvik2018_mem.cur.execute("SELECT COUNT(*) FROM main").fetchone()[0] == 1500
+
+    # The histogram cube corresponds to the snapshot
+    assert granvik2018_mem.histogram_cube().query() == 1500
+
+    # Changes of the snapshot are not written into the file; a forced refresh discards them (and
+    # invalidates the catalogs of the previous snapshot)
+    neo_catalog = granvik2018_mem.catalog(columns=["ID", "Ecc_"])
+    granvik2018_mem.cur.execute("DELETE FROM main")
+    assert granvik2018_mem.refresh(force=True)
+    assert granvik2018_mem.cur.execute("SELECT COUNT(*) FROM main").fetchone()[0] == 1500
+    with pytest.raises(ValueError):
+        neo_catalog["ID"]
+    granvik2018_mem.close()
+
+    # File paths with URI special characters are loaded read-only as well
+    special_dir = tmp_path / "snap#1%20?x"
+    special_dir.mkdir()
+    special_filename = str(special_dir / "granvik.db")
+    shutil.copyfile(db_filename, special_filename)
+    tmp_files = sorted(os.listdir(tmp_path))
+    granvik2018_mem = SolarY.neo.data.Granvik2018Database(
+        db_filename=special_filename, in_memory=True
+    )
+    assert granvik2018_mem.cur.execute("SELECT COUNT(*) FROM main").fetchone()[0] == 1500
+    assert len(granvik2018_mem.select(columns=["ID"])["ID"]) == 1500
+    assert sorted(os.listdir(tmp_path)) == tmp_files
+    assert os.listdir(special_dir) == ["granvik.db"]
+
+    # Invalid usage
+    with pytest.raises(ValueError):
+        granvik2018_mem.read_pool()
+    granvik2018_mem.close()
+    with pytest.raises(ValueError):
+        SolarY.neo.data.Granvik2018Database(new=True, db_filename=db_filename, in_memory=True)
+    with pytest.raises(FileNotFoundError):
+        SolarY.neo.data.Granvik2018Database(
+            db_filename=str(tmp_path / "missing.db"), in_memory=True
+        )
+    granvik2018_sqlite = SolarY.neo.data.Granvik2018Database(db_filename=db_filename)
+    with pytest.raises(ValueError):
+        granvik2018_sqlite.refresh()
+    granvik2018_sqlite.close()
+
+
+def test_Granvik2018Database_histogram_cube(synthetic_granvik2018_db):
+    """
+    Test the cached population histogram cube of the Granvik et al. (2018) database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database from a synthetic file and get the histogram cube
+    granvik2018_sqlite = synthetic_granvik2018_db(20000)
+    db_path = granvik2018_sqlite.db_filename
+    pop_cube = granvik2018_sqlite.histogram_cube()
+    cube_files = list(Path(f"{db_path}.cache").glob("*/cube_*.npz"))
+    assert len(cube_files) == 1
+
+    # The counts correspond to the SQL aggregates
+    for neo_class, class_count in granvik2018_sqlite.cur.execute(
+        "SELECT NEOClass, COUNT(*) FROM main WHERE Incl_deg < 20.0 AND AbsMag_ >= 18.0 "
+        "GROUP BY NEOClass"
+    ).fetchall():
+        assert (
+            int(
+                pop_cube.query(
+                    where={"NEOClass": neo_class, "Incl_deg": (None, 20.0), "AbsMag_": (18.0, None)}
+                )
+            )
+            == class_count
+        )
+
+    # The cube is loaded from the cache file as long as the database is unchanged
+    cube_mtime = cube_files[0].stat().st_mtime_ns
+    assert np.array_equal(granvik2018_sqlite.histogram_cube().counts, pop_cube.counts)
+    assert cube_files[0].stat().st_mtime_ns == cube_mtime
+
+    # Other bin edges get a separate cube file
+    coarse_cube = granvik2018_sqlite.histogram_cube(edges={"AbsMag_": np.linspace(15.0, 25.0, 5)})
+    assert coarse_cube.counts.shape[3] == 4
+    assert len(list(Path(f"{db_path}.cache").glob("*/cube_*.npz"))) == 2
+
+    # A modification of the database invalidates the cube
+    granvik2018_sqlite.cur.execute("DELETE FROM main WHERE Incl_deg < 20.0")
+    granvik2018_sqlite.con.commit()
+    pop_cube = granvik2018_sqlite.histogram_cube()
+    assert int(pop_cube.query(where={"Incl_deg": (None, 20.0)})) == 0
+    assert not cube_files[0].exists()
+    granvik2018_sqlite.close()
+
+
+@pytest.mark.benchmark
+def test_Granvik2018Database_histogram_cube_benchmark(synthetic_granvik2018_db, record_property):
+    """
+    Benchmark sliced counts of the histogram cube against SQL aggregates.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the database from a synthetic file and the histogram cube
+    granvik2018_sqlite = synthetic_granvik2018_db(200000)
+    start_time = time.perf_counter()
+    pop_cube = granvik2018_sqlite.histogram_cube()
+    build_sec = time.perf_counter() - start_time
+
+    # Measure the milliseconds per query of absolute magnitude distributions per class
+    nr_queries = 18
+    query_ms = {}
+    start_time = time.perf_counter()
+    cube_counts = [
+        pop_cube.query(
+            where={"Incl_deg": (None, 5.0 * (query_idx + 1))}, dims=["AbsMag_", "NEOClass"]
+        )
+        for query_idx in range(nr_queries)
+    ]
+    query_ms["cube"] = 1000.0 * (time.perf_counter() - start_time) / nr_queries
+    start_time = time.perf_counter()
+    sql_counts = [
+        granvik2018_sqlite.cur.execute(
+            "SELECT NEOClass, CAST((AbsMag_ - 15.0) / 0.5 AS INTEGER) AS bin, COUNT(*) FROM main "
+            "WHERE Incl_deg < ? AND AbsMag_ >= 15.0 AND AbsMag_ < 25.0 GROUP BY NEOClass, bin",
+            (5.0 * (query_idx + 1),),
+        ).fetchall()
+        for query_idx in range(nr_queries)
+    ]
+    query_ms["sql"] = 1000.0 * (time.perf_counter() - start_time) / nr_queries
+    granvik2018_sqlite.close()
+
+    # Report the results
+    record_property("cube_build_sec", build_sec)
+    record_property("cube_query_ms", query_ms["cube"])
+    record_property("sql_query_ms", query_ms["sql"])
+
+    neo_classes = pop_cube.neo_classes.tolist()
+    for cube_res, sql_res in zip(cube_counts, sql_counts):
+        assert cube_res.sum() == sum(row[2] for row in sql_res)
+        for neo_class, bin_idx, bin_count in sql_res:
+            assert cube_res[bin_idx, neo_classes.index(neo_class)] == bin_count
+
 # test_download()
 # test_download_granvik2018()
 # test__get_neodys_neo_nr()
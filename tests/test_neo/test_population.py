@@ -0,0 +1,106 @@
+"""
+test_population.py
+
+Testing suite for SolarY/neo/population.py
+
+"""
+import numpy as np
+import pytest
+
+import SolarY
+
+
+def _random_population(nr_neos, seed=0):
+    """
+    Draw a random NEO population.
+
+    Parameters
+    ----------
+    nr_neos : int
+        Number of NEOs.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the columns SemMajAxis_AU, Ecc_, Incl_deg, AbsMag_ and NEOClass.
+
+    """
+    rng = np.random.default_rng(seed)
+    neo_columns = {
+        "SemMajAxis_AU": rng.uniform(0.6, 4.2, nr_neos),
+        "Ecc_": rng.uniform(0.0, 0.95, nr_neos),
+        "Incl_deg": rng.uniform(0.0, 60.0, nr_neos),
+        "AbsMag_": rng.uniform(15.0, 25.0, nr_neos),
+        "NEOClass": rng.choice(["Amor", "Apollo", "Aten"], nr_neos),
+    }
+
+    return neo_columns
+
+
+def test_PopulationCube(tmp_path):
+    """
+    Test the counts of the population histogram cube.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Build the cube; all NEOs are within the default edges
+    neo_columns = _random_population(50000)
+    pop_cube = SolarY.neo.population.PopulationCube.from_columns(neo_columns)
+    assert pop_cube.counts.shape == (22, 20, 18, 20, 3)
+    assert pop_cube.neo_classes.tolist() == ["Amor", "Apollo", "Aten"]
+    assert int(pop_cube.query()) == 50000
+
+    # Sliced marginal counts correspond to the counts of the individual NEOs
+    aten_h_counts = pop_cube.query(
+        where={"NEOClass": "Aten", "Incl_deg": (None, 10.0), "SemMajAxis_AU": (0.8, 1.0)},
+        dims=["AbsMag_"],
+    )
+    exp_mask = (
+        (neo_columns["NEOClass"] == "Aten")
+        & (neo_columns["Incl_deg"] < 10.0)
+        & (neo_columns["SemMajAxis_AU"] >= 0.8)
+        & (neo_columns["SemMajAxis_AU"] < 1.0)
+    )
+    exp_counts = np.histogram(
+        neo_columns["AbsMag_"][exp_mask], SolarY.neo.population.DEFAULT_CUBE_EDGES["AbsMag_"]
+    )[0]
+    assert np.array_equal(aten_h_counts, exp_counts)
+
+    # Two-dimensional marginal over several classes
+    ecc_class_counts = pop_cube.query(
+        where={"NEOClass": ["Amor", "Apollo"]}, dims=["Ecc_", "NEOClass"]
+    )
+    assert ecc_class_counts.shape == (20, 2)
+    assert ecc_class_counts[:, 0].sum() == np.sum(neo_columns["NEOClass"] == "Amor")
+
+    # The class fractions per absolute magnitude bin sum up to 1
+    fractions = pop_cube.class_fractions()
+    assert fractions.shape == (20, 3)
+    assert np.allclose(fractions.sum(axis=1), 1.0)
+
+    # Save and load the cube
+    pop_cube.save(tmp_path / "cube.npz")
+    loaded_cube = SolarY.neo.population.PopulationCube.load(tmp_path / "cube.npz")
+    assert np.array_equal(loaded_cube.counts, pop_cube.counts)
+    assert loaded_cube.neo_classes.tolist() == pop_cube.neo_classes.tolist()
+
+    # Custom edges; NEOs outside the edges are not counted
+    pop_cube = SolarY.neo.population.PopulationCube.from_columns(
+        neo_columns, edges={"AbsMag_": np.array([16.0, 20.0, 24.0])}
+    )
+    assert pop_cube.counts.shape[3] == 2
+    assert int(pop_cube.query()) == np.sum(
+        (neo_columns["AbsMag_"] >= 16.0) & (neo_columns["AbsMag_"] <= 24.0)
+    )
+
+    # Invalid queries
+    with pytest.raises(ValueError):
+        pop_cube.query(where={"Incl_deg": (None, 12.5)})
+    with pytest.raises(ValueError):
+        pop_cube.query(dims=["Perihel_AU"])
@@ -0,0 +1,298 @@
+"""
+test_similarity.py
+
+Testing suite for SolarY/neo/similarity.py
+
+"""
+import math
+import time
+
+import numpy as np
+import pytest
+
+import SolarY
+
+
+def _random_neo_columns(nr_orbits, seed=0):
+    """
+    Draw random NEO orbits.
+
+    Parameters
+    ----------
+    nr_orbits : int
+        Number of orbits.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+
+    Returns
+    -------
+    neo_columns : dict
+        Dictionary with the columns SemMajAxis_AU, Ecc_, Incl_deg, LongAscNode_deg and ArgP_deg.
+
+    """
+    rng = np.random.default_rng(seed)
+    neo_columns = {
+        "SemMajAxis_AU": rng.uniform(0.6, 4.2, nr_orbits),
+        "Ecc_": rng.uniform(0.0, 0.95, nr_orbits),
+        "Incl_deg": rng.uniform(0.0, 60.0, nr_orbits),
+        "LongAscNode_deg": rng.uniform(0.0, 360.0, nr_orbits),
+        "ArgP_deg": rng.uniform(0.0, 360.0, nr_orbits),
+    }
+
+    return neo_columns
+
+
+def _d_sh_reference(elements_1, elements_2):
+    """
+    Scalar reference implementation of the Southworth & Hawkins D-criterion (textbook form).
+
+    Returns
+    -------
+    d_sh : float
+        D-criterion value.
+
+    """
+    peri_1, ecc_1, incl_1, node_1, arg_peri_1 = elements_1
+    peri_2, ecc_2, incl_2, node_2, arg_peri_2 = elements_2
+
+    # Mutual inclination term
+    incl_term = (2.0 * math.sin((incl_2 - incl_1) / 2.0)) ** 2 + math.sin(incl_1) * math.sin(
+        incl_2
+    ) * (2.0 * math.sin((node_2 - node_1) / 2.0)) ** 2
+    half_mutual_incl = math.asin(math.sqrt(incl_term) / 2.0)
+
+    # Difference of the longitudes of perihelion; the sign of the arcsine term is reversed, if the
+    # nodes differ by more than 180 degrees
+    arcsin_term = 2.0 * math.asin(
+        math.cos((incl_2 + incl_1) / 2.0)
+        * math.sin((node_2 - node_1) / 2.0)
+        / math.cos(half_mutual_incl)
+    )
+    if abs(node_2 - node_1) > math.pi:
+        arcsin_term = -arcsin_term
+    d_peri_long = arg_peri_2 - arg_peri_1 + arcsin_term
+
+    d_sh = math.sqrt(
+        (ecc_2 - ecc_1) ** 2
+        + (peri_2 - peri_1) ** 2
+        + incl_term
+        + ((ecc_1 + ecc_2) / 2.0 * 2.0 * math.sin(d_peri_long / 2.0)) ** 2
+    )
+
+    return d_sh
+
+
+def test_orbital_elements():
+    """
+    Test the conversion of NEO data columns to orbital elements.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # The perihelion is computed from the semi-major axis, the angles are converted to radians
+    elements = SolarY.neo.similarity.orbital_elements(
+        {
+            "SemMajAxis_AU": np.array([2.0]),
+            "Ecc_": np.array([0.25]),
+            "Incl_deg": np.array([90.0]),
+            "LongAscNode_deg": np.array([180.0]),
+            "ArgP_deg": np.array([45.0]),
+        }
+    )
+    assert elements.shape == (1, 5)
+    assert np.allclose(elements[0], [1.5, 0.25, math.pi / 2.0, math.pi, math.pi / 4.0])
+
+
+def test_d_southworth_hawkins():
+    """
+    Test the vectorized Southworth & Hawkins D-criterion.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Compare the vectorized results with the scalar reference implementation
+    elements_1 = SolarY.neo.similarity.orbital_elements(_random_neo_columns(200, seed=1))
+    elements_2 = SolarY.neo.similarity.orbital_elements(_random_neo_columns(200, seed=2))
+    d_sh = SolarY.neo.similarity.d_southworth_hawkins(elements_1, elements_2)
+    assert d_sh.shape == (200,)
+    assert np.allclose(
+        d_sh, [_d_sh_reference(el_1, el_2) for el_1, el_2 in zip(elements_1, elements_2)]
+    )
+
+    # The criterion is symmetric and zero for identical orbits; the inputs are broadcast
+    assert np.allclose(d_sh, SolarY.neo.similarity.d_southworth_hawkins(elements_2, elements_1))
+    assert np.allclose(SolarY.neo.similarity.d_southworth_hawkins(elements_1, elements_1), 0.0)
+    d_matrix = SolarY.neo.similarity.d_southworth_hawkins(
+        elements_1[:10, np.newaxis, :], elements_2
+    )
+    assert d_matrix.shape == (10, 200)
+
+    # The chord length of the poles and the eccentricity and perihelion differences are a lower
+    # bound of the criterion
+    pole_chord = np.linalg.norm(
+        SolarY.neo.similarity.pole_vectors(elements_1)
+        - SolarY.neo.similarity.pole_vectors(elements_2),
+        axis=1,
+    )
+    lower_bound = np.sqrt(
+        (elements_1[:, 0] - elements_2[:, 0]) ** 2
+        + (elements_1[:, 1] - elements_2[:, 1]) ** 2
+        + pole_chord ** 2
+    )
+    assert np.all(lower_bound <= d_sh + 1e-12)
+
+
+def test_d_drummond():
+    """
+    Test the vectorized Drummond D-criterion.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Two orbits that differ only by the eccentricity and perihelion
+    elements_1 = np.array([1.0, 0.2, 0.1, 1.0, 2.0])
+    elements_2 = np.array([0.5, 0.6, 0.1, 1.0, 2.0])
+    d_d = SolarY.neo.similarity.d_drummond(elements_1, elements_2)
+    assert pytest.approx(d_d) == math.sqrt((0.4 / 0.8) ** 2 + (0.5 / 1.5) ** 2)
+
+    # Two orbits with a mutual inclination of 10 degrees (equal nodes and perihelion at the node)
+    elements_2 = np.array([1.0, 0.2, 0.1 + math.radians(10.0), 1.0, 0.0])
+    elements_1 = np.array([1.0, 0.2, 0.1, 1.0, 0.0])
+    d_d = SolarY.neo.similarity.d_drummond(elements_1, elements_2)
+    assert pytest.approx(d_d) == 10.0 / 180.0
+
+    # The criterion is symmetric and zero for identical orbits
+    elements_1 = SolarY.neo.similarity.orbital_elements(_random_neo_columns(200, seed=1))
+    elements_2 = SolarY.neo.similarity.orbital_elements(_random_neo_columns(200, seed=2))
+    assert np.allclose(
+        SolarY.neo.similarity.d_drummond(elements_1, elements_2),
+        SolarY.neo.similarity.d_drummond(elements_2, elements_1),
+    )
+    assert np.allclose(SolarY.neo.similarity.d_drummond(elements_1, elements_1), 0.0)
+
+
+@pytest.mark.parametrize("criterion", ["sh", "d"])
+def test_OrbitSimilarityIndex(criterion):
+    """
+    Test the nearest neighbour and radius searches (KD-tree and brute force).
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Index a random catalog with and without KD-tree. Some query orbits exceed the catalog's
+    # eccentricity range
+    catalog_columns = _random_neo_columns(5000, seed=3)
+    query_elements = SolarY.neo.similarity.orbital_elements(_random_neo_columns(50, seed=4))
+    query_elements[:5, 1] = 0.99
+    brute_index = SolarY.neo.similarity.OrbitSimilarityIndex(
+        catalog_columns, criterion=criterion, use_tree=False
+    )
+    tree_index = SolarY.neo.similarity.OrbitSimilarityIndex(catalog_columns, criterion=criterion)
+
+    # The brute force kNN search corresponds to the distances to all catalog orbits
+    brute_dist, brute_idx = brute_index.query_knn(query_elements, k=7)
+    assert brute_dist.shape == brute_idx.shape == (50, 7)
+    all_dist = brute_index.distances(query_elements[0])
+    assert np.allclose(brute_dist[0], np.sort(all_dist)[:7])
+    assert np.allclose(all_dist[brute_idx[0]], brute_dist[0])
+
+    # The KD-tree pre-filter returns identical results
+    pytest.importorskip("scipy")
+    tree_dist, tree_idx = tree_index.query_knn(query_elements, k=7)
+    assert np.allclose(tree_dist, brute_dist)
+    assert np.array_equal(tree_idx, brute_idx)
+
+    # Radius search
+    radius = float(np.median(brute_dist[:, -1]))
+    for (tree_r_dist, tree_r_idx), (brute_r_dist, brute_r_idx) in zip(
+        tree_index.query_radius(query_elements, radius),
+        brute_index.query_radius(query_elements, radius),
+    ):
+        assert np.array_equal(tree_r_idx, brute_r_idx)
+        assert np.allclose(tree_r_dist, brute_r_dist)
+        assert np.all(tree_r_dist <= radius)
+
+    # A single query orbit; k is limited by the catalog size
+    knn_dist, knn_idx = tree_index.query_knn(tree_index.elements[42], k=10000)
+    assert knn_idx.shape == (1, 5000)
+    assert knn_idx[0, 0] == 42
+    assert knn_dist[0, 0] == pytest.approx(0.0)
+
+    # Invalid input
+    with pytest.raises(ValueError):
+        tree_index.query_knn(query_elements, k=0)
+    with pytest.raises(ValueError):
+        SolarY.neo.similarity.OrbitSimilarityIndex(catalog_columns, criterion="xyz")
+
+
+def test_OrbitSimilarityIndex_from_database(tmp_path):
+    """
+    Test the index of the NEODyS database.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Create the NEODyS database from the sample file
+    test_paths_config = SolarY.auxiliary.config.get_paths(test=True)
+    neodys_sample_path = SolarY.auxiliary.parse.get_test_file_path(
+        "../" + test_paths_config["neo"]["neodys_sample"]
+    )
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    neo_sqlite.create(path_filename=neodys_sample_path, bulk=True)
+
+    # The orbit of Eros is most similar to itself
+    sim_index = SolarY.neo.similarity.OrbitSimilarityIndex.from_database(neo_sqlite)
+    eros_idx = sim_index.neo_columns["Name"].tolist().index("433")
+    knn_dist, knn_idx = sim_index.query_knn(sim_index.elements[eros_idx], k=3)
+    assert sim_index.neo_columns["Name"][knn_idx[0, 0]] == "433"
+    assert knn_dist[0, 0] == pytest.approx(0.0)
+    assert np.all(np.diff(knn_dist[0]) >= 0.0)
+
+    neo_sqlite.close()
+
+
+@pytest.mark.benchmark
+def test_OrbitSimilarityIndex_benchmark(record_property):
+    """
+    Benchmark the batch kNN search with KD-tree pre-filter against the brute force search.
+
+    Returns
+    -------
+    None.
+
+    """
+    pytest.importorskip("scipy")
+
+    # Index a random catalog and query a batch of orbits
+    catalog_columns = _random_neo_columns(200000, seed=5)
+    query_elements = SolarY.neo.similarity.orbital_elements(_random_neo_columns(200, seed=6))
+    queries_per_sec = {}
+    knn_results = {}
+    for use_tree in [True, False]:
+        sim_index = SolarY.neo.similarity.OrbitSimilarityIndex(
+            catalog_columns, use_tree=use_tree
+        )
+        start_time = time.perf_counter()
+        knn_results[use_tree] = sim_index.query_knn(query_elements, k=10)
+        queries_per_sec[use_tree] = len(query_elements) / (time.perf_counter() - start_time)
+
+    # Report the results
+    record_property("queries_per_sec_tree", queries_per_sec[True])
+    record_property("queries_per_sec_brute_force", queries_per_sec[False])
+
+    assert np.allclose(knn_results[True][0], knn_results[False][0])
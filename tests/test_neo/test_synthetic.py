@@ -0,0 +1,74 @@
+"""
+test_synthetic.py
+
+Testing suite for SolarY/neo/synthetic.py
+
+"""
+import numpy as np
+import pytest
+
+import SolarY
+
+
+def test_write_neodys(tmp_path):
+    """
+    Test the synthetic NEODyS catalog.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # Write a synthetic catalog in several chunks; the row-wise and column-wise readers return
+    # the same NEOs
+    path_filename = SolarY.neo.synthetic.write_neodys(
+        str(tmp_path / "neodys_synth.cat"), 2500, chunk_size=1000
+    )
+    neo_dict_data = SolarY.neo.data.read_neodys(path_filename=path_filename)
+    neo_columns = SolarY.neo.data.load_neodys_array(path_filename=path_filename)
+    assert len(neo_dict_data) == 2500
+    assert neo_columns["Name"].tolist() == [str(neo_nr) for neo_nr in range(1, 2501)]
+    assert np.allclose(
+        neo_columns["SemMajAxis_AU"], [neo["SemMajAxis_AU"] for neo in neo_dict_data]
+    )
+    assert np.all((neo_columns["Ecc_"] >= 0.0) & (neo_columns["Ecc_"] < 0.95))
+
+    # The NEODyS database can be built from the catalog
+    neo_sqlite = SolarY.neo.data.NEOdysDatabase(new=True, db_filename=str(tmp_path / "neo.db"))
+    neo_sqlite.create(path_filename=path_filename, bulk=True)
+    assert neo_sqlite.cur.execute("SELECT COUNT(*) FROM main").fetchone()[0] == 2500
+    neo_sqlite.close()
+
+
+def test_write_granvik2018(tmp_path):
+    """
+    Test the synthetic Granvik et al. (2018) model file.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    # The same seed and chunk size reproduce the file; the gzip-compressed file has the same
+    # content
+    path_filename = SolarY.neo.synthetic.write_granvik2018(str(tmp_path / "granvik.dat"), 3000)
+    SolarY.neo.synthetic.write_granvik2018(str(tmp_path / "granvik_2.dat.gz"), 3000)
+    neo_columns = SolarY.neo.data.load_granvik2018_array(path_filename=path_filename)
+    neo_columns_gz = SolarY.neo.data.load_granvik2018_array(
+        path_filename=str(tmp_path / "granvik_2.dat.gz")
+    )
+    assert len(neo_columns["AbsMag_"]) == 3000
+    for col_name in SolarY.neo.data.GRANVIK2018_COLUMNS:
+        assert np.array_equal(neo_columns[col_name], neo_columns_gz[col_name])
+    assert np.all((neo_columns["AbsMag_"] >= 15.0) & (neo_columns["AbsMag_"] <= 25.0))
+
+    # The values are written with 9 significant digits
+    rng = np.random.default_rng(0)
+    exp_columns = SolarY.neo.synthetic.draw_neo_columns(3000, rng)
+    assert np.allclose(neo_columns["Incl_deg"], exp_columns["Incl_deg"], rtol=1e-8)
+
+    # Invalid input
+    with pytest.raises(ValueError):
+        SolarY.neo.synthetic.write_granvik2018(path_filename, 10, chunk_size=0)